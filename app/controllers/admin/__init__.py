@@ -0,0 +1 @@
+"""Administration API endpoints."""
@@ -0,0 +1,74 @@
+"""Administration API endpoints."""
+
+import asyncio
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.reloader import dataset_reloader
+from app.services.products_service import products_service
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Administration"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.post(
+    "/reload",
+    summary="Reload the dataset",
+    description="""
+    Reload `data.csv` without downtime.
+
+    The new dataset, its indexes and statistics are built in the background while the
+    current version keeps serving requests, then swapped in atomically. The dataset
+    version changes, so cached results and pagination cursors of the previous version
+    are invalidated. Without `force`, nothing is reloaded if the CSV did not change.
+    """,
+)
+async def reload_dataset(force: bool = False):
+    """Reload the dataset from the CSV and report the active version."""
+    try:
+        result = await dataset_reloader.reload(force=force)
+    except IOError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "reload_failed", "error_description": str(e)},
+        ) from e
+    return {**result, "reload_count": dataset_reloader.reload_count}
+
+
+@router.post(
+    "/append",
+    summary="Append a delta CSV to the dataset",
+    description="""
+    Ingest a delta CSV (same header as `data.csv`) from `DATASET_DELTA_DIR`.
+
+    Only the delta is parsed; indexes and statistics are extended with its rows and the
+    new dataset version is swapped in atomically. Appended rows are held in memory, so
+    the upstream job should also append them to `data.csv`; the next change of
+    `data.csv` after a delta append is loaded with a full reload, which reads those
+    rows from there exactly once. Otherwise rows appended directly to `data.csv` are
+    picked up incrementally by `/admin/reload`.
+    """,
+)
+async def append_delta(file: str):
+    """Append the rows of a delta CSV from the configured delta directory."""
+    delta_dir = Path(settings.DATASET_DELTA_DIR).resolve()
+    delta_path = (delta_dir / file).resolve()
+    if delta_path.parent != delta_dir or not delta_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "not_found", "error_description": f"No delta file '{file}'"},
+        )
+
+    try:
+        return await asyncio.to_thread(products_service.append_dataset, delta_path)
+    except IOError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "append_failed", "error_description": str(e)},
+        ) from e
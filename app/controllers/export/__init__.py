@@ -0,0 +1 @@
+"""Bulk export API endpoints."""
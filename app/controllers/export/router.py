@@ -0,0 +1,171 @@
+"""Bulk export API endpoints."""
+
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.compression import precompressed_response
+from app.core.dependencies import get_current_user
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.core.executor import ExecutorBusyError, dataset_executor, run_blocking
+from app.core.json_encoding import encode_json
+from app.services.exporters import EXPORT_EXTENSIONS, EXPORT_MEDIA_TYPES
+from app.services.products_service import products_service
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.get(
+    "/products",
+    summary="Stream the products matching a filter",
+    description="""
+    Export every product matching the filters (same semantics as `searchProducts`) as
+    newline-delimited JSON (`ndjson`), CSV (`csv`) or an Arrow IPC stream (`arrow`).
+
+    Rows are read and serialised in chunks of `EXPORT_CHUNK_ROWS` while the response is
+    streamed, so exports of any size use constant memory. Each export holds a slot of the
+    dataset worker pool while it streams; when the pool is full, a 503 is returned. There is no limit or offset;
+    `order_by` sorts the rows. The whole export reads the dataset version reported in
+    the `X-Dataset-Version` header, even if the dataset is reloaded meanwhile. The
+    `ETag` changes with the dataset version; with a current `If-None-Match` nothing is
+    streamed and an empty 304 is returned.
+    """,
+)
+async def export_products(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson, csv or arrow"),
+    date: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    client_id: Optional[int] = None,
+    brand: Optional[str] = None,
+    sku: Optional[str] = None,
+    category: Optional[str] = None,
+    order_by: Optional[str] = Query(
+        None, description="date, revenue, cart_additions, cart_removals or page_views"
+    ),
+    descending: bool = False,
+    columns: Optional[str] = Query(
+        None, description="Comma-separated columns to export (default: all)"
+    ),
+):
+    """Stream the products matching the filters in the requested format."""
+    # Exports are tagged by dataset version and the normalised query string
+    query = urlencode(sorted(request.query_params.multi_items()))
+    selected = None
+    if columns:
+        selected = [column.strip() for column in columns.split(",") if column.strip()]
+    try:
+        filter_params = products_service.build_filter(
+            date=date,
+            client_id=client_id,
+            brand=brand,
+            sku=sku,
+            category=category,
+            date_from=date_from,
+            date_to=date_to,
+            order_by=order_by,
+            descending=descending,
+        )
+        version, chunks = await run_blocking(
+            products_service.export_products, filter_params, format, selected
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "invalid_request", "error_description": str(e)},
+        ) from e
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "busy", "error_description": str(e)},
+        ) from e
+    except IOError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "export_failed", "error_description": str(e)},
+        ) from e
+
+    # Chunks are only read when iterated, so a current client copy costs no streaming
+    etag = make_etag(version, request.url.path, query)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    # The chunks are read and serialised on the dataset worker pool, holding one of its
+    # admission slots for the whole stream
+    try:
+        stream = dataset_executor.iterate(chunks)
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "busy", "error_description": str(e)},
+        ) from e
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f"attachment; filename=products.{EXPORT_EXTENSIONS[format]}",
+            "X-Dataset-Version": version,
+            **etag_headers(etag),
+        },
+    )
+
+
+async def dimension_values_response(request: Request, dimension: str):
+    """Respond with every value of a dimension, compressed once per dataset version."""
+    try:
+        version, values = await run_blocking(products_service.get_dimension_values, dimension)
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "busy", "error_description": str(e)},
+        ) from e
+    except IOError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "export_failed", "error_description": str(e)},
+        ) from e
+
+    etag = make_etag(version, request.url.path)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return await precompressed_response(
+        request,
+        (dimension, version),
+        lambda: encode_json(list(values)),
+        headers={"X-Dataset-Version": version, **etag_headers(etag)},
+    )
+
+
+@router.get(
+    "/brands",
+    summary="List every brand",
+    description="""
+    All distinct brands, sorted, as a JSON array. The encoded and compressed list is
+    built once per dataset version and then served as stored bytes; a request whose
+    `If-None-Match` holds the current ETag gets an empty 304.
+    """,
+)
+async def export_brands(request: Request):
+    """Return every brand of the dataset."""
+    return await dimension_values_response(request, "brands")
+
+
+@router.get(
+    "/categories",
+    summary="List every category",
+    description="""
+    All distinct main categories, sorted, as a JSON array. The encoded and compressed
+    list is built once per dataset version and then served as stored bytes; a request
+    whose `If-None-Match` holds the current ETag gets an empty 304.
+    """,
+)
+async def export_categories(request: Request):
+    """Return every main category of the dataset."""
+    return await dimension_values_response(request, "categories")
@@ -0,0 +1,219 @@
+"""Automatic persisted queries: GraphQL documents parsed and validated once, keyed by hash."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+from graphql import DocumentNode, GraphQLError, print_ast, specified_rules
+from graphql.type import GraphQLSchema
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.execute import parse_document, validate_document
+
+from app.core.config import settings
+
+# Version of the automatic persisted query protocol supported
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryError(Exception):
+    """Raised when a persisted query cannot be resolved; reported as a GraphQL error."""
+
+    def __init__(self, message: str, code: str):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message (``PersistedQueryNotFound`` asks clients to resend
+                the query text with its hash)
+            code: Error code reported in the error extensions
+        """
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    def to_response(self) -> Dict[str, Any]:
+        """GraphQL response body reporting the error."""
+        return {"errors": [{"message": self.message, "extensions": {"code": self.code}}]}
+
+
+@dataclass(frozen=True)
+class PersistedQuery:
+    """A registered query with its parsed (and successfully validated) document."""
+
+    sha256_hash: str
+    query: str
+    document: DocumentNode
+    printed: str
+
+
+def query_hash(query: str) -> str:
+    """SHA-256 hex digest identifying a query text."""
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryStore:
+    """
+    Thread-safe LRU store of persisted queries.
+
+    Queries are registered by a client sending the query text together with its
+    SHA-256 hash; later requests send the hash alone (also via GET, so responses can
+    be cached by URL). Only documents that parse and validate are stored, so executing
+    a stored query skips both steps.
+    """
+
+    def __init__(self, schema: Optional[GraphQLSchema] = None, max_entries: int = 1000):
+        """
+        Initialize the store.
+
+        Args:
+            schema: GraphQL schema the documents are validated against (set by the router)
+            max_entries: Maximum number of stored queries (0 disables persisted queries)
+        """
+        self.schema = schema
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PersistedQuery]" = OrderedDict()
+        self._by_query: Dict[str, PersistedQuery] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of stored queries."""
+        return len(self._entries)
+
+    def get(self, sha256_hash: str) -> Optional[PersistedQuery]:
+        """Get a stored query by hash and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(sha256_hash)
+            if entry is not None:
+                self._entries.move_to_end(sha256_hash)
+            return entry
+
+    def get_by_query(self, query: Optional[str]) -> Optional[PersistedQuery]:
+        """Get the stored entry of a query text, if it was registered."""
+        return self._by_query.get(query) if query else None
+
+    def lookup(self, extensions: Any) -> Optional[PersistedQuery]:
+        """
+        Get the stored query a request refers to by hash.
+
+        Args:
+            extensions: Request extensions (a mapping, or its JSON text for GET)
+
+        Returns:
+            The stored entry, or None if the request has no known hash
+        """
+        persisted = _persisted_query_extension(extensions)
+        sha256_hash = persisted.get("sha256Hash") if persisted else None
+        return self.get(sha256_hash) if isinstance(sha256_hash, str) else None
+
+    def register(self, sha256_hash: str, query: str) -> Optional[PersistedQuery]:
+        """
+        Parse, validate and store a query.
+
+        Args:
+            sha256_hash: Hash of the query text
+            query: Query text
+
+        Returns:
+            The stored entry, or None if the query does not parse or validate (it is
+            then executed normally so the errors are reported)
+        """
+        entry = self.get(sha256_hash)
+        if entry is not None or self.max_entries <= 0:
+            return entry
+        try:
+            document = parse_document(query)
+        except GraphQLError:
+            return None
+        if validate_document(self.schema, document, tuple(specified_rules)):
+            return None
+
+        entry = PersistedQuery(sha256_hash, query, document, print_ast(document))
+        with self._lock:
+            self._entries[sha256_hash] = entry
+            self._by_query[query] = entry
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._by_query.pop(evicted.query, None)
+        return entry
+
+    def resolve(self, query: Optional[str], extensions: Any) -> Optional[str]:
+        """
+        Resolve the query text of a request with the persisted query protocol.
+
+        Args:
+            query: Query text sent with the request, if any
+            extensions: Request extensions (a mapping, or its JSON text for GET)
+
+        Returns:
+            The query text to execute
+
+        Raises:
+            PersistedQueryError: If the hash is unknown, does not match the query, or
+                the protocol version is not supported
+        """
+        persisted = _persisted_query_extension(extensions)
+        if persisted is None:
+            return query
+        if self.max_entries <= 0:
+            raise PersistedQueryError("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+        if persisted.get("version") != PERSISTED_QUERY_VERSION:
+            raise PersistedQueryError(
+                "Unsupported persisted query version", "PERSISTED_QUERY_NOT_SUPPORTED"
+            )
+
+        sha256_hash = persisted.get("sha256Hash")
+        if not isinstance(sha256_hash, str):
+            raise PersistedQueryError("Missing persisted query hash", "BAD_REQUEST")
+        if query is None:
+            entry = self.get(sha256_hash)
+            if entry is None:
+                raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+            return entry.query
+        if query_hash(query) != sha256_hash:
+            raise PersistedQueryError("provided sha does not match query", "BAD_REQUEST")
+        self.register(sha256_hash, query)
+        return query
+
+    def clear(self) -> None:
+        """Drop every stored query."""
+        with self._lock:
+            self._entries.clear()
+            self._by_query.clear()
+
+
+def _persisted_query_extension(extensions: Any) -> Optional[Dict[str, Any]]:
+    """The ``persistedQuery`` request extension, if present."""
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get("persistedQuery")
+    return persisted if isinstance(persisted, dict) else None
+
+
+# Singleton instance
+persisted_query_store = PersistedQueryStore(max_entries=settings.PERSISTED_QUERIES_MAX_ENTRIES)
+
+
+class PersistedQueryExtension(SchemaExtension):
+    """Executes stored queries with their stored document, skipping parse and validation."""
+
+    def on_parse(self) -> Iterator[None]:
+        """Use the stored document of a registered query."""
+        entry = persisted_query_store.get_by_query(self.execution_context.query)
+        if entry is not None:
+            self.execution_context.graphql_document = entry.document
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        """Skip validating a stored (already validated) document."""
+        entry = persisted_query_store.get_by_query(self.execution_context.query)
+        if entry is not None and self.execution_context.graphql_document is entry.document:
+            self.execution_context.errors = []
+        yield
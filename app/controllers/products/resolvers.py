@@ -1,19 +1,182 @@
 """GraphQL query resolvers."""
 
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import strawberry
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField, Selection
 
+from app.core.executor import run_blocking
 from app.models.graphql.product_types import (
+    AggregateDimension,
+    AggregateGroupType,
+    CacheStatsType,
+    ColumnTotalType,
+    GroupKeyType,
+    MeasureColumn,
+    MetricInput,
+    MetricValueType,
+    PageInfoType,
+    ProductConnectionType,
     ProductDataType,
+    ProductEdgeType,
     ProductFilterInput,
+    ProductOrderInput,
+    SortDirection,
     StatsType,
+    TopProductType,
 )
 from app.services.products_service import products_service
 
 logger = logging.getLogger(__name__)
 
+
+def build_model_filter(
+    filters: Optional[ProductFilterInput], order_by: Optional[ProductOrderInput] = None
+):
+    """Convert GraphQL filter (and order) input into a validated ProductDataFilter."""
+    if filters is None:
+        filters = ProductFilterInput()
+
+    # Use service to build filter with validation
+    return products_service.build_filter(
+        date=filters.date,
+        date_from=filters.date_from,
+        date_to=filters.date_to,
+        client_id=filters.client_id,
+        brand=filters.brand,
+        sku=filters.sku,
+        category=filters.category,
+        limit=filters.limit or 50,
+        offset=filters.offset or 0,
+        order_by=order_by.field.value if order_by else None,
+        descending=order_by is not None and order_by.direction == SortDirection.DESC,
+    )
+
+
+# Dataset columns whose ProductDataType attribute has a different name
+COLUMN_FIELD_NAMES = {"SASASA": "sasasa"}
+FIELD_COLUMN_NAMES = {field: column for column, field in COLUMN_FIELD_NAMES.items()}
+
+
+def selected_columns(info: Info) -> Optional[List[str]]:
+    """
+    Get the dataset columns selected on the ProductDataType under the current field.
+
+    Fragments and inline fragments are followed; ``__typename`` and unknown fields are
+    ignored. At least one column is always returned so the page size is preserved.
+
+    Args:
+        info: Strawberry resolver info
+
+    Returns:
+        Selected columns in ProductDataType field order, or None (all columns) if the
+        selection cannot be determined
+    """
+    graphql_names = _product_field_graphql_names(info)
+    selected = set()
+
+    def collect(selections: List[Selection]) -> None:
+        for selection in selections:
+            if isinstance(selection, SelectedField):
+                if selection.name in graphql_names:
+                    selected.add(selection.name)
+            else:
+                collect(selection.selections)
+
+    if not info.selected_fields:
+        return None
+    collect(info.selected_fields[0].selections)
+
+    columns = [
+        FIELD_COLUMN_NAMES.get(field, field)
+        for graphql_name, field in graphql_names.items()
+        if graphql_name in selected
+    ]
+    if not columns:
+        first_field = next(iter(graphql_names.values()))
+        columns = [FIELD_COLUMN_NAMES.get(first_field, first_field)]
+    return columns
+
+
+def _product_field_graphql_names(info: Info) -> Dict[str, str]:
+    """Map the GraphQL name of every ProductDataType field to its Python name."""
+    name_converter = info.schema.config.name_converter
+    return {
+        name_converter.get_graphql_name(field): field.python_name
+        for field in ProductDataType.__strawberry_definition__.fields
+    }
+
+
+def columns_to_graphql(columns: Dict[str, List[Any]]) -> List[ProductDataType]:
+    """Build GraphQL product objects directly from column lists (no model validation)."""
+    names = [COLUMN_FIELD_NAMES.get(column, column) for column in columns]
+    return [
+        ProductDataType(**dict(zip(names, row, strict=True)))
+        for row in zip(*columns.values(), strict=True)
+    ]
+
+
+def search_products_graphql(
+    model_filter, columns: Optional[List[str]] = None
+) -> List[ProductDataType]:
+    """Search a page of products and build the GraphQL objects (blocking)."""
+    return columns_to_graphql(
+        products_service.search_product_columns(model_filter, columns=columns)
+    )
+
+
+def build_connection(model_filter, first: int, after: Optional[str]) -> ProductConnectionType:
+    """Search a cursor page of products and build the GraphQL connection (blocking)."""
+    page = products_service.search_products_page(model_filter, first=first, after=after)
+    edges = [
+        ProductEdgeType(
+            cursor=products_service.encode_cursor(page.dataset_version, position),
+            node=product_data_to_graphql(item),
+        )
+        for item, position in zip(page.items, page.positions, strict=True)
+    ]
+    return ProductConnectionType(
+        edges=edges,
+        page_info=PageInfoType(
+            has_next_page=page.has_next_page,
+            has_previous_page=page.has_previous_page,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+        total_count=page.total_count,
+    )
+
+
+def aggregate_graphql(
+    model_filter, group_by: List[AggregateDimension], metrics: List[MetricInput]
+) -> List[AggregateGroupType]:
+    """Aggregate the filtered products and build the GraphQL groups (blocking)."""
+    # Repeated dimensions/metrics are evaluated once, in first-occurrence order
+    group_by = list(dict.fromkeys(group_by))
+    metrics = list(dict.fromkeys((metric.column, metric.function) for metric in metrics))
+    groups = products_service.aggregate_products(
+        model_filter,
+        group_by=[dimension.value for dimension in group_by],
+        metrics=[(column.value, function.value) for column, function in metrics],
+    )
+    return [
+        AggregateGroupType(
+            keys=[
+                GroupKeyType(dimension=dimension, value=value)
+                for dimension, value in zip(group_by, group.keys, strict=True)
+            ],
+            metrics=[
+                MetricValueType(column=column, function=function, value=value)
+                for (column, function), value in zip(metrics, group.values, strict=True)
+            ],
+            count=group.count,
+        )
+        for group in groups
+    ]
+
+
 def product_data_to_graphql(product_data) -> ProductDataType:
     """Convert ProductData model to GraphQL type."""
     return ProductDataType(
@@ -45,75 +208,172 @@ def product_data_to_graphql(product_data) -> ProductDataType:
 
 @strawberry.type
 class Query:
-    """Root GraphQL Query type."""
+    """
+    Root GraphQL Query type.
+
+    Resolvers touching the dataset are async and run the blocking pandas work on the
+    bounded dataset executor, so the event loop keeps serving other requests.
+    """
 
     @strawberry.field(description="Search and filter product data (or get all products if no filter)")
-    def search_products(self, filters: Optional[ProductFilterInput] = None) -> List[ProductDataType]:
+    async def search_products(
+        self,
+        info: Info,
+        filters: Optional[ProductFilterInput] = None,
+        order_by: Optional[ProductOrderInput] = None,
+    ) -> List[ProductDataType]:
         """
         Search products with filters, or get all products if no filter provided.
 
         Args:
+            info: Resolver info, used to project only the selected fields
             filters: Optional filter parameters (date, brand, category, limit, offset, etc.)
                     If None, returns all products with default pagination.
                     (GraphQL clients use 'filter' due to filter_argument mapping)
+            order_by: Optional sort field and direction (CSV order if None)
 
         Returns:
             List of product data records (filtered or all)
         """
         try:
-            if filters is None:
-                filters = ProductFilterInput()
-
-            # Use service to build filter with validation
-            model_filter = products_service.build_filter(
-                date=filters.date,
-                client_id=filters.client_id,
-                brand=filters.brand,
-                sku=filters.sku,
-                category=filters.category,
-                limit=filters.limit or 50,
-                offset=filters.offset or 0,
+            model_filter = build_model_filter(filters, order_by)
+            # Only the selected fields are sliced from the dataset
+            return await run_blocking(
+                search_products_graphql, model_filter, columns=selected_columns(info)
             )
-
-            products = products_service.search_products(model_filter)
-            return [product_data_to_graphql(p) for p in products]
         except (ValueError, TypeError, KeyError, IOError) as e:
             # Log the error and return empty list rather than crashing GraphQL query
             logger.error("Error searching products: %s", str(e), exc_info=True)
             return []
 
+    @strawberry.field(
+        description="Search product data with cursor pagination (first/after, Relay style)"
+    )
+    async def search_products_connection(
+        self,
+        filters: Optional[ProductFilterInput] = None,
+        first: int = 50,
+        after: Optional[str] = None,
+    ) -> ProductConnectionType:
+        """
+        Search products with keyset pagination.
+
+        Args:
+            filters: Optional filter parameters (limit and offset are ignored)
+            first: Number of rows to return (max 100)
+            after: endCursor of the previous page
+
+        Returns:
+            Connection with the page edges and pagination info
+        """
+        return await run_blocking(build_connection, build_model_filter(filters), first, after)
+
+    @strawberry.field(description="Aggregate measures of the filtered products by group")
+    async def aggregate(
+        self,
+        filters: Optional[ProductFilterInput] = None,
+        group_by: Optional[List[AggregateDimension]] = None,
+        metrics: Optional[List[MetricInput]] = None,
+    ) -> List[AggregateGroupType]:
+        """
+        Aggregate measures over every product matching the filters.
+
+        Args:
+            filters: Optional filter parameters (limit and offset are ignored)
+            group_by: Dimensions to group by; none returns a single group of all rows
+            metrics: Measures and functions to compute per group
+
+        Returns:
+            One group per combination of group-by values, sorted by those values
+        """
+        return await run_blocking(
+            aggregate_graphql, build_model_filter(filters), group_by or [], metrics or []
+        )
+
+    @strawberry.field(description="Products with the largest total of a measure")
+    async def top_products(
+        self,
+        filters: Optional[ProductFilterInput] = None,
+        metric: MeasureColumn = MeasureColumn.FC_INGRESO_PRODUCTO_MONTO,
+        n: int = 10,
+    ) -> List[TopProductType]:
+        """
+        Rank the products matching the filters by the total of a measure.
+
+        Args:
+            filters: Optional filter parameters (limit and offset are ignored)
+            metric: Measure to total per SKU (revenue by default)
+            n: Number of products to return (max 100)
+
+        Returns:
+            Products by descending total
+        """
+        products = await run_blocking(
+            products_service.get_top_products, build_model_filter(filters), metric.value, n
+        )
+        return [TopProductType(**product.model_dump()) for product in products]
+
+    @strawberry.field(description="Explain how a product search would be evaluated (debugging)")
+    async def explain_search(self, filters: Optional[ProductFilterInput] = None) -> List[str]:
+        """
+        Explain the query plan for a product search.
+
+        Args:
+            filters: Optional filter parameters, as for searchProducts
+
+        Returns:
+            Plan steps: predicates in evaluation order with strategy and estimated rows
+        """
+        return await run_blocking(products_service.explain_search, build_model_filter(filters))
+
+    @strawberry.field(description="Get the search result cache counters")
+    def cache_stats(self) -> CacheStatsType:
+        """
+        Get the hit, miss and eviction counters of the search result cache.
+
+        Returns:
+            Result cache counters
+        """
+        return CacheStatsType(**products_service.get_cache_statistics())
+
     @strawberry.field(description="Get available brands")
-    def brands(self) -> List[str]:
+    async def brands(self) -> List[str]:
         """
         Get list of all unique brands.
 
         Returns:
             List of brand names
         """
-        return products_service.get_available_brands()
+        return list(await run_blocking(products_service.get_available_brands))
 
     @strawberry.field(description="Get available categories")
-    def categories(self) -> List[str]:
+    async def categories(self) -> List[str]:
         """
         Get list of all unique categories.
 
         Returns:
             List of category names
         """
-        return products_service.get_available_categories()
+        return list(await run_blocking(products_service.get_available_categories))
 
     @strawberry.field(description="Get dataset statistics")
-    def stats(self) -> StatsType:
+    async def stats(self) -> StatsType:
         """
         Get statistics about the dataset.
 
         Returns:
             Statistics including total records, brands, and categories
         """
-        stats_data = products_service.get_dataset_statistics()
+        stats_data = await run_blocking(products_service.get_dataset_statistics)
 
         return StatsType(
             total_records=stats_data["total_records"],
             brands_count=stats_data["brands_count"],
             categories_count=stats_data["categories_count"],
+            min_date=stats_data["min_date"],
+            max_date=stats_data["max_date"],
+            column_totals=[
+                ColumnTotalType(column=column, total=total)
+                for column, total in stats_data["column_totals"].items()
+            ],
         )
@@ -1,11 +1,30 @@
 """GraphQL router configuration."""
 
+import json
+from typing import Any, Iterator, Optional
+
 import strawberry
-from fastapi import Depends
+from fastapi import Depends, Request, Response
+from graphql import FieldNode, GraphQLError, parse, print_ast
 from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLRequestData
+from strawberry.http.exceptions import HTTPException
+from strawberry.types import ExecutionResult
 
+from app.controllers.products.persisted_queries import (
+    PersistedQueryError,
+    PersistedQueryExtension,
+    persisted_query_store,
+)
 from app.controllers.products.resolvers import Query
 from app.core.dependencies import get_current_user
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.core.executor import ExecutorBusyError, run_blocking
+from app.core.json_encoding import encode_json
+from app.services.products_service import products_service
+
+# Query fields whose results do not derive from the dataset (never given an ETag)
+UNVERSIONED_FIELDS = {"cacheStats"}
 
 # Define dependency at module level
 user_dependency = Depends(get_current_user)
@@ -16,11 +35,143 @@ async def get_context(user: dict = user_dependency):
     return {"user": user}
 
 
-# Create the GraphQL schema
-schema = strawberry.Schema(query=Query)
+def _field_names(node: Any) -> Iterator[str]:
+    """Names of every field selected under a document node."""
+    selection_set = getattr(node, "selection_set", None)
+    for selection in selection_set.selections if selection_set else ():
+        if isinstance(selection, FieldNode):
+            yield selection.name.value
+        yield from _field_names(selection)
+
+
+def normalize_request(
+    query: str, variables: Optional[str] = None, operation_name: Optional[str] = None
+) -> Optional[str]:
+    """
+    Normalise a GraphQL GET request into a key identifying its result.
+
+    Whitespace, comments and the order of variables do not change the key. Persisted
+    queries reuse their stored document instead of parsing the query again.
+
+    Args:
+        query: Query document
+        variables: JSON-encoded variables, if any
+        operation_name: Operation to execute, if any
+
+    Returns:
+        The key, or None if the request cannot be given an ETag (the document does not
+        parse, or selects fields that do not derive from the dataset)
+    """
+    entry = persisted_query_store.get_by_query(query)
+    try:
+        document = entry.document if entry is not None else parse(query)
+        parsed_variables = json.loads(variables) if variables else None
+    except (GraphQLError, ValueError):
+        return None
+    for definition in document.definitions:
+        if UNVERSIONED_FIELDS.intersection(_field_names(definition)):
+            return None
+    return "\0".join(
+        (
+            entry.printed if entry is not None else print_ast(document),
+            json.dumps(parsed_variables, sort_keys=True, separators=(",", ":")),
+            operation_name or "",
+        )
+    )
+
+
+class ProductsGraphQLRouter(GraphQLRouter):
+    """
+    GraphQL router encoding responses with the configured JSON encoder.
+
+    Queries sent with GET get an ETag derived from the dataset version and the
+    normalised request; a matching If-None-Match is answered with 304 before the
+    operation is executed. Results with errors are never tagged. Only GETs by persisted
+    query hash may be stored by shared caches.
+
+    Supports automatic persisted queries: a request may send the SHA-256 hash of a
+    query (``extensions.persistedQuery``) instead of its text, by POST or GET.
+    """
+
+    def encode_json(self, response_data) -> bytes:
+        """Encode a GraphQL response."""
+        return encode_json(response_data)
+
+    async def run(self, request: Request, context=strawberry.UNSET, root_value=strawberry.UNSET):
+        """Execute a GraphQL request, answering current conditional GETs with 304."""
+        etag = await self.request_etag(request)
+        # GETs by persisted query hash are short, stable URLs that shared caches can store
+        shared = etag is not None and not request.query_params.get("query")
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag, shared=shared)
+
+        try:
+            response = await super().run(request, context=context, root_value=root_value)
+        except PersistedQueryError as e:
+            # Reported like GraphQL errors, so clients can resend the query text
+            return Response(encode_json(e.to_response()), media_type="application/json")
+        if etag is not None and not getattr(request.state, "graphql_errors", False):
+            response.headers.update(etag_headers(etag, shared=shared))
+        return response
+
+    async def request_etag(self, request: Request) -> Optional[str]:
+        """ETag of a GraphQL GET request, or None if its result is not tagged."""
+        if request.method != "GET":
+            return None
+        query = request.query_params.get("query")
+        if not query:
+            entry = persisted_query_store.lookup(request.query_params.get("extensions"))
+            query = entry.query if entry is not None else None
+        if not query:
+            return None
+        key = normalize_request(
+            query, request.query_params.get("variables"), request.query_params.get("operationName")
+        )
+        if key is None:
+            return None
+        try:
+            version = await run_blocking(products_service.get_dataset_version)
+        except (IOError, ExecutorBusyError):
+            # Let the operation report the error
+            return None
+        return make_etag(version, key)
+
+    def should_render_graphql_ide(self, request) -> bool:
+        """Render GraphiQL for browser GETs without a query or persisted query hash."""
+        return super().should_render_graphql_ide(request) and (
+            request.query_params.get("extensions") is None
+        )
+
+    async def parse_http_body(self, request) -> GraphQLRequestData:
+        """Parse a JSON or GET request, resolving persisted query hashes to their text."""
+        content_type = request.content_type or ""
+        if "application/json" in content_type:
+            data = self.parse_json(await request.get_body())
+        elif request.method == "GET" and not content_type.startswith("multipart/form-data"):
+            data = self.parse_query_params(request.query_params)
+        else:
+            return await super().parse_http_body(request)
+        if not isinstance(data, dict):
+            raise HTTPException(400, "GraphQL request must be a JSON object")
+
+        return GraphQLRequestData(
+            query=persisted_query_store.resolve(data.get("query"), data.get("extensions")),
+            variables=data.get("variables"),
+            operation_name=data.get("operationName"),
+        )
+
+    async def process_result(self, request: Request, result: ExecutionResult):
+        """Build the response data, recording whether the result has errors."""
+        request.state.graphql_errors = bool(result.errors)
+        return await super().process_result(request, result)
+
+
+# Create the GraphQL schema (stored persisted queries skip parsing and validation)
+schema = strawberry.Schema(query=Query, extensions=[PersistedQueryExtension])
+persisted_query_store.schema = schema._schema
 
 # Create the GraphQL router with authentication
-graphql_router = GraphQLRouter(
+graphql_router = ProductsGraphQLRouter(
     schema,
     path="/graphql",
     context_getter=get_context,
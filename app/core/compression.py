@@ -0,0 +1,332 @@
+"""Negotiated gzip/brotli/zstd response compression and precompressed static payloads."""
+
+import asyncio
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard installed
+    zstandard = None
+
+IDENTITY = "identity"
+
+# Highest level of every encoding, used for payloads compressed once and then reused
+MAX_LEVELS: Dict[str, int] = {"zstd": 19, "br": 11, "gzip": 9}
+
+
+class _BrotliCompressor:
+    """Brotli compressor with the compress/flush interface of zlib."""
+
+    def __init__(self, level: int):
+        """Start a brotli stream at a quality level."""
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, returning the output available so far."""
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        """Finish the stream, returning the remaining output."""
+        return self._compressor.finish()
+
+
+def _gzip_compressor(level: int) -> Any:
+    """Streaming gzip compressor."""
+    return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+def _zstd_compressor(level: int) -> Any:
+    """Streaming zstd compressor."""
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+def available_encodings() -> List[str]:
+    """Content encodings that can be produced, most preferred first."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+# Content encoding -> factory of a streaming compressor (compress/flush) for a level
+COMPRESSORS: Dict[str, Callable[[int], Any]] = {
+    "zstd": _zstd_compressor,
+    "br": _BrotliCompressor,
+    "gzip": _gzip_compressor,
+}
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    Compress a whole payload.
+
+    Args:
+        data: Payload
+        encoding: Content encoding (a key of ``COMPRESSORS``)
+        level: Compression level of that encoding
+
+    Returns:
+        Compressed payload
+    """
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content encoding of a response from the request's Accept-Encoding.
+
+    The encoding with the highest quality value wins; ties go to the server preference
+    (zstd, then br, then gzip). ``*`` matches any encoding not listed and ``q=0``
+    refuses one.
+
+    Args:
+        accept_encoding: Accept-Encoding header value (may be empty)
+
+    Returns:
+        The encoding, or None to send the response uncompressed
+    """
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        param = params.strip()
+        if param.startswith("q="):
+            try:
+                quality = float(param[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the encoding the client prefers.
+
+    Complete bodies smaller than ``minimum_size`` are sent as is. Streamed bodies
+    (``more_body``) are compressed chunk by chunk as they are sent. Responses that
+    already carry a Content-Encoding (e.g. precompressed payloads) are left untouched.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, levels: Optional[Dict[str, int]] = None
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest complete body, in bytes, that is compressed
+            levels: Compression level per encoding (defaults to the settings)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels or compression_levels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, compressing the response when the client accepts it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSender(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSender:
+    """ASGI send callable compressing one response body."""
+
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        """Wrap the send callable of a response."""
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Any = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        """Forward a response message, compressing body messages when enabled."""
+        if message["type"] == "http.response.start":
+            # Held back until the first body message tells whether to compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if "content-encoding" in headers or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            self.compressor = COMPRESSORS[self.encoding](self.level)
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(start)
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+class PrecompressedPayloads:
+    """
+    Payloads encoded and compressed once, then served as stored bytes.
+
+    Every payload is identified by a key that changes with its content (e.g. it
+    includes the dataset version), built on first use and compressed at the highest
+    level of each encoding the first time that encoding is requested. The least
+    recently used keys are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of payload keys kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        accept_encoding: str,
+        build: Callable[[], bytes],
+        minimum_size: int = 0,
+    ) -> Tuple[bytes, str]:
+        """
+        Get a payload in the encoding the client prefers.
+
+        Args:
+            key: Payload key
+            accept_encoding: Accept-Encoding header of the request
+            build: Builds the uncompressed payload (called once per key)
+            minimum_size: Payloads smaller than this are sent uncompressed
+
+        Returns:
+            Tuple of (payload bytes, content encoding or ``"identity"``)
+        """
+        with self._lock:
+            variants = self._entries.get(key)
+            if variants is None:
+                variants = self._entries[key] = {IDENTITY: build()}
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+            body = variants[IDENTITY]
+            encoding = negotiate_encoding(accept_encoding)
+            if encoding is None or len(body) < minimum_size:
+                return body, IDENTITY
+            if encoding not in variants:
+                variants[encoding] = compress(body, encoding, MAX_LEVELS[encoding])
+            return variants[encoding], encoding
+
+    def clear(self) -> None:
+        """Drop every stored payload."""
+        with self._lock:
+            self._entries.clear()
+
+
+async def precompressed_response(
+    request: Request,
+    key: Hashable,
+    build: Callable[[], bytes],
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Respond with a payload from ``precompressed_payloads``.
+
+    Building and compressing run in a worker thread the first time a key and encoding
+    are requested; later requests only copy the stored bytes.
+
+    Args:
+        request: Current request (its Accept-Encoding is negotiated)
+        key: Payload key, changing whenever the payload does
+        build: Builds the uncompressed payload
+        media_type: Media type of the payload
+        headers: Additional response headers
+
+    Returns:
+        Response carrying the stored bytes and their Content-Encoding
+    """
+    accept_encoding = ""
+    if settings.COMPRESSION_ENABLED:
+        accept_encoding = request.headers.get("accept-encoding", "")
+    body, encoding = await asyncio.to_thread(
+        precompressed_payloads.get,
+        key,
+        accept_encoding,
+        build,
+        settings.COMPRESSION_MINIMUM_SIZE,
+    )
+
+    response_headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if encoding != IDENTITY:
+        response_headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=response_headers)
+
+
+def compression_levels() -> Dict[str, int]:
+    """Compression level per encoding for on-the-fly compression, from the settings."""
+    return {
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_LEVEL,
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+    }
+
+
+# Singleton instance
+precompressed_payloads = PrecompressedPayloads()
@@ -1,5 +1,7 @@
 """Application configuration."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -28,6 +30,67 @@ class Settings(BaseSettings):
     # CSV Data
     CSV_FILE_PATH: str = "data.csv"
 
+    # Dataset snapshot (Parquet copy of the parsed CSV, reused while the CSV is unchanged)
+    DATASET_SNAPSHOT_ENABLED: bool = False
+    DATASET_SNAPSHOT_PATH: str = ""  # Defaults to "<CSV_FILE_PATH>.snapshot.parquet"
+    DATASET_SNAPSHOT_VERIFY_HASH: bool = False  # Also compare the CSV's SHA-256
+
+    # Dataset storage: "memory" (private DataFrame per worker) or "mmap" (column buffers
+    # materialised once on disk and memory-mapped read-only by every worker)
+    DATASET_STORAGE_MODE: Literal["memory", "mmap"] = "memory"
+    DATASET_SHARED_DIR: str = ""  # Defaults to "<CSV_FILE_PATH>.shared"
+
+    # searchProducts result cache (keyed by dataset version and normalised filter)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 1024
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS: float = 300.0
+    # Byte budget of each per-dataset cache of filter match sets (row positions)
+    MATCH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Load the dataset in the background at startup; /ready reports 503 until it is loaded
+    DATASET_WARMUP_ENABLED: bool = True
+    # Retry a failed warm-up after N seconds, doubling the delay up to the maximum
+    DATASET_WARMUP_RETRY_SECONDS: float = 1.0
+    DATASET_WARMUP_MAX_RETRY_SECONDS: float = 60.0
+
+    # Hot reload of the CSV: poll its size/mtime every N seconds (0 disables polling);
+    # SIGHUP and POST /admin/reload trigger a reload as well
+    DATASET_RELOAD_POLL_SECONDS: float = 0.0
+    # When the CSV only grew, parse just the appended rows instead of the whole file
+    DATASET_APPEND_ENABLED: bool = True
+    # Directory holding delta CSVs accepted by POST /admin/append
+    DATASET_DELTA_DIR: str = "deltas"
+
+    # Aggregate rollups built with every dataset version: comma-separated dimension
+    # combinations joined with "+" (empty disables them); aggregate queries grouping and
+    # filtering only on a rollup's dimensions are answered from it
+    DATASET_ROLLUPS: str = "brand+date,category+date"
+
+    # Rows read and serialised per chunk by GET /export/products
+    EXPORT_CHUNK_ROWS: int = 10000
+
+    # JSON encoder of the GraphQL and REST responses: "orjson" (falls back to "json"
+    # when orjson is not installed) or "json" (standard library)
+    JSON_ENCODER: str = "orjson"
+
+    # Response compression negotiated from Accept-Encoding (zstd, br or gzip); bodies
+    # smaller than the minimum size are sent uncompressed
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Automatic persisted GraphQL queries: parsed and validated documents kept by hash
+    # (least recently used evicted; 0 disables persisted queries)
+    PERSISTED_QUERIES_MAX_ENTRIES: int = 1000
+
+    # Worker threads running blocking dataset work for the async GraphQL resolvers, and
+    # how many calls may wait for one before requests are rejected as busy
+    EXECUTOR_MAX_WORKERS: int = 4
+    EXECUTOR_MAX_QUEUE: int = 64
+
     class Config:
         """Pydantic configuration."""
 
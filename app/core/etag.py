@@ -0,0 +1,77 @@
+"""ETags and conditional GET for responses derived from the dataset."""
+
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(dataset_version: str, *parts: str) -> str:
+    """
+    Build the ETag of a response derived from the dataset.
+
+    The tag is weak: the same content may be sent with different Content-Encodings.
+
+    Args:
+        dataset_version: Version of the dataset the response is computed from
+        parts: Normalised request identifying the response (path, query, variables...)
+
+    Returns:
+        ETag header value
+    """
+    digest = hashlib.sha256("\0".join((dataset_version, *parts)).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """Opaque part of an entity tag, for weak comparison."""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag (weak comparison).
+
+    Args:
+        if_none_match: If-None-Match header value, if any
+        etag: ETag of the current response
+
+    Returns:
+        True if the client's copy is current and a 304 can be returned
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def etag_headers(etag: str, shared: bool = False) -> Dict[str, str]:
+    """
+    Headers of a response carrying an ETag; caches revalidate before every reuse.
+
+    Args:
+        etag: ETag of the response
+        shared: Whether shared caches (CDNs, proxies) may store the response, as for
+            hash-addressed persisted query GETs. It is keyed on the Authorization
+            header, since every response requires a token.
+
+    Returns:
+        Response headers
+    """
+    if shared:
+        return {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=0, must-revalidate",
+            "Vary": "Authorization",
+        }
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str, shared: bool = False) -> Response:
+    """Empty 304 response confirming the client's copy."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag, shared=shared)
+    )
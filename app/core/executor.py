@@ -0,0 +1,216 @@
+"""Bounded worker pool for blocking dataset work called from async code."""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Returned by ``next`` on a pool thread when an iterator is exhausted
+_EXHAUSTED = object()
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the worker pool queue is full and a call is rejected."""
+
+
+class BlockingExecutor:
+    """
+    Runs blocking callables on a bounded thread pool with admission control.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more wait for
+    a worker; further calls are rejected immediately with ``ExecutorBusyError`` instead
+    of queueing without bound, so the event loop (and lightweight endpoints such as
+    ``/auth/token``) keeps a flat latency under overload.
+
+    Threads (rather than processes) are used because the dataset and its indexes live
+    in the worker process and numpy/pandas release the GIL in their inner loops.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        thread_name_prefix: str = "dataset",
+    ):
+        """
+        Initialize the executor (the pool threads are started lazily).
+
+        Args:
+            max_workers: Number of calls running concurrently
+            max_queue: Number of calls allowed to wait for a worker
+            thread_name_prefix: Name prefix of the pool threads
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._thread_name_prefix = thread_name_prefix
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Get the pool, creating it on first use or after a shutdown."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self._thread_name_prefix
+            )
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop.
+
+        Args:
+            func: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            ExecutorBusyError: If every worker is busy and the queue is full
+        """
+        pool = self._admit()
+        try:
+            future = pool.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the call itself ends: a cancelled awaiter (client
+        # disconnect, timeout) does not stop a call that is already running
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def iterate(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """
+        Consume a blocking iterator on the pool, holding one slot until it ends.
+
+        Admission is decided when this is called (not on first iteration), so a
+        streaming response can still be rejected before it starts. Every item is
+        produced on a pool thread.
+
+        Args:
+            iterator: Blocking iterator (e.g. chunks of a streamed export)
+
+        Returns:
+            Async iterator over the items
+
+        Raises:
+            ExecutorBusyError: If every worker is busy and the queue is full
+        """
+        return _PoolIterator(self, self._admit(), iterator)
+
+    def _admit(self) -> ThreadPoolExecutor:
+        """Take an admission slot, returning the pool to submit to."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusyError("Server is busy, retry the request later")
+            self._in_flight += 1
+            return self._get_pool()
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        """Give an admission slot back (also used as a future's done callback)."""
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the executor counters.
+
+        Returns:
+            Dictionary with workers, queue capacity, in-flight, completed and rejected calls
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the pool threads; a later call starts a new pool.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+class _PoolIterator:
+    """Async iterator producing the items of a blocking iterator on an executor slot."""
+
+    def __init__(
+        self, executor: BlockingExecutor, pool: ThreadPoolExecutor, iterator: Iterator[Any]
+    ):
+        """Wrap an iterator admitted on ``executor``."""
+        self._executor = executor
+        self._pool = pool
+        self._iterator = iterator
+        self._pending: Optional[Future] = None
+        self._closed = False
+
+    def __aiter__(self) -> "_PoolIterator":
+        """Return the iterator itself."""
+        return self
+
+    async def __anext__(self) -> Any:
+        """Produce the next item on a pool thread."""
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            self._pending = self._pool.submit(next, self._iterator, _EXHAUSTED)
+            item = await asyncio.wrap_future(self._pending)
+        except BaseException:
+            self.close()
+            raise
+        self._pending = None
+        if item is _EXHAUSTED:
+            self.close()
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        """Stop iterating and give the slot back."""
+        self.close()
+
+    def close(self) -> None:
+        """Give the slot back once no item is being produced."""
+        if self._closed:
+            return
+        self._closed = True
+        pending, self._pending = self._pending, None
+        if pending is not None and not pending.done():
+            pending.add_done_callback(self._executor._release)
+        else:
+            self._executor._release()
+
+    def __del__(self) -> None:
+        """Release the slot of an iterator dropped without being consumed."""
+        self.close()
+
+
+# Singleton instance
+dataset_executor = BlockingExecutor(
+    max_workers=settings.EXECUTOR_MAX_WORKERS,
+    max_queue=settings.EXECUTOR_MAX_QUEUE,
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the shared dataset executor."""
+    return await dataset_executor.run(func, *args, **kwargs)
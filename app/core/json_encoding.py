@@ -0,0 +1,73 @@
+"""Pluggable JSON encoder for the GraphQL and REST responses."""
+
+import json
+import logging
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def stdlib_dumps(content: Any) -> bytes:
+    """Encode with the standard library, as FastAPI's JSONResponse does."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Encode with orjson (non-finite floats become null)."""
+    return orjson.dumps(content)
+
+
+# Encoder name -> function encoding a JSON-compatible value to UTF-8 bytes
+JSON_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "json": stdlib_dumps,
+    "orjson": orjson_dumps,
+}
+
+
+def orjson_available() -> bool:
+    """Return True if the optional orjson dependency is installed."""
+    return orjson is not None
+
+
+def get_json_encoder(name: str) -> Callable[[Any], bytes]:
+    """
+    Get a JSON encoder by name.
+
+    Args:
+        name: Encoder name (``json`` or ``orjson``)
+
+    Returns:
+        The encoder; the standard library one if orjson is selected but not installed
+
+    Raises:
+        ValueError: If the encoder is unknown
+    """
+    if name not in JSON_ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {name}")
+    if name == "orjson" and not orjson_available():
+        logger.warning("orjson is not installed, falling back to the json encoder")
+        return stdlib_dumps
+    return JSON_ENCODERS[name]
+
+
+# Encoder selected by the settings
+encode_json = get_json_encoder(settings.JSON_ENCODER)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured encoder."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode the response content."""
+        return encode_json(content)
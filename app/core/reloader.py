@@ -0,0 +1,177 @@
+"""Background reloads of the dataset (file watch, SIGHUP and admin endpoint)."""
+
+import asyncio
+import logging
+import signal
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.services.products_service import products_service
+
+logger = logging.getLogger(__name__)
+
+# Signal requesting a reload (not available on every platform)
+RELOAD_SIGNAL = getattr(signal, "SIGHUP", None)
+
+
+class DatasetReloader:
+    """
+    Coordinates dataset reloads triggered by polling, signals or the admin endpoint.
+
+    Reloads run on a worker thread; concurrent triggers join the reload already in
+    progress instead of starting another one.
+    """
+
+    def __init__(
+        self,
+        reload: Callable[[bool], Dict[str, Any]],
+        changed_fingerprint: Callable[[], Optional[Dict[str, str]]],
+    ):
+        """
+        Initialize the reloader.
+
+        Args:
+            reload: Blocking callable reloading the dataset, taking a ``force`` flag
+            changed_fingerprint: Blocking callable returning the new CSV fingerprint if
+                the CSV changed since the loaded version, else None
+        """
+        self._reload = reload
+        self._changed_fingerprint = changed_fingerprint
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._pending: Optional[Dict[str, str]] = None
+        self.reload_count = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.last_reload_at: Optional[float] = None
+
+    async def reload(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Reload the dataset, joining a reload already in progress.
+
+        Args:
+            force: Reload even if the CSV did not change
+
+        Returns:
+            Result of the reload (see ``ProductsService.reload_dataset``)
+
+        Raises:
+            IOError: If the new dataset cannot be loaded (the current one is kept)
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(force))
+        return await asyncio.shield(self._task)
+
+    async def _run(self, force: bool) -> Dict[str, Any]:
+        """Run one reload on a worker thread and record the outcome."""
+        try:
+            result = await asyncio.to_thread(self._reload, force)
+        except Exception as e:  # The current dataset keeps serving; report the failure
+            self.last_error = str(e)
+            logger.error("Dataset reload failed, keeping the current version: %s", e)
+            raise
+        self.last_error = None
+        self.last_result = result
+        self.last_reload_at = time.time()
+        if result.get("reloaded"):
+            self.reload_count += 1
+        return result
+
+    def trigger(self) -> None:
+        """Start a reload in the background (signal handlers, watchers)."""
+        task = asyncio.get_running_loop().create_task(self.reload())
+        # Failures are logged and recorded by _run
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def check_source(self) -> bool:
+        """
+        Reload if the CSV changed and stayed unchanged since the previous check.
+
+        Waiting for two identical observations avoids reloading a file that is still
+        being written; replacing the CSV with an atomic rename is still recommended.
+
+        Returns:
+            True if a reload was started
+        """
+        fingerprint = await asyncio.to_thread(self._changed_fingerprint)
+        if fingerprint is None:
+            self._pending = None
+            return False
+        if fingerprint != self._pending:
+            self._pending = fingerprint
+            return False
+        self._pending = None
+        await self.reload()
+        return True
+
+    def start_watching(self, interval_seconds: float) -> None:
+        """
+        Poll the CSV for changes in the background.
+
+        Args:
+            interval_seconds: Seconds between checks (0 or less disables polling)
+        """
+        if interval_seconds <= 0 or self._watcher is not None:
+            return
+        self._watcher = asyncio.get_running_loop().create_task(self._watch(interval_seconds))
+
+    async def _watch(self, interval_seconds: float) -> None:
+        """Polling loop run by ``start_watching``."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.check_source()
+            except Exception as e:  # Keep watching after a failed reload
+                logger.warning("Dataset change check failed: %s", e)
+
+    def install_signal_handler(self, signum: Optional[int] = RELOAD_SIGNAL) -> bool:
+        """
+        Reload the dataset when the process receives a signal (SIGHUP by default).
+
+        Args:
+            signum: Signal number
+
+        Returns:
+            True if the handler was installed (not supported on every platform)
+        """
+        if signum is None:
+            return False
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, self.trigger)
+            return True
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.info("Signal-triggered dataset reload is not available here")
+            return False
+
+    async def stop(self, signum: Optional[int] = RELOAD_SIGNAL) -> None:
+        """Stop polling and remove the signal handler."""
+        if signum is not None:
+            try:
+                asyncio.get_running_loop().remove_signal_handler(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the reload status.
+
+        Returns:
+            Dictionary with the reload count, last result, last error and time
+        """
+        return {
+            "reload_count": self.reload_count,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "last_reload_at": self.last_reload_at,
+        }
+
+
+# Singleton instance
+dataset_reloader = DatasetReloader(
+    reload=products_service.reload_dataset,
+    changed_fingerprint=products_service.changed_source_fingerprint,
+)
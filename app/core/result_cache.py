@@ -0,0 +1,188 @@
+"""Bounded LRU/TTL cache for search results."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Default of ``get`` telling a miss apart from a cached None
+_MISSING = object()
+
+
+def estimate_size(result: Any) -> int:
+    """
+    Approximate the memory held by a search result.
+
+    Counts the containers plus every scalar cell; the estimate is only used to
+    enforce the cache byte budget, so shared objects (interned strings, small ints)
+    are deliberately over-counted.
+
+    Args:
+        result: List of rows (pydantic models or dicts) or mapping of column lists
+
+    Returns:
+        Estimated size in bytes
+    """
+    size = sys.getsizeof(result)
+    if not isinstance(result, (dict, list, tuple)):
+        return size
+    groups = result.values() if isinstance(result, dict) else result
+    for group in groups:
+        if hasattr(group, "__dict__"):
+            group = group.__dict__
+        cells = group.values() if isinstance(group, dict) else group
+        size += sys.getsizeof(group) + sum(sys.getsizeof(cell) for cell in cells)
+    return size
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a time-to-live and entry and byte budgets.
+
+    Entries are evicted least recently used first whenever either budget is exceeded;
+    expired entries are dropped when they are read.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results (0 disables the cache)
+            max_bytes: Maximum estimated size of all cached results
+            ttl_seconds: Lifetime of an entry (0 or less for no expiry)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Returned on a miss or expired entry
+
+        Returns:
+            The cached value, or ``default`` on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = entry
+            if expires_at and self._clock() >= expires_at:
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int) -> bool:
+        """
+        Cache a value, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache (must not be mutated afterwards)
+            size: Estimated size of the value in bytes
+
+        Returns:
+            True if the value was cached (values larger than the byte budget are not)
+        """
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return False
+
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key, (_, oldest_size, _) = next(iter(self._entries.items()))
+                self._remove(oldest_key, oldest_size)
+                self.evictions += 1
+        return True
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        sizeof: Callable[[Any], int] = estimate_size,
+    ) -> Any:
+        """
+        Get a cached value, computing and caching it on a miss.
+
+        A computed None is cached like any other value.
+
+        Args:
+            key: Cache key
+            compute: Produces the value on a miss
+            sizeof: Estimates the size of the computed value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, sizeof(value))
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dictionary with entries, bytes, hits, misses, evictions and expirations
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: Hashable, size: int) -> None:
+        """Remove an entry; the caller holds the lock."""
+        del self._entries[key]
+        self._bytes -= size
@@ -0,0 +1,151 @@
+"""Background dataset warm-up and readiness state."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+class DatasetWarmup:
+    """
+    Loads the dataset in the background at startup and tracks readiness.
+
+    The load runs on a worker thread so the application starts accepting connections
+    (and answering ``/`` and ``/ready``) immediately; ``/ready`` reports not-ready until
+    the load finishes so load balancers only route traffic to warm workers.
+
+    A failed load is retried with exponential backoff. The dataset also counts as
+    ready as soon as it is loaded by other means (a reload or a lazy first load).
+    """
+
+    def __init__(self, retry_seconds: float = 1.0, max_retry_seconds: float = 60.0):
+        """
+        Initialize the warm-up state.
+
+        Args:
+            retry_seconds: Delay before retrying a failed load, doubled after every
+                failure (0 disables retries)
+            max_retry_seconds: Upper bound of the retry delay
+        """
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.duration_seconds: Optional[float] = None
+        self.attempts = 0
+        self._is_loaded: Callable[[], bool] = lambda: False
+        self._loading = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the dataset finished loading (by the warm-up or otherwise)."""
+        if self.state != READY and self._is_loaded():
+            self.state = READY
+            self.error = None
+        return self.state == READY
+
+    def start(
+        self, load: Callable[[], Any], is_loaded: Optional[Callable[[], bool]] = None
+    ) -> asyncio.Task:
+        """
+        Start loading in the background (no-op unless idle or a previous attempt failed).
+
+        Must be called from the running event loop.
+
+        Args:
+            load: Blocking callable that loads the dataset
+            is_loaded: Tells whether the dataset is loaded, whoever loaded it
+
+        Returns:
+            The warm-up task
+        """
+        if is_loaded is not None:
+            self._is_loaded = is_loaded
+        if self._task is None or (self.state == FAILED and self._task.done()):
+            self.state = WARMING
+            self.error = None
+            self._task = asyncio.get_running_loop().create_task(self._run(load))
+        return self._task
+
+    async def _run(self, load: Callable[[], Any]) -> None:
+        """Run the load on a worker thread, retrying failures until it succeeds."""
+        delay = self.retry_seconds
+        while not await self._attempt(load):
+            if self.retry_seconds <= 0:
+                return
+            logger.info("Retrying dataset warm-up in %.1fs", delay)
+            await asyncio.sleep(delay)
+            if self.ready:
+                # Loaded meanwhile by a reload or a request
+                return
+            self.state = WARMING
+            delay = min(delay * 2, self.max_retry_seconds)
+
+    async def _attempt(self, load: Callable[[], Any]) -> bool:
+        """Run one load on a worker thread and record the outcome."""
+        started = time.perf_counter()
+        self.attempts += 1
+        self._loading = True
+        try:
+            await asyncio.to_thread(load)
+        except Exception as e:  # Readiness must reflect any loading failure
+            self.state = FAILED
+            self.error = str(e)
+            logger.error("Dataset warm-up failed (attempt %d): %s", self.attempts, e)
+            return False
+        else:
+            self.state = READY
+            self.error = None
+            logger.info("Dataset warm-up finished in %.2fs", time.perf_counter() - started)
+            return True
+        finally:
+            self._loading = False
+            self.duration_seconds = round(time.perf_counter() - started, 3)
+
+    def mark_ready(self) -> None:
+        """Mark the dataset as ready (used when warm-up is disabled)."""
+        self.state = READY
+
+    async def stop(self) -> None:
+        """
+        Stop the warm-up.
+
+        A pending retry is cancelled; a running load is waited for (the load thread
+        cannot be interrupted).
+        """
+        if self._task is not None and not self._task.done():
+            if not self._loading:
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the readiness status.
+
+        Returns:
+            Dictionary with state, error and warm-up duration
+        """
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "error": self.error,
+            "attempts": self.attempts,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+# Singleton instance
+dataset_warmup = DatasetWarmup(
+    retry_seconds=settings.DATASET_WARMUP_RETRY_SECONDS,
+    max_retry_seconds=settings.DATASET_WARMUP_MAX_RETRY_SECONDS,
+)
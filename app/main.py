@@ -1,19 +1,50 @@
 """Main FastAPI application entry point."""
 
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.controllers.admin.router import router as admin_router
 from app.controllers.auth.router import router as auth_router
+from app.controllers.export.router import router as export_router
 from app.controllers.products.router import graphql_router
+from app.core.compression import CompressionMiddleware, precompressed_response
+from app.core.config import settings
+from app.core.executor import dataset_executor
+from app.core.json_encoding import FastJSONResponse, encode_json
+from app.core.reloader import dataset_reloader
+from app.core.warmup import dataset_warmup
+from app.services.products_service import products_service
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: warm the dataset up and watch for reloads; clean up on shutdown."""
+    if settings.DATASET_WARMUP_ENABLED:
+        dataset_warmup.start(
+            products_service.warm_up, is_loaded=lambda: products_service.repository.is_loaded
+        )
+    else:
+        dataset_warmup.mark_ready()
+    dataset_reloader.install_signal_handler()
+    dataset_reloader.start_watching(settings.DATASET_RELOAD_POLL_SECONDS)
+    yield
+    await dataset_reloader.stop()
+    await dataset_warmup.stop()
+    dataset_executor.shutdown(wait=False)
+
+
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="Pipol Challenge API",
     description="""
 # Pipol Challenge API
@@ -110,8 +141,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression middleware (negotiated zstd/br/gzip)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Serve the OpenAPI document encoded and compressed once, instead of FastAPI's route
+app.router.routes = [
+    route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi(request: Request):
+    """OpenAPI document, precompressed."""
+    return await precompressed_response(
+        request, ("openapi", app.version), lambda: encode_json(app.openapi())
+    )
+
+
 # Include routers
 app.include_router(auth_router)
+app.include_router(admin_router)
+app.include_router(export_router)
 app.include_router(graphql_router, tags=["GraphQL Data Service"])
 
 
@@ -140,3 +191,12 @@ async def root():
             }
         }
     }
+
+
+@app.get("/ready", tags=["Health"])
+async def ready():
+    """Readiness endpoint - 200 once the dataset is loaded, 503 until then (warming or failed)."""
+    readiness = dataset_warmup.status()
+    if readiness["ready"]:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=readiness)
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=readiness)
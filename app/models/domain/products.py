@@ -1,6 +1,6 @@
 """Product data models."""
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -51,14 +51,79 @@ class ProductDataFilter(BaseModel):
     """Filter parameters for product data queries."""
 
     date: Optional[str] = Field(None, description="Filter by date (id_tie_fecha_valor)")
+    date_from: Optional[str] = Field(None, description="First date included (YYYYMMDD)")
+    date_to: Optional[str] = Field(None, description="Last date included (YYYYMMDD)")
     client_id: Optional[int] = Field(None, description="Filter by client ID")
     brand: Optional[str] = Field(None, description="Filter by product brand")
     sku: Optional[str] = Field(None, description="Filter by product SKU")
     category: Optional[str] = Field(None, description="Filter by category")
     limit: Optional[int] = Field(100, description="Maximum number of records to return", le=1000)
     offset: Optional[int] = Field(0, description="Number of records to skip", ge=0)
+    order_by: Optional[str] = Field(
+        None,
+        description="Sort field (date, revenue, cart_additions, cart_removals, page_views)",
+    )
+    descending: bool = Field(False, description="Sort from the largest value")
 
     class Config:
         """Pydantic configuration."""
 
         json_schema_extra = {"example": {"brand": "STANLEY", "limit": 10, "offset": 0}}
+
+
+class ProductPage(BaseModel):
+    """A keyset-paginated slice of the rows matching a filter."""
+
+    items: List[ProductData] = Field(..., description="Rows of the page")
+    positions: List[int] = Field(..., description="Dataset row position of each item")
+    total_count: int = Field(..., description="Number of rows matching the filter")
+    has_next_page: bool = Field(..., description="Whether more rows follow the page")
+    has_previous_page: bool = Field(..., description="Whether rows precede the page")
+    dataset_version: str = Field(..., description="Version of the dataset the page was read from")
+
+
+class AggregateGroup(BaseModel):
+    """Metrics of the rows sharing one combination of group-by values."""
+
+    keys: List[Optional[str]] = Field(..., description="Group-by values, in group-by order")
+    values: List[Optional[float]] = Field(..., description="Metric values, in metric order")
+    count: int = Field(..., description="Number of rows in the group")
+
+
+class TopProduct(BaseModel):
+    """A product ranked by the total of a measure over the rows matching a filter."""
+
+    sku: str = Field(..., description="Product SKU (desc_ga_sku_producto)")
+    name: Optional[str] = Field(None, description="Product name (desc_ga_nombre_producto_1)")
+    brand: Optional[str] = Field(None, description="Product brand (desc_ga_marca_producto)")
+    value: float = Field(..., description="Total of the measure over the product's rows")
+    rows: int = Field(..., description="Number of matching rows of the product")
+
+
+class DatasetMetadata(BaseModel):
+    """Immutable summary of one dataset version, computed once when it is loaded."""
+
+    dataset_version: str = Field(..., description="Version of the dataset")
+    total_records: int = Field(..., description="Total number of records")
+    brands: Tuple[str, ...] = Field(..., description="Sorted distinct brands")
+    categories: Tuple[str, ...] = Field(..., description="Sorted distinct main categories")
+    min_date: Optional[str] = Field(None, description="Earliest id_tie_fecha_valor")
+    max_date: Optional[str] = Field(None, description="Latest id_tie_fecha_valor")
+    column_totals: Dict[str, float] = Field(
+        default_factory=dict, description="Sum of every numeric measure (fc_*) column"
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        frozen = True
+
+    @property
+    def brands_count(self) -> int:
+        """Number of distinct brands."""
+        return len(self.brands)
+
+    @property
+    def categories_count(self) -> int:
+        """Number of distinct main categories."""
+        return len(self.categories)
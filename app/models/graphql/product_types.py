@@ -1,46 +1,70 @@
 """GraphQL types and schema definitions using Strawberry."""
 
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
 import strawberry
 
 
 @strawberry.type
 class ProductDataType:
-    """GraphQL type for product data."""
-
-    id_tie_fecha_valor: Optional[str] = strawberry.field(description="Date value ID")
-    id_cli_cliente: Optional[int] = strawberry.field(description="Client ID")
-    id_ga_vista: Optional[int] = strawberry.field(description="View ID")
-    id_ga_tipo_dispositivo: Optional[int] = strawberry.field(description="Device type ID")
-    id_ga_fuente_medio: Optional[int] = strawberry.field(description="Source/Medium ID")
-    desc_ga_sku_producto: Optional[str] = strawberry.field(description="Product SKU")
-    desc_ga_categoria_producto: Optional[str] = strawberry.field(description="Product category")
-    fc_agregado_carrito_cant: Optional[int] = strawberry.field(description="Added to cart quantity")
+    """
+    GraphQL type for product data.
+
+    Every field defaults to None so results can be built from a projection of the
+    selected fields only.
+    """
+
+    id_tie_fecha_valor: Optional[str] = strawberry.field(default=None, description="Date value ID")
+    id_cli_cliente: Optional[int] = strawberry.field(default=None, description="Client ID")
+    id_ga_vista: Optional[int] = strawberry.field(default=None, description="View ID")
+    id_ga_tipo_dispositivo: Optional[int] = strawberry.field(
+        default=None, description="Device type ID"
+    )
+    id_ga_fuente_medio: Optional[int] = strawberry.field(
+        default=None, description="Source/Medium ID"
+    )
+    desc_ga_sku_producto: Optional[str] = strawberry.field(default=None, description="Product SKU")
+    desc_ga_categoria_producto: Optional[str] = strawberry.field(
+        default=None, description="Product category"
+    )
+    fc_agregado_carrito_cant: Optional[int] = strawberry.field(
+        default=None, description="Added to cart quantity"
+    )
     fc_ingreso_producto_monto: Optional[float] = strawberry.field(
-        description="Product revenue amount"
+        default=None, description="Product revenue amount"
     )
     fc_retirado_carrito_cant: Optional[int] = strawberry.field(
-        description="Removed from cart quantity"
+        default=None, description="Removed from cart quantity"
     )
     fc_detalle_producto_cant: Optional[int] = strawberry.field(
-        description="Product detail views count"
-    )
-    fc_producto_cant: Optional[int] = strawberry.field(description="Product quantity")
-    desc_ga_nombre_producto: Optional[str] = strawberry.field(description="Product name (1)")
-    fc_visualizaciones_pag_cant: Optional[int] = strawberry.field(description="Page views count")
-    flag_pipol: Optional[int] = strawberry.field(description="Pipol flag")
-    sasasa: Optional[str] = strawberry.field(description="SASASA field")
-    id_ga_producto: Optional[int] = strawberry.field(description="Product ID")
-    desc_ga_nombre_producto_1: Optional[str] = strawberry.field(description="Product name")
-    desc_ga_sku_producto_1: Optional[str] = strawberry.field(description="Product SKU (alt)")
-    desc_ga_marca_producto: Optional[str] = strawberry.field(description="Product brand")
-    desc_ga_cod_producto: Optional[str] = strawberry.field(description="Product code")
+        default=None, description="Product detail views count"
+    )
+    fc_producto_cant: Optional[int] = strawberry.field(default=None, description="Product quantity")
+    desc_ga_nombre_producto: Optional[str] = strawberry.field(
+        default=None, description="Product name (1)"
+    )
+    fc_visualizaciones_pag_cant: Optional[int] = strawberry.field(
+        default=None, description="Page views count"
+    )
+    flag_pipol: Optional[int] = strawberry.field(default=None, description="Pipol flag")
+    sasasa: Optional[str] = strawberry.field(default=None, description="SASASA field")
+    id_ga_producto: Optional[int] = strawberry.field(default=None, description="Product ID")
+    desc_ga_nombre_producto_1: Optional[str] = strawberry.field(
+        default=None, description="Product name"
+    )
+    desc_ga_sku_producto_1: Optional[str] = strawberry.field(
+        default=None, description="Product SKU (alt)"
+    )
+    desc_ga_marca_producto: Optional[str] = strawberry.field(
+        default=None, description="Product brand"
+    )
+    desc_ga_cod_producto: Optional[str] = strawberry.field(default=None, description="Product code")
     desc_categoria_producto: Optional[str] = strawberry.field(
-        description="Product category (detailed)"
+        default=None, description="Product category (detailed)"
     )
     desc_categoria_prod_principal: Optional[str] = strawberry.field(
-        description="Main product category"
+        default=None, description="Main product category"
     )
 
 
@@ -49,6 +73,12 @@ class ProductFilterInput:
     """GraphQL input type for filtering product data."""
 
     date: Optional[str] = strawberry.field(default=None, description="Filter by date")
+    date_from: Optional[str] = strawberry.field(
+        default=None, description="First date included (YYYYMMDD)"
+    )
+    date_to: Optional[str] = strawberry.field(
+        default=None, description="Last date included (YYYYMMDD)"
+    )
     client_id: Optional[int] = strawberry.field(default=None, description="Filter by client ID")
     brand: Optional[str] = strawberry.field(default=None, description="Filter by product brand")
     sku: Optional[str] = strawberry.field(default=None, description="Filter by product SKU")
@@ -59,6 +89,55 @@ class ProductFilterInput:
     offset: Optional[int] = strawberry.field(default=0, description="Number of records to skip")
 
 
+@strawberry.type
+class PageInfoType:
+    """GraphQL type for Relay-style pagination info."""
+
+    has_next_page: bool = strawberry.field(description="Whether more rows follow this page")
+    has_previous_page: bool = strawberry.field(description="Whether rows precede this page")
+    start_cursor: Optional[str] = strawberry.field(description="Cursor of the first row")
+    end_cursor: Optional[str] = strawberry.field(
+        description="Cursor of the last row (pass as 'after' to continue)"
+    )
+
+
+@strawberry.type
+class ProductEdgeType:
+    """GraphQL type for a product row and its cursor."""
+
+    cursor: str = strawberry.field(description="Opaque cursor of this row")
+    node: ProductDataType = strawberry.field(description="Product data")
+
+
+@strawberry.type
+class ProductConnectionType:
+    """GraphQL type for a cursor-paginated list of products."""
+
+    edges: List[ProductEdgeType] = strawberry.field(description="Rows of this page")
+    page_info: PageInfoType = strawberry.field(description="Pagination info")
+    total_count: int = strawberry.field(description="Number of rows matching the filter")
+
+
+@strawberry.type
+class CacheStatsType:
+    """GraphQL type for the search result cache counters."""
+
+    entries: int = strawberry.field(description="Number of cached results")
+    bytes: int = strawberry.field(description="Estimated size of the cached results")
+    hits: int = strawberry.field(description="Searches answered from the cache")
+    misses: int = strawberry.field(description="Searches evaluated against the dataset")
+    evictions: int = strawberry.field(description="Results evicted to stay within budget")
+    expirations: int = strawberry.field(description="Results dropped after their TTL")
+
+
+@strawberry.type
+class ColumnTotalType:
+    """GraphQL type for the total of a numeric column."""
+
+    column: str = strawberry.field(description="Column name")
+    total: float = strawberry.field(description="Sum of the column over the dataset")
+
+
 @strawberry.type
 class StatsType:
     """GraphQL type for statistics."""
@@ -66,3 +145,123 @@ class StatsType:
     total_records: int = strawberry.field(description="Total number of records in dataset")
     brands_count: int = strawberry.field(description="Number of unique brands")
     categories_count: int = strawberry.field(description="Number of unique categories")
+    min_date: Optional[str] = strawberry.field(
+        default=None, description="Earliest date (id_tie_fecha_valor) in the dataset"
+    )
+    max_date: Optional[str] = strawberry.field(
+        default=None, description="Latest date (id_tie_fecha_valor) in the dataset"
+    )
+    column_totals: List[ColumnTotalType] = strawberry.field(
+        default_factory=list, description="Totals of the numeric measure columns"
+    )
+
+
+@strawberry.enum(description="Dimension to group aggregated rows by")
+class AggregateDimension(Enum):
+    """Group-by dimensions of the aggregate query."""
+
+    BRAND = "brand"
+    CATEGORY = "category"
+    DATE = "date"
+    CLIENT = "client"
+    DEVICE_TYPE = "device_type"
+    SOURCE_MEDIUM = "source_medium"
+
+
+@strawberry.enum(description="Aggregate function applied to a measure")
+class AggregateFunction(Enum):
+    """Aggregate functions (COUNT counts the non-missing values)."""
+
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+    COUNT = "count"
+
+
+@strawberry.enum(description="Numeric measure column")
+class MeasureColumn(Enum):
+    """Measure columns that can be aggregated."""
+
+    FC_AGREGADO_CARRITO_CANT = "fc_agregado_carrito_cant"
+    FC_RETIRADO_CARRITO_CANT = "fc_retirado_carrito_cant"
+    FC_DETALLE_PRODUCTO_CANT = "fc_detalle_producto_cant"
+    FC_PRODUCTO_CANT = "fc_producto_cant"
+    FC_VISUALIZACIONES_PAG_CANT = "fc_visualizaciones_pag_cant"
+    FC_INGRESO_PRODUCTO_MONTO = "fc_ingreso_producto_monto"
+
+
+@strawberry.input
+class MetricInput:
+    """GraphQL input type for a metric to compute per group."""
+
+    column: MeasureColumn = strawberry.field(description="Measure to aggregate")
+    function: AggregateFunction = strawberry.field(
+        default=AggregateFunction.SUM, description="Aggregate function (default SUM)"
+    )
+
+
+@strawberry.type
+class GroupKeyType:
+    """GraphQL type for the value of one group-by dimension."""
+
+    dimension: AggregateDimension = strawberry.field(description="Group-by dimension")
+    value: Optional[str] = strawberry.field(description="Value of the dimension (null if missing)")
+
+
+@strawberry.type
+class MetricValueType:
+    """GraphQL type for one computed metric."""
+
+    column: MeasureColumn = strawberry.field(description="Aggregated measure")
+    function: AggregateFunction = strawberry.field(description="Aggregate function")
+    value: Optional[float] = strawberry.field(description="Metric value (null if undefined)")
+
+
+@strawberry.type
+class AggregateGroupType:
+    """GraphQL type for the metrics of one group of rows."""
+
+    keys: List[GroupKeyType] = strawberry.field(description="Group-by values of the group")
+    metrics: List[MetricValueType] = strawberry.field(description="Requested metrics")
+    count: int = strawberry.field(description="Number of rows in the group")
+
+
+@strawberry.type
+class TopProductType:
+    """GraphQL type for a product ranked by a measure."""
+
+    sku: str = strawberry.field(description="Product SKU")
+    name: Optional[str] = strawberry.field(description="Product name")
+    brand: Optional[str] = strawberry.field(description="Product brand")
+    value: float = strawberry.field(description="Total of the measure over the matching rows")
+    rows: int = strawberry.field(description="Number of matching rows of the product")
+
+
+@strawberry.enum(description="Field to sort products by")
+class ProductSortField(Enum):
+    """Sortable product fields."""
+
+    DATE = "date"
+    REVENUE = "revenue"
+    CART_ADDITIONS = "cart_additions"
+    CART_REMOVALS = "cart_removals"
+    PAGE_VIEWS = "page_views"
+
+
+@strawberry.enum(description="Sort direction")
+class SortDirection(Enum):
+    """Sort directions (missing values always sort last)."""
+
+    ASC = "asc"
+    DESC = "desc"
+
+
+@strawberry.input
+class ProductOrderInput:
+    """GraphQL input type for the order of searched products."""
+
+    field: ProductSortField = strawberry.field(description="Field to sort by")
+    direction: SortDirection = strawberry.field(
+        default=SortDirection.ASC, description="Sort direction (default ASC)"
+    )
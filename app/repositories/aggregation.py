@@ -0,0 +1,175 @@
+"""Group-by aggregation of the filtered rows, evaluated with vectorised pandas groupby."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.domain.products import AggregateGroup, TopProduct
+
+# Group-by dimension -> dataset column
+GROUP_BY_COLUMNS: Dict[str, str] = {
+    "brand": "desc_ga_marca_producto",
+    "category": "desc_categoria_prod_principal",
+    "date": "id_tie_fecha_valor",
+    "client": "id_cli_cliente",
+    "device_type": "id_ga_tipo_dispositivo",
+    "source_medium": "id_ga_fuente_medio",
+}
+
+# Columns identifying and describing a product in top-N rankings
+SKU_COLUMN = "desc_ga_sku_producto"
+NAME_COLUMN = "desc_ga_nombre_producto_1"
+BRAND_COLUMN = "desc_ga_marca_producto"
+
+# Aggregate function -> pandas reduction (``count`` counts the non-missing values)
+AGGREGATE_FUNCTIONS: Dict[str, str] = {
+    "sum": "sum",
+    "avg": "mean",
+    "min": "min",
+    "max": "max",
+    "count": "count",
+}
+
+
+def _key(value: Any) -> Optional[str]:
+    """Group-by value as exposed to clients (missing values become None)."""
+    return None if pd.isna(value) else str(value)
+
+
+def metric_value(value: Any) -> Optional[float]:
+    """Metric value as exposed to clients (missing or undefined values become None)."""
+    return None if pd.isna(value) else float(value)
+
+
+def aggregate_rows(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray],
+    group_by: Sequence[str],
+    metrics: Sequence[Tuple[str, str]],
+) -> List[AggregateGroup]:
+    """
+    Aggregate measures of a subset of rows, grouped by dimensions.
+
+    Only the grouped and aggregated columns of the matching rows are copied; every
+    metric is a single vectorised groupby reduction over them.
+
+    Args:
+        df: Typed dataset
+        positions: Row positions to aggregate, or None for every row
+        group_by: Distinct dimensions (keys of ``GROUP_BY_COLUMNS``)
+        metrics: (column, function) pairs, functions being keys of ``AGGREGATE_FUNCTIONS``
+
+    Returns:
+        One group per combination of group-by values present in the rows, sorted by
+        those values (missing values last); a single group when ``group_by`` is empty
+    """
+    dimension_columns = [GROUP_BY_COLUMNS[dimension] for dimension in group_by]
+    columns = list(dict.fromkeys(dimension_columns + [column for column, _ in metrics]))
+    rows = df[columns] if positions is None else df[columns].take(positions)
+
+    if not dimension_columns:
+        values = [
+            metric_value(getattr(rows[column], AGGREGATE_FUNCTIONS[function])())
+            for column, function in metrics
+        ]
+        return [AggregateGroup(keys=[], values=values, count=len(rows))]
+
+    grouped = rows.groupby(dimension_columns, observed=True, dropna=False, sort=True)
+    return build_groups(
+        grouped.size(),
+        [getattr(grouped[column], AGGREGATE_FUNCTIONS[function])() for column, function in metrics],
+    )
+
+
+def build_groups(counts: pd.Series, metric_values: Sequence[pd.Series]) -> List[AggregateGroup]:
+    """
+    Build the groups of a grouped aggregation.
+
+    Args:
+        counts: Number of rows per group, indexed by the group-by values
+        metric_values: Value of every metric per group, on the same index
+
+    Returns:
+        One group per entry of ``counts``, in its order
+    """
+    if counts.empty:
+        return []
+    values = [series.reindex(counts.index).tolist() for series in metric_values]
+    keys = counts.index.to_frame(index=False).itertuples(index=False, name=None)
+    return [
+        AggregateGroup(
+            keys=[_key(value) for value in key],
+            values=[metric_value(metric[i]) for metric in values],
+            count=count,
+        )
+        for i, (key, count) in enumerate(zip(keys, counts.tolist(), strict=True))
+    ]
+
+
+def top_products(
+    df: pd.DataFrame, positions: Optional[np.ndarray], measure_column: str, n: int
+) -> List[TopProduct]:
+    """
+    Rank the SKUs of a subset of rows by the total of a measure.
+
+    Rows are grouped by SKU in one pass (factorize + weighted bincount) and the ``n``
+    largest totals are picked with ``np.argpartition``, so only those ``n`` are sorted;
+    the name and brand are read for the selected SKUs only.
+
+    Args:
+        df: Typed dataset
+        positions: Row positions to rank, or None for every row
+        measure_column: Measure to total (missing values count as 0)
+        n: Number of products to return
+
+    Returns:
+        Up to ``n`` products by descending total; ties keep the order in which the
+        SKUs first appear in the rows
+    """
+    if SKU_COLUMN not in df.columns or n <= 0:
+        return []
+    skus = df[SKU_COLUMN]
+    if positions is not None:
+        skus = skus.take(positions)
+    # Codes follow the order of first appearance; missing SKUs get -1
+    codes, keys = pd.factorize(skus, use_na_sentinel=True)
+    if len(keys) == 0:
+        return []
+
+    if measure_column in df.columns:
+        measure = df[measure_column].array
+        if positions is not None:
+            measure = measure.take(positions)
+        values = measure.to_numpy(dtype=np.float64, na_value=0.0)
+    else:
+        values = np.zeros(len(codes))
+    present = codes >= 0
+    totals = np.bincount(codes[present], weights=values[present], minlength=len(keys))
+    counts = np.bincount(codes[present], minlength=len(keys))
+
+    k = min(n, len(keys))
+    top = np.argpartition(-totals, k - 1)[:k]
+    top = top[np.lexsort((top, -totals[top]))]
+
+    # Row of the first appearance of every code: where the running maximum code grows
+    running = np.maximum.accumulate(codes)
+    first_rows = np.flatnonzero(np.diff(running, prepend=-1) > 0)[top]
+    if positions is not None:
+        first_rows = positions[first_rows]
+
+    def labels(column: str) -> List[Optional[str]]:
+        if column not in df.columns:
+            return [None] * k
+        return [_key(value) for value in df[column].array.take(first_rows)]
+
+    return [
+        TopProduct(
+            sku=str(keys[code]),
+            name=name,
+            brand=brand,
+            value=float(totals[code]),
+            rows=int(counts[code]),
+        )
+        for code, name, brand in zip(top, labels(NAME_COLUMN), labels(BRAND_COLUMN), strict=True)
+    ]
@@ -0,0 +1,328 @@
+"""In-memory secondary indexes over the product dataset."""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.result_cache import ResultCache
+
+EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+EMPTY_POSITIONS.flags.writeable = False
+
+# Distinct needles whose matches are kept per substring index
+SUBSTRING_CACHE_SIZE = 256
+
+
+class ColumnIndex:
+    """Exact-match index mapping each distinct value of a column to its row positions."""
+
+    def __init__(self, series: pd.Series):
+        """
+        Build the index in a single pass over the column.
+
+        Rows are grouped by value with a stable sort of the value codes, so the
+        positions stored for every value are in ascending (CSV) order. Missing values
+        are not indexed.
+
+        Args:
+            series: Column to index
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            keys = series.cat.categories.tolist()
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            keys = uniques.tolist()
+
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        missing = len(codes) - int(counts.sum())
+
+        # Missing values (code -1) sort first; drop them from the position array
+        self._set_groups(order[missing:].astype(np.intp, copy=False), keys, counts)
+
+    def _set_groups(self, positions: np.ndarray, keys: List[Hashable], counts: np.ndarray) -> None:
+        """Store row positions grouped by key, in key order, with each group's count."""
+        self._positions = positions
+        self._positions.flags.writeable = False
+        stops = np.cumsum(counts)
+        self._ranges: Dict[Hashable, tuple] = {
+            key: (int(stop - count), int(stop))
+            for key, count, stop in zip(keys, counts, stops, strict=True)
+            if count
+        }
+
+    def extend(self, series: pd.Series, offset: int) -> "ColumnIndex":
+        """
+        Build the index of the rows of this index followed by appended rows.
+
+        Only the appended column is grouped; the existing groups are moved to their
+        new place with one vectorised scatter, without sorting them again.
+
+        Args:
+            series: Column of the appended rows
+            offset: Row position of the first appended row
+
+        Returns:
+            New index over the existing and appended rows (this index is unchanged)
+        """
+        delta = ColumnIndex(series)
+        keys = list(self._ranges)
+        key_ids = {key: key_id for key_id, key in enumerate(keys)}
+        for key in delta._ranges:
+            if key not in key_ids:
+                key_ids[key] = len(keys)
+                keys.append(key)
+
+        old_counts = np.zeros(len(keys), dtype=np.intp)
+        old_counts[: len(self._ranges)] = [stop - start for start, stop in self._ranges.values()]
+        delta_ids = np.fromiter((key_ids[key] for key in delta._ranges), dtype=np.intp)
+        delta_counts = np.array(
+            [stop - start for start, stop in delta._ranges.values()], dtype=np.intp
+        )
+        counts = old_counts.copy()
+        counts[delta_ids] += delta_counts
+        starts = np.cumsum(counts) - counts
+
+        positions = np.empty(int(counts.sum()), dtype=np.intp)
+        # Existing groups keep their (ascending) order at the front of their new range
+        groups = np.repeat(np.arange(len(keys)), old_counts)
+        ranks = np.arange(len(groups)) - np.repeat(np.cumsum(old_counts) - old_counts, old_counts)
+        positions[starts[groups] + ranks] = self._positions
+        # Appended rows follow them, so every group stays ascending
+        groups = np.repeat(delta_ids, delta_counts)
+        ranks = np.arange(len(groups)) - np.repeat(
+            np.cumsum(delta_counts) - delta_counts, delta_counts
+        )
+        positions[starts[groups] + old_counts[groups] + ranks] = delta._positions + offset
+
+        index = type(self).__new__(type(self))
+        index._set_groups(positions, keys, counts)
+        return index
+
+    def __len__(self) -> int:
+        """Number of distinct indexed values."""
+        return len(self._ranges)
+
+    def values(self) -> List[Hashable]:
+        """Distinct indexed values."""
+        return list(self._ranges)
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """
+        Get the sorted row positions holding a value.
+
+        Args:
+            value: Value to look up
+
+        Returns:
+            Ascending array of row positions (empty if the value does not occur)
+        """
+        bounds = self._ranges.get(value)
+        if bounds is None:
+            return EMPTY_POSITIONS
+        return self._positions[bounds[0] : bounds[1]]
+
+    def count(self, value: Any) -> int:
+        """Number of rows holding a value."""
+        start, stop = self._ranges.get(value, (0, 0))
+        return stop - start
+
+
+class DatePartitions(ColumnIndex):
+    """
+    Exact-match index over the date column with its partitions laid out in date order.
+
+    Every date is a partition: a contiguous run of the positions array. Because the
+    runs are stored in ascending date order, any date range maps to a single run found
+    by binary search over the distinct dates, without scanning rows. When the dataset
+    is stored in date order (as a daily-appended CSV is) and no date is missing, each
+    partition is also a contiguous range of rows, and range results need no sorting.
+    """
+
+    def _set_groups(self, positions: np.ndarray, keys: List[Hashable], counts: np.ndarray) -> None:
+        """Store the groups in ascending key order and record the partition bounds."""
+        counts = np.asarray(counts)
+        order = sorted(range(len(keys)), key=lambda key_id: keys[key_id])
+        if order != list(range(len(keys))):
+            starts = np.cumsum(counts) - counts
+            runs = [positions[starts[key_id] : starts[key_id] + counts[key_id]] for key_id in order]
+            positions = np.concatenate(runs) if runs else positions
+            keys = [keys[key_id] for key_id in order]
+            counts = counts[order]
+
+        super()._set_groups(positions, keys, counts)
+        self._keys = list(self._ranges)
+        self._bounds = np.concatenate(([0], np.cumsum(counts[counts > 0]))).astype(np.intp)
+        # Rows stored in date order with no missing date: every partition is a
+        # contiguous row range (a row with a missing date would sit inside one)
+        self.ordered = bool(
+            np.all(positions[1:] > positions[:-1])
+            and (not len(positions) or positions[-1] - positions[0] + 1 == len(positions))
+        )
+
+    def range_bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        """
+        Locate the partitions of a date range in the positions array.
+
+        Args:
+            date_from: First date included (None for no lower bound)
+            date_to: Last date included (None for no upper bound)
+
+        Returns:
+            Start and stop offsets of the matching run of the positions array
+        """
+        low = bisect_left(self._keys, date_from) if date_from else 0
+        high = bisect_right(self._keys, date_to) if date_to else len(self._keys)
+        high = max(low, high)
+        return int(self._bounds[low]), int(self._bounds[high])
+
+    def count_range(self, date_from: Optional[str], date_to: Optional[str]) -> int:
+        """Number of rows in a date range, without materialising them."""
+        start, stop = self.range_bounds(date_from, date_to)
+        return stop - start
+
+    def match_range(self, date_from: Optional[str], date_to: Optional[str]) -> np.ndarray:
+        """
+        Get the rows of a date range.
+
+        Args:
+            date_from: First date included (None for no lower bound)
+            date_to: Last date included (None for no upper bound)
+
+        Returns:
+            Read-only ascending array of row positions
+        """
+        start, stop = self.range_bounds(date_from, date_to)
+        positions = self._positions[start:stop]
+        if self.ordered:
+            return positions
+        positions = np.sort(positions)
+        positions.flags.writeable = False
+        return positions
+
+    def partitions(self) -> List[Tuple[Hashable, int]]:
+        """Distinct dates in ascending order with their row counts."""
+        return [(key, stop - start) for key, (start, stop) in self._ranges.items()]
+
+
+class SubstringIndex:
+    """Case-insensitive substring index over a low-cardinality text column."""
+
+    def __init__(self, series: pd.Series, cache_size: int = SUBSTRING_CACHE_SIZE):
+        """
+        Build the index from the column's distinct values.
+
+        Args:
+            series: Text column to index (typically categorical)
+            cache_size: Number of distinct needles whose matches are cached (the
+                cached matches also stay within ``MATCH_CACHE_MAX_BYTES``)
+        """
+        self._set_index(ColumnIndex(series), cache_size)
+
+    def _set_index(self, index: ColumnIndex, cache_size: int) -> None:
+        """Use an exact-match index over the column, with an empty match cache."""
+        self._index = index
+        self._cache_size = cache_size
+        self._folded = [(str(value).casefold(), value) for value in self._index.values()]
+        self._match_cache = match_cache(cache_size)
+
+    def extend(self, series: pd.Series, offset: int) -> "SubstringIndex":
+        """
+        Build the index of the rows of this index followed by appended rows.
+
+        Args:
+            series: Column of the appended rows
+            offset: Row position of the first appended row
+
+        Returns:
+            New index over the existing and appended rows (this index is unchanged)
+        """
+        index = SubstringIndex.__new__(SubstringIndex)
+        index._set_index(self._index.extend(series, offset), self._cache_size)
+        return index
+
+    def matching_values(self, needle: str) -> List[Hashable]:
+        """
+        Get the distinct values containing a needle, ignoring case.
+
+        Args:
+            needle: Substring to search for
+
+        Returns:
+            Matching distinct values
+        """
+        folded = needle.casefold()
+        return [value for value_folded, value in self._folded if folded in value_folded]
+
+    def match(self, needle: str) -> np.ndarray:
+        """
+        Get the sorted row positions whose value contains a needle, ignoring case.
+
+        The needle is resolved against the distinct values only; the row positions of
+        every matching value are merged once and cached per needle.
+
+        Args:
+            needle: Substring to search for
+
+        Returns:
+            Read-only ascending array of row positions
+        """
+        folded = needle.casefold()
+        return self._match_cache.get_or_compute(
+            folded, lambda: self._compute_match(folded), sizeof=positions_size
+        )
+
+    def count(self, needle: str) -> int:
+        """Number of rows whose value contains a needle, without materialising them."""
+        return sum(self._index.count(value) for value in self.matching_values(needle))
+
+    def _compute_match(self, folded: str) -> np.ndarray:
+        """Merge the row positions of every value containing an already casefolded needle."""
+        parts = [self._index.lookup(value) for value in self.matching_values(folded)]
+        if not parts:
+            return EMPTY_POSITIONS
+        if len(parts) == 1:
+            return parts[0]
+        positions = np.sort(np.concatenate(parts))
+        positions.flags.writeable = False
+        return positions
+
+
+def match_cache(max_entries: int) -> ResultCache:
+    """
+    Cache of match sets (row-position arrays), bounded by entries and bytes.
+
+    Args:
+        max_entries: Maximum number of cached match sets
+
+    Returns:
+        LRU cache without expiry, holding at most ``MATCH_CACHE_MAX_BYTES``
+    """
+    return ResultCache(
+        max_entries=max_entries, max_bytes=settings.MATCH_CACHE_MAX_BYTES, ttl_seconds=0
+    )
+
+
+def positions_size(positions: Optional[np.ndarray]) -> int:
+    """Bytes of a cached match set (None stands for every row and holds nothing)."""
+    return positions.nbytes if positions is not None else 0
+
+
+def intersect_positions(left: Optional[np.ndarray], right: np.ndarray) -> np.ndarray:
+    """
+    Intersect two ascending row-position arrays.
+
+    Args:
+        left: Current candidate positions, or None for "all rows"
+        right: Positions matching the next predicate
+
+    Returns:
+        Ascending positions present in both arrays
+    """
+    if left is None:
+        return right
+    return np.intersect1d(left, right, assume_unique=True)
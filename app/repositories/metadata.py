@@ -0,0 +1,95 @@
+"""Dataset metadata (counts, distinct values, date range, totals) computed at load time."""
+
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from app.models.domain.products import DatasetMetadata
+
+BRAND_COLUMN = "desc_ga_marca_producto"
+CATEGORY_COLUMN = "desc_categoria_prod_principal"
+DATE_COLUMN = "id_tie_fecha_valor"
+
+# Placeholder brand excluded from the published brand list
+NO_BRAND = "No Aplica"
+
+
+def distinct_values(df: pd.DataFrame, column: str) -> Tuple[str, ...]:
+    """Sorted distinct non-missing values of a column (empty if the column is absent)."""
+    if column not in df.columns:
+        return ()
+    return tuple(sorted(str(value) for value in df[column].dropna().unique()))
+
+
+def build_metadata(
+    df: pd.DataFrame, dataset_version: str, measure_columns: List[str]
+) -> DatasetMetadata:
+    """
+    Summarise a dataset.
+
+    Args:
+        df: Typed dataset
+        dataset_version: Version of the dataset
+        measure_columns: Numeric columns to total
+
+    Returns:
+        Immutable metadata for the dataset version
+    """
+    dates = distinct_values(df, DATE_COLUMN)
+    min_date: Optional[str] = dates[0] if dates else None
+    max_date: Optional[str] = dates[-1] if dates else None
+
+    column_totals = {
+        column: float(df[column].sum(skipna=True))
+        for column in measure_columns
+        if column in df.columns
+    }
+
+    return DatasetMetadata(
+        dataset_version=dataset_version,
+        total_records=len(df),
+        brands=tuple(b for b in distinct_values(df, BRAND_COLUMN) if b != NO_BRAND),
+        categories=distinct_values(df, CATEGORY_COLUMN),
+        min_date=min_date,
+        max_date=max_date,
+        column_totals=column_totals,
+    )
+
+
+def extend_metadata(
+    metadata: DatasetMetadata,
+    delta: pd.DataFrame,
+    dataset_version: str,
+    measure_columns: List[str],
+) -> DatasetMetadata:
+    """
+    Summarise a dataset extended with appended rows, scanning only those rows.
+
+    Args:
+        metadata: Metadata of the existing rows
+        delta: Appended rows
+        dataset_version: Version of the extended dataset
+        measure_columns: Numeric columns to total
+
+    Returns:
+        Immutable metadata for the extended dataset version
+    """
+    appended = build_metadata(delta, dataset_version, measure_columns)
+    dates = [
+        date
+        for date in (metadata.min_date, metadata.max_date, appended.min_date, appended.max_date)
+        if date is not None
+    ]
+    column_totals = dict(metadata.column_totals)
+    for column, total in appended.column_totals.items():
+        column_totals[column] = column_totals.get(column, 0.0) + total
+
+    return DatasetMetadata(
+        dataset_version=dataset_version,
+        total_records=metadata.total_records + appended.total_records,
+        brands=tuple(sorted(set(metadata.brands).union(appended.brands))),
+        categories=tuple(sorted(set(metadata.categories).union(appended.categories))),
+        min_date=min(dates) if dates else None,
+        max_date=max(dates) if dates else None,
+        column_totals=column_totals,
+    )
@@ -1,12 +1,325 @@
 """Repository for product data access from CSV."""
 
+import hashlib
+import io
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_integer_dtype, is_numeric_dtype, union_categoricals
 
 from app.core.config import settings
-from app.models.domain.products import ProductData, ProductDataFilter
+from app.models.domain.products import (
+    AggregateGroup,
+    DatasetMetadata,
+    ProductData,
+    ProductDataFilter,
+    ProductPage,
+    TopProduct,
+)
+from app.repositories.aggregation import aggregate_rows, top_products
+from app.repositories.indexes import ColumnIndex, DatePartitions, SubstringIndex
+from app.repositories.metadata import build_metadata, extend_metadata
+from app.repositories.query_planner import QueryPlanner
+from app.repositories.rollups import Rollup, find_rollup, parse_rollup_dimensions
+from app.repositories.shared_store import map_store, materialize_lock, write_store
+from app.repositories.snapshot import (
+    HASH_CHUNK_SIZE,
+    fingerprint_version,
+    read_snapshot,
+    source_fingerprint,
+    write_snapshot,
+)
+from app.repositories.sorted_views import SORT_COLUMNS, SortedViews
+
+logger = logging.getLogger(__name__)
+
+# Final in-memory dtype of every known CSV column. Measures and numeric ids use the
+# nullable extension dtypes so missing values stay as <NA> without an object fallback;
+# low-cardinality text columns (dates, brands, categories, SKUs, names) are dictionary
+# encoded as ``category``.
+INTEGER_COLUMNS = [
+    "id_cli_cliente",
+    "id_ga_vista",
+    "id_ga_tipo_dispositivo",
+    "id_ga_fuente_medio",
+    "fc_agregado_carrito_cant",
+    "fc_retirado_carrito_cant",
+    "fc_detalle_producto_cant",
+    "fc_producto_cant",
+    "fc_visualizaciones_pag_cant",
+    "flag_pipol",
+    "id_ga_producto",
+]
+FLOAT_COLUMNS = ["fc_ingreso_producto_monto"]
+CATEGORY_COLUMNS = [
+    "id_tie_fecha_valor",
+    "desc_ga_sku_producto",
+    "desc_ga_categoria_producto",
+    "desc_ga_nombre_producto",
+    "desc_ga_nombre_producto_1",
+    "desc_ga_sku_producto_1",
+    "desc_ga_marca_producto",
+    "desc_ga_cod_producto",
+    "desc_categoria_producto",
+    "desc_categoria_prod_principal",
+]
+STRING_COLUMNS = ["SASASA"]
+
+# Numeric measures (totalled in the dataset metadata)
+MEASURE_COLUMNS = [col for col in INTEGER_COLUMNS + FLOAT_COLUMNS if col.startswith("fc_")]
+
+COLUMN_DTYPES: Dict[str, str] = {
+    **dict.fromkeys(INTEGER_COLUMNS, "Int64"),
+    **dict.fromkeys(FLOAT_COLUMNS, "Float64"),
+    **dict.fromkeys(CATEGORY_COLUMNS, "category"),
+    **dict.fromkeys(STRING_COLUMNS, "string"),
+}
+
+# dtypes handed to ``pd.read_csv``: numeric columns go through the C parser's native
+# float64 path (much faster than its nullable-integer parser) and are cast to their
+# nullable dtype afterwards by ``apply_column_dtypes``.
+PARSE_DTYPES: Dict[str, str] = {
+    col: "float64" if dtype in ("Int64", "Float64") else dtype
+    for col, dtype in COLUMN_DTYPES.items()
+}
+
+# dtypes used to re-read a CSV whose numeric columns hold malformed cells: numeric
+# columns are read as text and coerced (malformed cells become missing values)
+FALLBACK_PARSE_DTYPES: Dict[str, str] = {
+    col: "object" if dtype in ("Int64", "Float64") else dtype
+    for col, dtype in COLUMN_DTYPES.items()
+}
+
+NA_VALUES = ["", "nan", "NaN", "null"]
+
+# Bytes before the end of the loaded CSV compared to detect that it was only appended to
+TAIL_SIGNATURE_BYTES = 4096
+
+# Columns exposed for every product row, in ProductData field order
+PRODUCT_COLUMNS: List[str] = list(ProductData.model_fields)
+
+# Exact-match filters served by a secondary index (filter field -> indexed column)
+INDEXED_FILTERS: Dict[str, str] = {
+    "date": "id_tie_fecha_valor",
+    "client_id": "id_cli_cliente",
+    "sku": "desc_ga_sku_producto",
+}
+
+# Exact-match filter whose index partitions the rows by value, also serving the
+# ``date_from``/``date_to`` range filter
+PARTITION_FILTER = "date"
+
+# Case-insensitive "contains" filters served by a substring index
+SUBSTRING_FILTERS: Dict[str, str] = {
+    "brand": "desc_ga_marca_producto",
+    "category": "desc_categoria_prod_principal",
+}
+
+
+class StaleDatasetVersionError(ValueError):
+    """Raised when a request refers to a dataset version that is no longer loaded."""
+
+
+def apply_column_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce the known columns of a DataFrame to their final dtypes.
+
+    Columns already stored with the expected dtype are left untouched. Malformed
+    numeric values (text, or fractional values in integer columns) become missing.
+
+    Args:
+        df: DataFrame with (a subset of) the CSV columns
+
+    Returns:
+        DataFrame whose known columns use the dtypes from ``COLUMN_DTYPES``
+    """
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+
+        values = df[col]
+        if dtype in ("Int64", "Float64"):
+            if not is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors="coerce")
+            if dtype == "Int64" and not is_integer_dtype(values):
+                # Fractional or infinite values cannot be stored as integers
+                floats = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                finite = np.isfinite(floats)
+                invalid = np.isinf(floats)
+                invalid[finite] = floats[finite] % 1 != 0
+                if invalid.any():
+                    logger.warning(
+                        "Column %s: %d non-integer values read as missing", col, invalid.sum()
+                    )
+                    floats[invalid] = np.nan
+                values = pd.Series(floats, index=df.index)
+            df[col] = values.astype(dtype)
+        else:
+            # Text columns: stringify non-missing values (e.g. dates parsed as numbers)
+            df[col] = values.where(values.isna(), values.astype(str)).astype(dtype)
+    return df
+
+
+def append_frame(df: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append rows to a typed DataFrame, keeping its columns and dtypes.
+
+    Categories first seen in the appended rows are merged into each categorical column
+    in sorted order, as the CSV reader orders them, so grouping by category codes still
+    yields groups sorted by value. Columns missing from the appended rows are filled
+    with missing values and extra columns are ignored.
+
+    Args:
+        df: Typed dataset
+        delta: Typed rows to append
+
+    Returns:
+        New DataFrame with the rows of ``df`` followed by those of ``delta``
+    """
+    data = {}
+    for column in df.columns:
+        values = df[column]
+        if column in delta.columns:
+            appended = delta[column].reset_index(drop=True)
+        else:
+            appended = pd.Series(index=range(len(delta)), dtype=values.dtype)
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            combined = union_categoricals(
+                [values.array, pd.Categorical(appended)], ignore_order=True
+            )
+            if not combined.categories.is_monotonic_increasing:
+                combined = combined.reorder_categories(combined.categories.sort_values())
+            data[column] = combined
+        else:
+            data[column] = pd.concat(
+                [values, appended.astype(values.dtype)], ignore_index=True
+            ).array
+    return pd.DataFrame(data)
+
+
+def _prefix_digest(f: Any, size: int) -> Any:
+    """
+    Hash the first bytes of an open file, leaving it positioned right after them.
+
+    Args:
+        f: File opened in binary mode
+        size: Number of bytes to hash
+
+    Returns:
+        SHA-256 digest object, or None if the file is shorter than ``size``
+    """
+    digest = hashlib.sha256()
+    f.seek(0)
+    remaining = size
+    while remaining:
+        chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+        if not chunk:
+            return None
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+def _update_digest(digest: Any, data: bytes) -> Optional[str]:
+    """Hex SHA-256 of the hashed bytes followed by ``data`` (None if not hashed)."""
+    if digest is None:
+        return None
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame slice to plain Python records.
+
+    Nullable and categorical values are unboxed to native ``int``/``float``/``str``
+    and every missing value becomes ``None`` for Pydantic compatibility.
+
+    Args:
+        df: DataFrame slice to convert
+
+    Returns:
+        List of record dictionaries
+    """
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def to_columns(
+    df: pd.DataFrame, positions: np.ndarray, columns: Optional[List[str]] = None
+) -> Dict[str, List[Any]]:
+    """
+    Extract the rows at the given positions as plain Python column lists.
+
+    This is the allocation-light counterpart of ``to_records``: each column is taken
+    and unboxed once, and no per-row dictionaries or models are built. Requested
+    columns missing from the DataFrame are filled with ``None``.
+
+    Args:
+        df: Dataset
+        positions: Row positions to extract, in output order
+        columns: Columns to extract (defaults to every ProductData field)
+
+    Returns:
+        Mapping of column name to its values (native types, missing values as None)
+    """
+    # A contiguous run of rows (e.g. one date partition of a date-ordered dataset) is
+    # sliced instead of gathered
+    contiguous = len(positions) > 0 and bool(np.all(np.diff(positions) == 1))
+    rows = slice(int(positions[0]), int(positions[-1]) + 1) if contiguous else None
+
+    result = {}
+    for column in columns or PRODUCT_COLUMNS:
+        if column in df.columns:
+            array = df[column].array
+            values = array[rows] if contiguous else array.take(positions)
+            result[column] = values.to_numpy(dtype=object, na_value=None).tolist()
+        else:
+            result[column] = [None] * len(positions)
+    return result
+
+
+def make_planner(
+    total_rows: int,
+    exact_indexes: Dict[str, Optional[ColumnIndex]],
+    substring_indexes: Dict[str, Optional[SubstringIndex]],
+) -> QueryPlanner:
+    """Build the query planner, serving range filters from the date partitions."""
+    return QueryPlanner(
+        total_rows=total_rows,
+        exact_indexes=exact_indexes,
+        substring_indexes=substring_indexes,
+        range_indexes={PARTITION_FILTER: exact_indexes.get(PARTITION_FILTER)},
+    )
+
+
+@dataclass(frozen=True)
+class LoadedDataset:
+    """
+    One loaded version of the dataset with everything derived from it.
+
+    Instances are immutable and replaced as a whole on reload, so a request that
+    picked up a dataset keeps a consistent frame, planner and version until it ends.
+    """
+
+    frame: pd.DataFrame
+    planner: QueryPlanner
+    version: str
+    metadata: DatasetMetadata
+    fingerprint: Optional[Dict[str, str]]
+    # Bytes of the CSV loaded so far and the bytes just before that offset
+    source_offset: Optional[int] = None
+    source_tail: bytes = b""
+    # SHA-256 of the loaded bytes of the CSV (only with DATASET_SNAPSHOT_VERIFY_HASH)
+    source_hash: Optional[str] = None
+    rollups: Tuple[Rollup, ...] = ()
+    sorted_views: Optional[SortedViews] = None
 
 
 class ProductRepository:
@@ -15,55 +328,387 @@ class ProductRepository:
     def __init__(self):
         """Initialize the repository and load CSV data."""
         self.csv_path = Path(settings.CSV_FILE_PATH)
-        self._df: Optional[pd.DataFrame] = None
+        self.snapshot_enabled = settings.DATASET_SNAPSHOT_ENABLED
+        self.snapshot_path = Path(
+            settings.DATASET_SNAPSHOT_PATH or f"{settings.CSV_FILE_PATH}.snapshot.parquet"
+        )
+        self.storage_mode = settings.DATASET_STORAGE_MODE
+        self.shared_dir = Path(settings.DATASET_SHARED_DIR or f"{settings.CSV_FILE_PATH}.shared")
+        self.append_enabled = settings.DATASET_APPEND_ENABLED
+        self.rollup_dimensions = parse_rollup_dimensions(settings.DATASET_ROLLUPS)
+        self._dataset: Optional[LoadedDataset] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the dataset and its indexes are loaded."""
+        return self._dataset is not None
+
+    def warm_up(self) -> DatasetMetadata:
+        """
+        Load the dataset and build its indexes ahead of the first request.
+
+        Returns:
+            Metadata of the loaded dataset
+
+        Raises:
+            IOError: If the dataset cannot be loaded
+        """
+        return self._get_dataset().metadata
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the current CSV into a new dataset version and swap it in atomically.
+
+        The new frame, indexes and metadata are built while the current version keeps
+        serving requests; requests already running finish on the version they started
+        with. Reloads are serialised with first loads.
+
+        When the CSV only grew (rows appended after the previously loaded bytes), only
+        the new rows are parsed and the indexes and metadata are extended with them.
+
+        Args:
+            force: Reload even if the CSV fingerprint did not change
+
+        Returns:
+            True if a new version was swapped in
+
+        Raises:
+            IOError: If the new dataset cannot be loaded (the current one is kept)
+        """
+        with self._load_lock:
+            current = self._dataset
+            fingerprint = self._fingerprint()
+            if (
+                not force
+                and current is not None
+                and fingerprint is not None
+                and fingerprint == current.fingerprint
+            ):
+                return False
+
+            dataset = None
+            if not force and current is not None:
+                dataset = self._append_from_source(current)
+            if dataset is None:
+                dataset = self._build_dataset(fingerprint)
+            self._dataset = dataset
+        logger.info("Dataset reloaded, version %s", dataset.version)
+        return True
+
+    def append_delta(self, delta_path: Path) -> int:
+        """
+        Append the rows of a separate delta CSV to the loaded dataset.
+
+        Only the delta is parsed; the indexes and metadata are extended with its rows.
+        The rows live in memory only. The next reload after the main CSV changes is a
+        full reload (not an incremental append), so once the delta rows also reach the
+        main CSV they are loaded from there exactly once.
+
+        Args:
+            delta_path: CSV with the same header as the main CSV
+
+        Returns:
+            Number of rows appended
+
+        Raises:
+            IOError: If the delta cannot be read (the current version is kept)
+        """
+        with self._load_lock:
+            if self._dataset is None:
+                self._dataset = self._build_dataset(self._fingerprint())
+            current = self._dataset
+
+            delta = self._parse_csv(delta_path)
+            delta_fingerprint = source_fingerprint(delta_path, with_hash=True) or {}
+            version = fingerprint_version({"base": current.version, **delta_fingerprint})
+            # The loaded rows no longer match a prefix of the CSV: forget the offset so
+            # the next change of the CSV is not appended on top of the delta rows
+            self._dataset = self._extend_dataset(
+                current,
+                delta,
+                version=version,
+                fingerprint=current.fingerprint,
+                source_offset=None,
+                source_tail=b"",
+            )
+        logger.info("Appended %d rows from %s, version %s", len(delta), delta_path, version)
+        return len(delta)
+
+    def changed_source_fingerprint(self) -> Optional[Dict[str, str]]:
+        """
+        Check whether the CSV changed since the loaded version was read.
+
+        Only the file metadata is read (no hashing), so this is cheap enough to poll.
+
+        Returns:
+            The new size/mtime fingerprint if the CSV changed, else None
+        """
+        current = self._dataset
+        if current is None or current.fingerprint is None:
+            return None
+        fingerprint = source_fingerprint(self.csv_path)
+        if fingerprint is None:
+            return None
+        if all(fingerprint[key] == current.fingerprint.get(key) for key in fingerprint):
+            return None
+        return fingerprint
+
+    def _get_dataset(self) -> LoadedDataset:
+        """Get the current dataset version, loading it on first use."""
+        dataset = self._dataset
+        if dataset is not None:
+            return dataset
+
+        # Single flight: concurrent first calls wait for one load instead of racing
+        with self._load_lock:
+            if self._dataset is None:
+                self._dataset = self._build_dataset(self._fingerprint())
+            return self._dataset
+
+    def _build_dataset(self, fingerprint: Optional[Dict[str, str]]) -> LoadedDataset:
+        """Load the typed frame and build its indexes and metadata."""
+        if self.storage_mode == "mmap":
+            df = self._load_shared(fingerprint)
+        else:
+            df = self._read_source(fingerprint)
+        source_offset = int(fingerprint["size"]) if fingerprint else None
+
+        index_types = {PARTITION_FILTER: DatePartitions}
+        planner = make_planner(
+            total_rows=len(df),
+            exact_indexes={
+                name: index_types.get(name, ColumnIndex)(df[column])
+                if column in df.columns
+                else None
+                for name, column in INDEXED_FILTERS.items()
+            },
+            substring_indexes={
+                name: SubstringIndex(df[column]) if column in df.columns else None
+                for name, column in SUBSTRING_FILTERS.items()
+            },
+        )
+        # Identifies the loaded data (stable across workers reading the same CSV)
+        version = fingerprint_version(fingerprint) if fingerprint else uuid.uuid4().hex[:12]
+        return LoadedDataset(
+            frame=df,
+            planner=planner,
+            version=version,
+            metadata=build_metadata(df, version, MEASURE_COLUMNS),
+            fingerprint=fingerprint,
+            source_offset=source_offset,
+            source_tail=self._read_tail(source_offset) if source_offset else b"",
+            source_hash=fingerprint.get("sha256") if fingerprint else None,
+            rollups=self._build_rollups(df),
+            sorted_views=SortedViews(df),
+        )
+
+    def _build_rollups(self, df: pd.DataFrame) -> Tuple[Rollup, ...]:
+        """Pre-aggregate the configured dimension combinations present in the dataset."""
+        rollups = (
+            Rollup.build(df, dimensions, MEASURE_COLUMNS) for dimensions in self.rollup_dimensions
+        )
+        return tuple(rollup for rollup in rollups if rollup is not None)
+
+    def _extend_dataset(
+        self,
+        current: LoadedDataset,
+        delta: pd.DataFrame,
+        version: str,
+        fingerprint: Optional[Dict[str, str]],
+        source_offset: Optional[int],
+        source_tail: bytes,
+        source_hash: Optional[str] = None,
+    ) -> LoadedDataset:
+        """Build a dataset version from the current one and appended typed rows."""
+        offset = len(current.frame)
+        df = append_frame(current.frame, delta)
+        # Appended rows with the dataset's column dtypes (categories already unioned)
+        appended = df.iloc[offset:].reset_index(drop=True)
+
+        planner = make_planner(
+            total_rows=len(df),
+            exact_indexes={
+                name: index.extend(appended[INDEXED_FILTERS[name]], offset)
+                if index is not None
+                else None
+                for name, index in current.planner.exact_indexes.items()
+            },
+            substring_indexes={
+                name: index.extend(appended[SUBSTRING_FILTERS[name]], offset)
+                if index is not None
+                else None
+                for name, index in current.planner.substring_indexes.items()
+            },
+        )
+        return LoadedDataset(
+            frame=df,
+            planner=planner,
+            version=version,
+            metadata=extend_metadata(current.metadata, appended, version, MEASURE_COLUMNS),
+            fingerprint=fingerprint,
+            source_offset=source_offset,
+            source_tail=source_tail,
+            source_hash=source_hash,
+            rollups=tuple(rollup.extend(appended) for rollup in current.rollups),
+            sorted_views=SortedViews(df),
+        )
+
+    def _append_from_source(self, current: LoadedDataset) -> Optional[LoadedDataset]:
+        """
+        Extend the current version with the rows appended to the CSV since it was read.
+
+        The bytes just before the previously loaded offset must be unchanged. When the
+        loaded version was hashed (``DATASET_SNAPSHOT_VERIFY_HASH``), every previously
+        loaded byte is hashed and compared as well; otherwise an edit further back in the
+        file that keeps its length goes unnoticed.
+
+        Returns:
+            The extended dataset, or None if the CSV was not simply appended to (it
+            shrank, its previously loaded bytes changed, or append mode is unavailable)
+        """
+        if (
+            not self.append_enabled
+            or self.storage_mode == "mmap"
+            or not current.source_offset
+            or not current.source_tail.endswith(b"\n")
+        ):
+            return None
+
+        tail = current.source_tail
+        digest = None
+        try:
+            with open(self.csv_path, "rb") as f:
+                header = f.readline()
+                f.seek(current.source_offset - len(tail))
+                if f.read(len(tail)) != tail:
+                    return None
+                if current.source_hash is not None:
+                    digest = _prefix_digest(f, current.source_offset)
+                    if digest is None or digest.hexdigest() != current.source_hash:
+                        return None
+                data = f.read()
+        except OSError:
+            return None
+
+        # Only complete lines are ingested; a partially written last row waits
+        data = data[: data.rfind(b"\n") + 1]
+        if not data:
+            return None
+
+        delta = self._parse_csv(io.BytesIO(header + data))
+        source_offset = current.source_offset + len(data)
+        fingerprint = self._fingerprint()
+        if fingerprint is None or int(fingerprint["size"]) != source_offset:
+            fingerprint = {**(fingerprint or {}), "size": str(source_offset)}
+            fingerprint.pop("sha256", None)
+        version = fingerprint_version(fingerprint)
+        logger.info("Appending %d rows from %s", len(delta), self.csv_path)
+        return self._extend_dataset(
+            current,
+            delta,
+            version=version,
+            fingerprint=fingerprint,
+            source_offset=source_offset,
+            source_tail=(tail + data)[-TAIL_SIGNATURE_BYTES:],
+            source_hash=_update_digest(digest, data),
+        )
+
+    def _read_tail(self, offset: int) -> bytes:
+        """Read the bytes of the CSV just before an offset (empty if unreadable)."""
+        try:
+            with open(self.csv_path, "rb") as f:
+                f.seek(max(0, offset - TAIL_SIGNATURE_BYTES))
+                return f.read(min(offset, TAIL_SIGNATURE_BYTES))
+        except OSError:
+            return b""
 
     def _load_data(self) -> pd.DataFrame:
-        """Load CSV data into pandas DataFrame."""
-        if self._df is None:
+        """Load CSV data into a typed pandas DataFrame and build its indexes."""
+        return self._get_dataset().frame
+
+    @property
+    def dataset_version(self) -> str:
+        """Version of the loaded dataset; changes whenever the underlying CSV changes."""
+        return self._get_dataset().version
+
+    def _fingerprint(self) -> Optional[Dict[str, str]]:
+        """Fingerprint of the CSV file, or None if it cannot be read."""
+        return source_fingerprint(self.csv_path, with_hash=settings.DATASET_SNAPSHOT_VERIFY_HASH)
+
+    def _read_source(self, fingerprint: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Read the typed dataset from the snapshot when enabled, else parse the CSV."""
+        if self.snapshot_enabled:
+            if fingerprint is not None:
+                df = read_snapshot(self.snapshot_path, fingerprint)
+                if df is not None:
+                    logger.info("Loaded dataset from snapshot %s", self.snapshot_path)
+                    return df
+
+        df = self._parse_csv(self.csv_path)
+
+        if self.snapshot_enabled and fingerprint is not None:
+            write_snapshot(df, self.snapshot_path, fingerprint)
+        return df
+
+    def _parse_csv(self, source: Any) -> pd.DataFrame:
+        """
+        Parse CSV data into the typed dataset columns.
+
+        Args:
+            source: Path or binary buffer with the CSV (header included)
+
+        Returns:
+            Typed DataFrame
+
+        Raises:
+            IOError: If the CSV cannot be read or parsed
+        """
+        try:
             try:
-                # Define numeric columns upfront
-                numeric_columns = [
-                    "id_cli_cliente", "id_ga_vista", "id_ga_tipo_dispositivo", 
-                    "id_ga_fuente_medio", "fc_agregado_carrito_cant", 
-                    "fc_ingreso_producto_monto", "fc_retirado_carrito_cant", 
-                    "fc_detalle_producto_cant", "fc_producto_cant", 
-                    "fc_visualizaciones_pag_cant", "flag_pipol", "id_ga_producto"
-                ]
-
-                # Read CSV once with proper NaN handling
-                self._df = pd.read_csv(
-                    self.csv_path, 
-                    na_values=['', 'nan', 'NaN', 'null'],
+                # Parse every column straight into its final dtype (no str round-trip)
+                df = pd.read_csv(
+                    source,
+                    na_values=NA_VALUES,
                     keep_default_na=True,
-                    dtype=str  # Read all as strings first to avoid type issues
+                    dtype=PARSE_DTYPES,
                 )
-
-                # Convert numeric columns efficiently (vectorized)
-                for col in numeric_columns:
-                    if col in self._df.columns:
-                        # Only convert non-empty, non-'nan' strings to numeric
-                        mask = (self._df[col].notna()) & (self._df[col] != 'nan') & (self._df[col] != '')
-                        if mask.any():
-                            self._df.loc[mask, col] = pd.to_numeric(self._df.loc[mask, col], errors='coerce')
-                            # Replace any NaN results from failed conversions back to None
-                            self._df[col] = self._df[col].where(pd.notnull(self._df[col]), None)
-                        else:
-                            # If all values are None/nan/empty, set the whole column to None
-                            self._df[col] = None
-
-                # Convert id_tie_fecha_valor to string if it exists
-                if "id_tie_fecha_valor" in self._df.columns:
-                    self._df["id_tie_fecha_valor"] = self._df["id_tie_fecha_valor"].astype(str)
-                    # Replace 'nan' strings with None
-                    self._df["id_tie_fecha_valor"] = self._df["id_tie_fecha_valor"].replace('nan', None)
-
-                # Replace NaN values with None for Pydantic compatibility
-                # Use where() method instead of fillna for better compatibility
-                self._df = self._df.where(pd.notnull(self._df), None)
-
-            except Exception as e:
-                raise IOError(f"Error loading CSV file: {str(e)}") from e
-        return self._df
+            except ValueError:
+                # A malformed numeric cell: read those columns as text and coerce them
+                logger.warning("Malformed numeric values in CSV, coercing them to missing")
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                df = pd.read_csv(
+                    source,
+                    na_values=NA_VALUES,
+                    keep_default_na=True,
+                    dtype=FALLBACK_PARSE_DTYPES,
+                )
+            return apply_column_dtypes(df)
+        except Exception as e:
+            raise IOError(f"Error loading CSV file: {str(e)}") from e
+
+    def _load_shared(self, fingerprint: Optional[Dict[str, str]]) -> pd.DataFrame:
+        """Map the dataset from the shared store, materialising it first if needed."""
+        if fingerprint is None:
+            # Nothing to key the store on; surfaces the usual loading error
+            return self._read_source()
+
+        df = map_store(self.shared_dir, fingerprint)
+        if df is not None:
+            return df
+
+        with materialize_lock(self.shared_dir):
+            # Another worker may have materialised the store while we waited
+            df = map_store(self.shared_dir, fingerprint)
+            if df is None:
+                logger.info("Materialising shared dataset store in %s", self.shared_dir)
+                write_store(self._read_source(fingerprint), self.shared_dir, fingerprint)
+                df = map_store(self.shared_dir, fingerprint)
+
+        if df is None:
+            raise IOError(f"Error loading CSV file: shared store {self.shared_dir} unreadable")
+        return df
 
     def get_all(self, limit: int = 100, offset: int = 0) -> List[ProductData]:
         """
@@ -81,11 +726,8 @@ class ProductRepository:
         # Apply pagination
         paginated_df = df.iloc[offset : offset + limit]
 
-        # Convert to list of dictionaries
-        records = paginated_df.to_dict("records")
-
-        # Convert to ProductData objects (no cleaning needed - handled in _load_data)
-        return [ProductData(**record) for record in records]
+        # Convert to ProductData objects (missing values become None)
+        return [ProductData(**record) for record in to_records(paginated_df)]
 
     def get_by_filter(self, filter_params: ProductDataFilter) -> List[ProductData]:
         """
@@ -97,57 +739,229 @@ class ProductRepository:
         Returns:
             List of filtered ProductData objects
         """
-        df = self._load_data()
+        dataset = self._get_dataset()
+        paginated_df = dataset.frame.iloc[self._page_positions(dataset, filter_params)]
 
-        # Apply filters
-        if filter_params.date:
-            df = df[df["id_tie_fecha_valor"] == filter_params.date]
+        # Convert to ProductData objects (missing values become None)
+        return [ProductData(**record) for record in to_records(paginated_df)]
+
+    def get_columns_by_filter(
+        self, filter_params: ProductDataFilter, columns: Optional[List[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Get the requested page of filtered rows as column lists.
 
-        if filter_params.client_id is not None:
-            df = df[df["id_cli_cliente"] == filter_params.client_id]
+        Fast path for response building: the data was typed and validated when it was
+        loaded, so no per-row ProductData validation is performed, and only the
+        projected columns are sliced.
 
-        if filter_params.brand:
-            df = df[
-                df["desc_ga_marca_producto"].str.contains(filter_params.brand, case=False, na=False)
-            ]
+        Args:
+            filter_params: Filter parameters
+            columns: Columns to return (defaults to every ProductData field)
 
-        if filter_params.sku:
-            df = df[df["desc_ga_sku_producto"] == filter_params.sku]
+        Returns:
+            Mapping of column name to the values of the page rows
+        """
+        dataset = self._get_dataset()
+        return to_columns(dataset.frame, self._page_positions(dataset, filter_params), columns)
 
-        if filter_params.category:
-            df = df[
-                df["desc_categoria_prod_principal"].str.contains(
-                    filter_params.category, case=False, na=False
-                )
-            ]
+    @staticmethod
+    def _page_positions(dataset: LoadedDataset, filter_params: ProductDataFilter) -> np.ndarray:
+        """Row positions of the requested page of a filter."""
+        # Evaluate the filters through the indexes (match sets are cached per filter)
+        matches = dataset.planner.match(filter_params)
 
-        # Apply pagination
+        # Apply pagination on the row positions; only the page is materialised
         offset = filter_params.offset or 0
         limit = filter_params.limit or 100
-        paginated_df = df.iloc[offset : offset + limit]
+        if filter_params.order_by and dataset.sorted_views is not None:
+            # Sorted pages come from the permutation of the sort column (no sort here)
+            view = dataset.sorted_views.get(
+                SORT_COLUMNS[filter_params.order_by], filter_params.descending
+            )
+            if view is not None:
+                return view.page(matches, offset, limit)
+        if matches is None:
+            total = len(dataset.frame)
+            return np.arange(min(offset, total), min(offset + limit, total))
+        return matches[offset : offset + limit]
+
+    def iter_export_chunks(
+        self,
+        filter_params: ProductDataFilter,
+        columns: Optional[List[str]] = None,
+        chunk_rows: int = 10000,
+    ) -> Tuple[str, Iterator[pd.DataFrame]]:
+        """
+        Get every row matching a filter as a lazy sequence of bounded DataFrame chunks.
+
+        The dataset version and match set are resolved immediately (so loading errors
+        surface before streaming starts); chunks are sliced from that version on
+        demand, so memory use depends on ``chunk_rows`` and not on the number of rows.
+        Pagination (limit/offset) is ignored; ``order_by`` is honoured.
+
+        Args:
+            filter_params: Filter parameters
+            columns: Columns to export, in order (defaults to every ProductData field);
+                columns missing from the dataset are exported as missing values
+            chunk_rows: Maximum rows per chunk
 
-        # Convert to list of dictionaries
-        records = paginated_df.to_dict("records")
+        Returns:
+            Tuple of (dataset version, iterator of chunks); at least one (possibly empty)
+            chunk is produced
+        """
+        dataset = self._get_dataset()
+        df = dataset.frame
+        matches = dataset.planner.match(filter_params)
+        if filter_params.order_by and dataset.sorted_views is not None:
+            view = dataset.sorted_views.get(
+                SORT_COLUMNS[filter_params.order_by], filter_params.descending
+            )
+            if view is not None and matches is None:
+                matches = view.order
+            elif view is not None:
+                matches = view.order[np.sort(view.rank[matches])]
+
+        columns = columns or PRODUCT_COLUMNS
+        present = [df.columns.get_loc(column) for column in columns if column in df.columns]
+        total = len(df) if matches is None else len(matches)
+
+        def chunks() -> Iterator[pd.DataFrame]:
+            for start in range(0, max(total, 1), chunk_rows):
+                rows = (
+                    slice(start, min(start + chunk_rows, total))
+                    if matches is None
+                    else matches[start : start + chunk_rows]
+                )
+                chunk = df.iloc[rows, present].reset_index(drop=True)
+                yield chunk if len(present) == len(columns) else chunk.reindex(columns=columns)
+
+        return dataset.version, chunks()
+
+    def get_page_after(
+        self,
+        filter_params: ProductDataFilter,
+        first: int,
+        after: Optional[int] = None,
+        after_version: Optional[str] = None,
+    ) -> ProductPage:
+        """
+        Get the rows matching a filter that follow a given row position.
+
+        Continuations reuse the cached match set of the filter and seek the position
+        with a binary search, so deep pages cost the same as the first one.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            first: Maximum number of rows to return
+            after: Row position of the last row already seen, or None to start
+            after_version: Dataset version ``after`` refers to; checked against the
+                version serving the page
+
+        Returns:
+            The page with the dataset row position of every item
+
+        Raises:
+            StaleDatasetVersionError: If ``after_version`` is not the loaded version
+        """
+        dataset = self._get_dataset()
+        if after_version is not None and after_version != dataset.version:
+            raise StaleDatasetVersionError(
+                f"Dataset version {after_version} is no longer loaded ({dataset.version} is)"
+            )
+        df = dataset.frame
+        matches = dataset.planner.match(filter_params)
+
+        if matches is None:
+            total = len(df)
+            start = 0 if after is None else min(after + 1, total)
+            page_positions = np.arange(start, min(start + first, total))
+        else:
+            total = len(matches)
+            start = 0 if after is None else int(np.searchsorted(matches, after, side="right"))
+            page_positions = matches[start : start + first]
+
+        return ProductPage(
+            items=[ProductData(**record) for record in to_records(df.iloc[page_positions])],
+            positions=page_positions.tolist(),
+            total_count=total,
+            has_next_page=start + first < total,
+            has_previous_page=start > 0,
+            dataset_version=dataset.version,
+        )
+
+    def aggregate(
+        self,
+        filter_params: ProductDataFilter,
+        group_by: Sequence[str],
+        metrics: Sequence[Tuple[str, str]],
+    ) -> List[AggregateGroup]:
+        """
+        Aggregate measures over every row matching a filter, grouped by dimensions.
 
-        # Convert to ProductData objects (no cleaning needed - handled in _load_data)
-        return [ProductData(**record) for record in records]
+        Queries grouping and filtering only on the dimensions of a rollup are answered
+        from the smallest such rollup; others aggregate the matching rows.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            group_by: Distinct group-by dimensions
+            metrics: (measure column, aggregate function) pairs
+
+        Returns:
+            One group per combination of group-by values, sorted by those values
+        """
+        dataset = self._get_dataset()
+        rollup = find_rollup(dataset.rollups, filter_params, group_by, metrics)
+        if rollup is not None:
+            return rollup.aggregate(filter_params, group_by, metrics)
+        return aggregate_rows(
+            dataset.frame, dataset.planner.match(filter_params), group_by, metrics
+        )
+
+    def top_products(
+        self, filter_params: ProductDataFilter, measure_column: str, n: int
+    ) -> List[TopProduct]:
+        """
+        Rank the SKUs of the rows matching a filter by the total of a measure.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            measure_column: Measure to total
+            n: Number of products to return
+
+        Returns:
+            Up to ``n`` products by descending total
+        """
+        dataset = self._get_dataset()
+        return top_products(dataset.frame, dataset.planner.match(filter_params), measure_column, n)
+
+    def explain_filter(self, filter_params: ProductDataFilter) -> List[str]:
+        """
+        Describe how a filter would be evaluated.
+
+        Args:
+            filter_params: Filter parameters
+
+        Returns:
+            Plan steps in evaluation order with their strategy and estimated rows
+        """
+        return self._get_dataset().planner.plan(filter_params).explain()
+
+    def get_metadata(self) -> DatasetMetadata:
+        """Get the metadata computed when the dataset was loaded."""
+        return self._get_dataset().metadata
 
     def count(self) -> int:
         """Get total count of records."""
-        df = self._load_data()
-        return len(df)
+        return self.get_metadata().total_records
 
-    def get_brands(self) -> List[str]:
-        """Get list of unique brands."""
-        df = self._load_data()
-        brands = df["desc_ga_marca_producto"].dropna().unique().tolist()
-        return sorted([str(b) for b in brands if b != "No Aplica"])
+    def get_brands(self) -> Sequence[str]:
+        """Get the sorted unique brands (precomputed, read-only)."""
+        return self.get_metadata().brands
 
-    def get_categories(self) -> List[str]:
-        """Get list of unique categories."""
-        df = self._load_data()
-        categories = df["desc_categoria_prod_principal"].dropna().unique().tolist()
-        return sorted([str(c) for c in categories])
+    def get_categories(self) -> Sequence[str]:
+        """Get the sorted unique categories (precomputed, read-only)."""
+        return self.get_metadata().categories
 
 
 # Singleton instance
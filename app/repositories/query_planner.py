@@ -0,0 +1,263 @@
+"""Selectivity-ordered evaluation of ProductDataFilter predicates over the indexes."""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.models.domain.products import ProductDataFilter
+from app.repositories.indexes import (
+    EMPTY_POSITIONS,
+    ColumnIndex,
+    DatePartitions,
+    SubstringIndex,
+    intersect_positions,
+    match_cache,
+    positions_size,
+)
+
+# Candidate sets holding at least this fraction of the rows are combined as bitmaps
+BITMAP_DENSITY = 1 / 16
+
+# Distinct filters whose match sets are kept per dataset (within MATCH_CACHE_MAX_BYTES)
+MATCH_CACHE_SIZE = 512
+
+
+def filter_key(filter_params: ProductDataFilter) -> Tuple:
+    """
+    Hashable key of the predicates of a filter, ignoring pagination.
+
+    Substring needles are casefolded since they match case-insensitively.
+    """
+    return (
+        filter_params.date or None,
+        filter_params.client_id,
+        filter_params.sku or None,
+        filter_params.brand.casefold() if filter_params.brand else None,
+        filter_params.category.casefold() if filter_params.category else None,
+        filter_params.date_from or None,
+        filter_params.date_to or None,
+    )
+
+
+@dataclass
+class Predicate:
+    """A single filter condition with its index and estimated cardinality."""
+
+    field: str
+    operator: str
+    value: Any
+    index: Optional[Union[ColumnIndex, SubstringIndex, DatePartitions]]
+    estimate: int
+    strategy: str = "seed"
+
+    def positions(self) -> np.ndarray:
+        """Ascending row positions matching the predicate."""
+        if self.index is None:
+            return EMPTY_POSITIONS
+        if self.operator == "contains":
+            return self.index.match(self.value)
+        if self.operator == "between":
+            return self.index.match_range(*self.value)
+        return self.index.lookup(self.value)
+
+    def describe(self) -> str:
+        """Human readable form of the predicate."""
+        return f"{self.field} {self.operator} {self.value!r}"
+
+
+@dataclass
+class QueryPlan:
+    """Ordered predicates for one filter, most selective first."""
+
+    total_rows: int
+    predicates: List[Predicate] = field(default_factory=list)
+
+    @property
+    def estimated_rows(self) -> int:
+        """Upper bound of the matching rows (the smallest predicate cardinality)."""
+        return self.predicates[0].estimate if self.predicates else self.total_rows
+
+    def explain(self) -> List[str]:
+        """
+        Describe the chosen evaluation order and combination strategies.
+
+        Returns:
+            One line per plan step
+        """
+        if not self.predicates:
+            return [f"full range: {self.total_rows} rows, no predicates"]
+
+        lines = [f"rows: {self.total_rows}, estimated matches <= {self.estimated_rows}"]
+        for step, predicate in enumerate(self.predicates, start=1):
+            selectivity = predicate.estimate / self.total_rows if self.total_rows else 0.0
+            lines.append(
+                f"{step}. {predicate.describe()} "
+                f"[{predicate.strategy}, est. {predicate.estimate} rows, {selectivity:.2%}]"
+            )
+        return lines
+
+
+class QueryPlanner:
+    """Builds and executes selectivity-ordered plans for ProductDataFilter."""
+
+    def __init__(
+        self,
+        total_rows: int,
+        exact_indexes: Dict[str, Optional[ColumnIndex]],
+        substring_indexes: Dict[str, Optional[SubstringIndex]],
+        range_indexes: Optional[Dict[str, Optional[DatePartitions]]] = None,
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            total_rows: Number of rows in the dataset
+            exact_indexes: Exact-match index per filter field (None if the column is absent)
+            substring_indexes: Substring index per filter field (None if the column is absent)
+            range_indexes: Partitioned index per range filter, served by the
+                ``<field>_from``/``<field>_to`` filter bounds (None if the column is absent)
+        """
+        self.total_rows = total_rows
+        self.exact_indexes = exact_indexes
+        self.substring_indexes = substring_indexes
+        self.range_indexes = range_indexes or {}
+        self._match_cache = match_cache(MATCH_CACHE_SIZE)
+
+    def match(self, filter_params: ProductDataFilter) -> Optional[np.ndarray]:
+        """
+        Get the matching row positions of a filter, reusing the cached match set.
+
+        Pages and cursor continuations of the same filter share one evaluation.
+
+        Args:
+            filter_params: Filter parameters (pagination is ignored)
+
+        Returns:
+            Read-only ascending row positions, or None when every row matches
+        """
+        key = filter_key(filter_params)
+        return self._match_cache.get_or_compute(
+            key, lambda: self._match_uncached(key), sizeof=positions_size
+        )
+
+    def _match_uncached(self, key: Tuple) -> Optional[np.ndarray]:
+        """Plan and execute the filter identified by a ``filter_key``."""
+        date, client_id, sku, brand, category, date_from, date_to = key
+        filter_params = ProductDataFilter(
+            date=date,
+            client_id=client_id,
+            sku=sku,
+            brand=brand,
+            category=category,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        positions = self.execute(self.plan(filter_params))
+        if positions is not None:
+            positions.flags.writeable = False
+        return positions
+
+    def plan(self, filter_params: ProductDataFilter) -> QueryPlan:
+        """
+        Build the plan for a filter.
+
+        Cardinalities come from the per-value row counts held by the indexes, so
+        planning never touches the row positions themselves.
+
+        Args:
+            filter_params: Filter parameters
+
+        Returns:
+            Plan with predicates ordered by ascending estimated cardinality
+        """
+        predicates = []
+        for name, index in self.exact_indexes.items():
+            value = getattr(filter_params, name)
+            if value is None or value == "":
+                continue
+            estimate = index.count(value) if index is not None else 0
+            predicates.append(Predicate(name, "==", value, index, estimate))
+
+        for name, index in self.substring_indexes.items():
+            value = getattr(filter_params, name)
+            if not value:
+                continue
+            estimate = index.count(value) if index is not None else 0
+            predicates.append(Predicate(name, "contains", value, index, estimate))
+
+        for name, index in self.range_indexes.items():
+            bounds = (
+                getattr(filter_params, f"{name}_from") or None,
+                getattr(filter_params, f"{name}_to") or None,
+            )
+            if bounds == (None, None):
+                continue
+            # Partition pruning: the estimate is exact and needs no row access
+            estimate = index.count_range(*bounds) if index is not None else 0
+            predicates.append(Predicate(name, "between", bounds, index, estimate))
+
+        predicates.sort(key=lambda predicate: predicate.estimate)
+
+        if predicates:
+            candidates = predicates[0].estimate
+            for predicate in predicates[1:]:
+                if predicate.operator == "between" and getattr(predicate.index, "ordered", False):
+                    # Contiguous row range: clip the candidates by position
+                    predicate.strategy = "row-range"
+                else:
+                    predicate.strategy = self._choose_strategy(candidates, predicate.estimate)
+                candidates = min(candidates, predicate.estimate)
+
+        return QueryPlan(total_rows=self.total_rows, predicates=predicates)
+
+    def execute(self, plan: QueryPlan) -> Optional[np.ndarray]:
+        """
+        Evaluate a plan.
+
+        Args:
+            plan: Plan returned by ``plan``
+
+        Returns:
+            Ascending matching row positions, or None when the plan has no predicates
+            (every row matches)
+        """
+        if not plan.predicates:
+            return None
+
+        candidates = plan.predicates[0].positions()
+        for predicate in plan.predicates[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = self._combine(candidates, predicate)
+        return candidates
+
+    def _choose_strategy(self, candidates: int, estimate: int) -> str:
+        """Pick how to intersect the current candidates with the next predicate."""
+        dense = BITMAP_DENSITY * self.total_rows
+        if candidates >= dense and estimate >= dense:
+            return "bitmap"
+        if candidates * math.log2(estimate + 2) < candidates + estimate:
+            return "probe"
+        return "merge"
+
+    def _combine(self, candidates: np.ndarray, predicate: Predicate) -> np.ndarray:
+        """Intersect candidates with a predicate using the strategy chosen at plan time."""
+        positions = predicate.positions()
+        if predicate.strategy == "row-range":
+            if not len(positions):
+                return positions
+            start = np.searchsorted(candidates, positions[0], side="left")
+            stop = np.searchsorted(candidates, positions[-1], side="right")
+            return candidates[start:stop]
+        if predicate.strategy == "bitmap":
+            bitmap = np.zeros(self.total_rows, dtype=bool)
+            bitmap[positions] = True
+            return candidates[bitmap[candidates]]
+        if predicate.strategy == "probe":
+            # Binary-search each candidate in the (larger) predicate positions
+            found = np.searchsorted(positions, candidates)
+            found[found == len(positions)] = 0
+            return candidates[positions[found] == candidates] if len(positions) else positions
+        return intersect_positions(candidates, positions)
@@ -0,0 +1,284 @@
+"""Pre-aggregated rollups answering aggregate queries without scanning the rows."""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.domain.products import AggregateGroup, ProductDataFilter
+from app.repositories.aggregation import GROUP_BY_COLUMNS, build_groups, metric_value
+from app.repositories.query_planner import filter_key
+
+# Partial aggregates stored per measure, and how partials of several rows combine
+PARTIAL_AGGREGATES = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+# Column of the number of rows behind each rollup row
+ROWS_COLUMN = "rows"
+
+
+def parse_rollup_dimensions(spec: str) -> List[Tuple[str, ...]]:
+    """
+    Parse the rollup configuration.
+
+    Args:
+        spec: Comma-separated dimension combinations joined with ``+``,
+            e.g. ``"brand+date,category+date"`` (empty for no rollups)
+
+    Returns:
+        Dimension combinations
+
+    Raises:
+        ValueError: If a dimension is unknown
+    """
+    combinations = []
+    for combination in spec.split(","):
+        dimensions = tuple(
+            dict.fromkeys(part.strip() for part in combination.split("+") if part.strip())
+        )
+        if not dimensions:
+            continue
+        for dimension in dimensions:
+            if dimension not in GROUP_BY_COLUMNS:
+                raise ValueError(f"Unknown rollup dimension: {dimension}")
+        combinations.append(dimensions)
+    return combinations
+
+
+def _partial(column: str, aggregate: str) -> str:
+    """Rollup column holding a partial aggregate of a measure."""
+    return f"{column}:{aggregate}"
+
+
+class Rollup:
+    """
+    Measures of a dataset pre-aggregated by one combination of dimensions.
+
+    Every rollup row holds, for one combination of dimension values, the row count and
+    the sum, non-missing count, minimum and maximum of every measure. Those partials
+    combine exactly into the sum/avg/min/max/count of any coarser grouping, so an
+    aggregate query grouping and filtering only on the rollup's dimensions is answered
+    from the (small) rollup instead of the rows.
+    """
+
+    def __init__(self, dimensions: Tuple[str, ...], measures: List[str], frame: pd.DataFrame):
+        """
+        Initialize the rollup.
+
+        Args:
+            dimensions: Group-by dimensions of the rollup
+            measures: Pre-aggregated measure columns
+            frame: Rollup rows (dimension columns, row count and measure partials)
+        """
+        self.dimensions = dimensions
+        self.measures = measures
+        self.frame = frame
+
+    @classmethod
+    def build(
+        cls, df: pd.DataFrame, dimensions: Tuple[str, ...], measure_columns: List[str]
+    ) -> Optional["Rollup"]:
+        """
+        Pre-aggregate a dataset.
+
+        Args:
+            df: Typed dataset
+            dimensions: Group-by dimensions (keys of ``GROUP_BY_COLUMNS``)
+            measure_columns: Measure columns to pre-aggregate
+
+        Returns:
+            The rollup, or None if a dimension column is missing from the dataset
+        """
+        columns = [GROUP_BY_COLUMNS[dimension] for dimension in dimensions]
+        if any(column not in df.columns for column in columns):
+            return None
+        measures = [column for column in measure_columns if column in df.columns]
+
+        grouped = df.groupby(columns, observed=True, dropna=False, sort=False)
+        partials = {
+            _partial(column, aggregate): (column, aggregate)
+            for column in measures
+            for aggregate in PARTIAL_AGGREGATES
+        }
+        frame = grouped.agg(**partials) if partials else pd.DataFrame(index=grouped.size().index)
+        frame.insert(0, ROWS_COLUMN, grouped.size().to_numpy())
+        return cls(dimensions, measures, frame.reset_index())
+
+    def extend(self, delta: pd.DataFrame) -> "Rollup":
+        """
+        Build the rollup of this rollup's rows followed by appended rows.
+
+        Args:
+            delta: Appended rows, with the column dtypes of the extended dataset
+
+        Returns:
+            New rollup over the existing and appended rows (this rollup is unchanged)
+        """
+        appended = Rollup.build(delta, self.dimensions, self.measures)
+        frame = self.frame.copy()
+        for column in self._columns:
+            # Categories of the extended dataset are a superset of the current ones
+            frame[column] = frame[column].astype(appended.frame[column].dtype)
+
+        combined = pd.concat([frame, appended.frame], ignore_index=True)
+        grouped = combined.groupby(self._columns, observed=True, dropna=False, sort=False)
+        partials = {ROWS_COLUMN: (ROWS_COLUMN, "sum")}
+        for column in self.measures:
+            for aggregate, combine in PARTIAL_AGGREGATES.items():
+                partials[_partial(column, aggregate)] = (_partial(column, aggregate), combine)
+        return Rollup(self.dimensions, self.measures, grouped.agg(**partials).reset_index())
+
+    @property
+    def _columns(self) -> List[str]:
+        """Dataset columns of the rollup dimensions."""
+        return [GROUP_BY_COLUMNS[dimension] for dimension in self.dimensions]
+
+    def covers(
+        self,
+        filter_params: ProductDataFilter,
+        group_by: Sequence[str],
+        metrics: Sequence[Tuple[str, str]],
+    ) -> bool:
+        """
+        Whether an aggregate query can be answered from this rollup.
+
+        Args:
+            filter_params: Filter of the query
+            group_by: Group-by dimensions of the query
+            metrics: (measure column, function) pairs of the query
+
+        Returns:
+            True if the query groups and filters only on the rollup's dimensions and
+            aggregates only pre-aggregated measures
+        """
+        dimensions = set(self.dimensions)
+        return (
+            dimensions.issuperset(group_by)
+            and dimensions.issuperset(filter_dimensions(filter_params))
+            and all(column in self.measures for column, _ in metrics)
+        )
+
+    def aggregate(
+        self,
+        filter_params: ProductDataFilter,
+        group_by: Sequence[str],
+        metrics: Sequence[Tuple[str, str]],
+    ) -> List[AggregateGroup]:
+        """
+        Answer an aggregate query covered by this rollup (see ``covers``).
+
+        Args:
+            filter_params: Filter of the query
+            group_by: Distinct group-by dimensions of the query
+            metrics: (measure column, function) pairs of the query
+
+        Returns:
+            The same groups ``aggregate_rows`` returns for the matching dataset rows
+            (sums of float measures may differ by rounding)
+        """
+        columns = [GROUP_BY_COLUMNS[dimension] for dimension in group_by]
+        partials = [
+            _partial(column, aggregate)
+            for column, function in metrics
+            for aggregate in (("sum", "count") if function == "avg" else (function,))
+        ]
+        # Only the grouped columns and the partials of the requested metrics are copied
+        selected = list(dict.fromkeys(columns + [ROWS_COLUMN] + partials))
+        rows = self.frame.loc[self._filter_mask(filter_params), selected]
+
+        if not columns:
+            values = [
+                metric_value(self._combine(rows, column, function)) for column, function in metrics
+            ]
+            return [AggregateGroup(keys=[], values=values, count=int(rows[ROWS_COLUMN].sum()))]
+
+        grouped = rows.groupby(columns, observed=True, dropna=False, sort=True)
+        return build_groups(
+            grouped[ROWS_COLUMN].sum(),
+            [self._combine(grouped, column, function) for column, function in metrics],
+        )
+
+    @staticmethod
+    def _combine(rows: Any, column: str, function: str) -> Any:
+        """Combine the partials of a measure into a metric (per group for a groupby)."""
+        if function == "avg":
+            sums = rows[_partial(column, "sum")].sum()
+            counts = rows[_partial(column, "count")].sum()
+            if np.ndim(counts) == 0:
+                return sums / counts if counts else None
+            return sums / counts.where(counts > 0)
+        return getattr(rows[_partial(column, function)], PARTIAL_AGGREGATES[function])()
+
+    def _filter_mask(self, filter_params: ProductDataFilter) -> np.ndarray:
+        """Rollup rows matching a filter, with the semantics of the query planner."""
+        date, client_id, _, brand, category, date_from, date_to = filter_key(filter_params)
+        mask = np.ones(len(self.frame), dtype=bool)
+
+        dates = self._values("date")
+        if date is not None:
+            mask &= (dates == date).fillna(False).to_numpy(dtype=bool)
+        if date_from or date_to:
+            # Dates are compared as YYYYMMDD strings, like the date partitions
+            text = dates.astype("string")
+            if date_from:
+                mask &= (text >= date_from).fillna(False).to_numpy(dtype=bool)
+            if date_to:
+                mask &= (text <= date_to).fillna(False).to_numpy(dtype=bool)
+        if client_id is not None:
+            clients = self._values("client")
+            mask &= (clients == client_id).fillna(False).to_numpy(dtype=bool)
+        for dimension, needle in (("brand", brand), ("category", category)):
+            if needle:
+                values = self._values(dimension)
+                matching = [
+                    value for value in values.dropna().unique() if needle in str(value).casefold()
+                ]
+                mask &= values.isin(matching).to_numpy(dtype=bool)
+        return mask
+
+    def _values(self, dimension: str) -> pd.Series:
+        """Values of a dimension over the rollup rows."""
+        return self.frame[GROUP_BY_COLUMNS[dimension]]
+
+
+def filter_dimensions(filter_params: ProductDataFilter) -> set:
+    """
+    Dimensions a filter restricts.
+
+    Args:
+        filter_params: Filter parameters
+
+    Returns:
+        Restricted dimensions; filters on a column that is not a dimension (SKU) map to
+        a name no rollup has, so such queries fall back to the rows
+    """
+    date, client_id, sku, brand, category, date_from, date_to = filter_key(filter_params)
+    restricted = {
+        "date": date is not None or date_from is not None or date_to is not None,
+        "client": client_id is not None,
+        "brand": bool(brand),
+        "category": bool(category),
+        "sku": sku is not None,
+    }
+    return {dimension for dimension, applies in restricted.items() if applies}
+
+
+def find_rollup(
+    rollups: Sequence[Rollup],
+    filter_params: ProductDataFilter,
+    group_by: Sequence[str],
+    metrics: Sequence[Tuple[str, str]],
+) -> Optional[Rollup]:
+    """
+    Pick the smallest rollup covering an aggregate query.
+
+    Args:
+        rollups: Available rollups
+        filter_params: Filter of the query
+        group_by: Group-by dimensions of the query
+        metrics: (measure column, function) pairs of the query
+
+    Returns:
+        The covering rollup with the fewest rows, or None to aggregate the rows
+    """
+    covering = [rollup for rollup in rollups if rollup.covers(filter_params, group_by, metrics)]
+    return min(covering, key=lambda rollup: len(rollup.frame), default=None)
@@ -0,0 +1,167 @@
+"""Memory-mapped columnar store shared by every worker process on a host.
+
+The typed dataset is materialised once as one ``.npy`` file per column buffer
+(values + validity mask for nullable numerics, dictionary codes for categoricals)
+plus a JSON manifest. Workers map the buffers read-only with ``np.load(mmap_mode="r")``
+and wrap them in pandas extension arrays without copying, so the column data lives
+once in the OS page cache regardless of the number of uvicorn workers.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+STORE_FORMAT_VERSION = 1
+
+
+def store_key(fingerprint: Dict[str, str]) -> str:
+    """Directory name for the store built from a CSV with the given fingerprint."""
+    payload = json.dumps({"format": STORE_FORMAT_VERSION, **fingerprint}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+@contextlib.contextmanager
+def materialize_lock(base_dir: Path) -> Iterator[None]:
+    """
+    Hold an exclusive inter-process lock on the store directory.
+
+    Workers starting together serialise on this lock so the dataset is parsed and
+    written by the first one only; the others find the finished store once they
+    acquire it.
+
+    Args:
+        base_dir: Base directory of the shared store
+    """
+    base_dir.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+
+    with open(base_dir / LOCK_NAME, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_store(df: pd.DataFrame, base_dir: Path, fingerprint: Dict[str, str]) -> Path:
+    """
+    Materialise a typed DataFrame as per-column ``.npy`` buffers.
+
+    The store is written to a temporary directory and renamed into place; stores built
+    from previous CSV versions are removed afterwards.
+
+    Args:
+        df: Typed dataset (nullable numeric, category and string columns)
+        base_dir: Base directory of the shared store
+        fingerprint: Fingerprint of the CSV the DataFrame was parsed from
+
+    Returns:
+        Directory of the written store
+    """
+    key = store_key(fingerprint)
+    target = base_dir / key
+    tmp_dir = base_dir / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    columns = []
+    for position, name in enumerate(df.columns):
+        series = df[name]
+        column = {"name": name, "dtype": str(series.dtype), "file": f"c{position}"}
+
+        if isinstance(series.dtype, pd.CategoricalDtype) or column["dtype"] == "string":
+            categorical = pd.Categorical(series)
+            column["categories"] = [str(c) for c in categorical.categories]
+            np.save(tmp_dir / f"c{position}.codes.npy", categorical.codes)
+        else:
+            array = series.array
+            if not isinstance(array, pd.arrays.IntegerArray | pd.arrays.FloatingArray):
+                array = pd.array(series.to_numpy(), dtype="Float64")
+                column["dtype"] = "Float64"
+            np.save(tmp_dir / f"c{position}.values.npy", array._data)
+            np.save(tmp_dir / f"c{position}.mask.npy", array._mask)
+        columns.append(column)
+
+    manifest = {"fingerprint": fingerprint, "rows": len(df), "columns": columns}
+    (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_dir, target)
+
+    for stale in base_dir.iterdir():
+        if stale.is_dir() and stale.name != key and not stale.name.startswith("."):
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def _map_buffer(path: str) -> np.ndarray:
+    """Map a ``.npy`` file read-only as a plain ndarray view over the memory map."""
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+def map_store(base_dir: Path, fingerprint: Dict[str, str]) -> Optional[pd.DataFrame]:
+    """
+    Map a previously written store read-only into a DataFrame without copying.
+
+    Args:
+        base_dir: Base directory of the shared store
+        fingerprint: Fingerprint of the current CSV
+
+    Returns:
+        DataFrame backed by memory-mapped buffers, or None if no matching store exists
+    """
+    store_dir = base_dir / store_key(fingerprint)
+    manifest_path = store_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["fingerprint"] != fingerprint:
+            return None
+
+        data = {}
+        for column in manifest["columns"]:
+            prefix = store_dir / column["file"]
+            if "categories" in column:
+                codes = _map_buffer(f"{prefix}.codes.npy")
+                values = pd.Categorical.from_codes(
+                    codes, categories=column["categories"], validate=False
+                )
+                if column["dtype"] == "string":
+                    # Free-text columns are small; they are rebuilt per worker
+                    values = pd.array(values.astype(object), dtype="string")
+            else:
+                buffer = _map_buffer(f"{prefix}.values.npy")
+                mask = _map_buffer(f"{prefix}.mask.npy")
+                array_type = (
+                    pd.arrays.IntegerArray
+                    if column["dtype"] == "Int64"
+                    else pd.arrays.FloatingArray
+                )
+                values = array_type(buffer, mask)
+            data[column["name"]] = values
+
+        return pd.DataFrame(data, copy=False)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable shared dataset store %s: %s", store_dir, e)
+        return None
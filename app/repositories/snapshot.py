@@ -0,0 +1,119 @@
+"""Columnar (Parquet) snapshot cache for the parsed CSV dataset."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow installed
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Schema metadata key holding the fingerprint of the CSV the snapshot was built from
+FINGERPRINT_KEY = b"pipol.source_fingerprint"
+
+# Read size used when hashing the source CSV
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def snapshot_available() -> bool:
+    """Return True if the optional pyarrow dependency is installed."""
+    return pq is not None
+
+
+def source_fingerprint(csv_path: Path, with_hash: bool = False) -> Optional[Dict[str, str]]:
+    """
+    Fingerprint a CSV file by size and modification time (and optionally content hash).
+
+    Args:
+        csv_path: Path to the source CSV
+        with_hash: Also include the SHA-256 of the file contents
+
+    Returns:
+        Fingerprint dictionary, or None if the file cannot be read
+    """
+    try:
+        stat = csv_path.stat()
+        fingerprint = {"size": str(stat.st_size), "mtime_ns": str(stat.st_mtime_ns)}
+        if with_hash:
+            digest = hashlib.sha256()
+            with open(csv_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            fingerprint["sha256"] = digest.hexdigest()
+        return fingerprint
+    except OSError:
+        return None
+
+
+def fingerprint_version(fingerprint: Dict[str, str]) -> str:
+    """Short stable identifier of the dataset built from a CSV with this fingerprint."""
+    return hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def read_snapshot(snapshot_path: Path, fingerprint: Dict[str, str]) -> Optional[pd.DataFrame]:
+    """
+    Read a snapshot if it exists and was built from a CSV with the given fingerprint.
+
+    Args:
+        snapshot_path: Path to the Parquet snapshot
+        fingerprint: Fingerprint of the current CSV
+
+    Returns:
+        The cached DataFrame, or None if the snapshot is missing or stale
+    """
+    if not snapshot_available() or not snapshot_path.exists():
+        return None
+
+    try:
+        # Only the footer is read to validate the snapshot
+        metadata = pq.read_schema(snapshot_path).metadata or {}
+        stored = json.loads(metadata.get(FINGERPRINT_KEY, b"{}"))
+        if stored != fingerprint:
+            logger.info("Dataset snapshot %s is stale, rebuilding from CSV", snapshot_path)
+            return None
+        return pq.read_table(snapshot_path).to_pandas()
+    except (OSError, ValueError, pa.ArrowException) as e:
+        logger.warning("Ignoring unreadable dataset snapshot %s: %s", snapshot_path, e)
+        return None
+
+
+def write_snapshot(df: pd.DataFrame, snapshot_path: Path, fingerprint: Dict[str, str]) -> bool:
+    """
+    Atomically write a snapshot of the DataFrame tagged with the CSV fingerprint.
+
+    The file is written under a temporary name and renamed into place, so concurrent
+    workers never observe a partially written snapshot.
+
+    Args:
+        df: Typed dataset to persist
+        snapshot_path: Destination path
+        fingerprint: Fingerprint of the CSV the DataFrame was parsed from
+
+    Returns:
+        True if the snapshot was written
+    """
+    if not snapshot_available():
+        logger.warning("pyarrow is not installed, dataset snapshot disabled")
+        return False
+
+    tmp_path = snapshot_path.with_name(f".{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), FINGERPRINT_KEY: json.dumps(fingerprint)}
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, snapshot_path)
+        return True
+    except (OSError, ValueError, pa.ArrowException) as e:
+        logger.warning("Could not write dataset snapshot %s: %s", snapshot_path, e)
+        tmp_path.unlink(missing_ok=True)
+        return False
@@ -0,0 +1,130 @@
+"""Sorted views of the dataset: row permutations per sort column, built once per version."""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.repositories.indexes import EMPTY_POSITIONS
+
+# Sort field -> dataset column
+SORT_COLUMNS: Dict[str, str] = {
+    "date": "id_tie_fecha_valor",
+    "revenue": "fc_ingreso_producto_monto",
+    "cart_additions": "fc_agregado_carrito_cant",
+    "cart_removals": "fc_retirado_carrito_cant",
+    "page_views": "fc_visualizaciones_pag_cant",
+}
+
+
+def sort_key(series: pd.Series) -> np.ndarray:
+    """
+    Numeric sort key of a column, NaN for missing values.
+
+    Categorical columns are keyed by the lexical rank of their categories, so the order
+    does not depend on the order categories were added in (e.g. by appends).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        category_rank = np.empty(len(series.cat.categories), dtype=np.float64)
+        category_rank[series.cat.categories.argsort()] = np.arange(len(category_rank))
+        codes = series.cat.codes.to_numpy()
+        key = category_rank[codes] if len(category_rank) else np.zeros(len(codes))
+        key[codes < 0] = np.nan
+        return key
+    return series.array.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class SortedView:
+    """
+    Rows of a dataset ordered by one column.
+
+    Holds the permutation of the row positions in sort order and its inverse (the
+    rank of every row). A page of all rows is a slice of the permutation; a page of a
+    filtered match set selects the smallest ranks of the matches with a partial sort,
+    so no request sorts the dataset.
+    """
+
+    def __init__(self, series: pd.Series, descending: bool = False):
+        """
+        Sort the rows by a column.
+
+        The sort is stable, so rows with equal values keep their dataset order in both
+        directions; missing values sort last in both directions.
+
+        Args:
+            series: Sort column
+            descending: Sort from the largest value
+        """
+        key = sort_key(series)
+        self.order = np.argsort(-key if descending else key, kind="stable").astype(
+            np.intp, copy=False
+        )
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order), dtype=np.intp)
+        self.order.flags.writeable = False
+        self.rank.flags.writeable = False
+
+    def page(self, matches: Optional[np.ndarray], offset: int, limit: int) -> np.ndarray:
+        """
+        Get a page of matching rows in sort order.
+
+        Args:
+            matches: Ascending matching row positions, or None for every row
+            offset: Number of sorted matches to skip
+            limit: Maximum number of rows to return
+
+        Returns:
+            Row positions of the page, in sort order
+        """
+        if matches is None:
+            return self.order[offset : offset + limit]
+
+        stop = min(offset + limit, len(matches))
+        if offset >= stop:
+            return EMPTY_POSITIONS
+        ranks = self.rank[matches]
+        if stop < len(ranks):
+            # Only the first ``stop`` ranks are needed, in order
+            ranks = np.partition(ranks, stop - 1)[:stop]
+        return self.order[np.sort(ranks)[offset:stop]]
+
+
+class SortedViews:
+    """Sorted views of one dataset version, built on first use and then reused."""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize the views of a dataset.
+
+        Args:
+            df: Dataset version (never modified while the views exist)
+        """
+        self._df = df
+        self._views: Dict[Tuple[str, bool], SortedView] = {}
+        self._lock = threading.Lock()
+
+    def get(self, column: str, descending: bool = False) -> Optional[SortedView]:
+        """
+        Get the view of a column and direction, sorting the rows on first use.
+
+        Concurrent first uses sort once; later calls return the memoised view.
+
+        Args:
+            column: Sort column
+            descending: Sort from the largest value
+
+        Returns:
+            The sorted view, or None if the column is not in the dataset
+        """
+        key = (column, descending)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+        if column not in self._df.columns:
+            return None
+        with self._lock:
+            view = self._views.get(key)
+            if view is None:
+                view = self._views[key] = SortedView(self._df[column], descending)
+        return view
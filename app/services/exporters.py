@@ -0,0 +1,93 @@
+"""Streaming serialisers turning DataFrame chunks into NDJSON, CSV or Arrow IPC bytes."""
+
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow installed
+    pa = None
+
+# Export format -> media type of the response
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Export format -> file extension suggested to clients
+EXPORT_EXTENSIONS: Dict[str, str] = {"ndjson": "ndjson", "csv": "csv", "arrow": "arrows"}
+
+
+def arrow_available() -> bool:
+    """Return True if the optional pyarrow dependency is installed."""
+    return pa is not None
+
+
+def ndjson_chunks(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Serialise DataFrame chunks as newline-delimited JSON, one object per row.
+
+    Values are unboxed to native Python types (missing values become null), so
+    numbers keep their exact representation.
+    """
+    for frame in frames:
+        names = list(frame.columns)
+        values = [
+            frame[name].array.to_numpy(dtype=object, na_value=None).tolist() for name in names
+        ]
+        lines = [
+            json.dumps(dict(zip(names, row, strict=True)), ensure_ascii=False)
+            for row in zip(*values, strict=True)
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_chunks(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """Serialise DataFrame chunks as CSV with a single header line (missing values empty)."""
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode()
+        header = False
+
+
+def arrow_chunks(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Serialise DataFrame chunks as an Arrow IPC stream, one record batch per chunk.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if not arrow_available():
+        raise RuntimeError("Arrow export requires pyarrow")
+
+    sink = io.BytesIO()
+    writer = None
+    for frame in frames:
+        batch = pa.RecordBatch.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield _drain(sink)
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    """Take the bytes written to a buffer so far and empty it."""
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+EXPORT_SERIALIZERS: Dict[str, Callable[[Iterable[pd.DataFrame]], Iterator[bytes]]] = {
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+    "arrow": arrow_chunks,
+}
@@ -1,10 +1,40 @@
 """Products business logic service."""
 
+import base64
+import binascii
 import re
-from typing import List, Optional
-
-from app.models.domain.products import ProductData, ProductDataFilter
-from app.repositories.product_repository import product_repository
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.result_cache import ResultCache
+from app.models.domain.products import (
+    AggregateGroup,
+    DatasetMetadata,
+    ProductData,
+    ProductDataFilter,
+    ProductPage,
+    TopProduct,
+)
+from app.repositories.aggregation import AGGREGATE_FUNCTIONS, GROUP_BY_COLUMNS
+from app.repositories.product_repository import (
+    MEASURE_COLUMNS,
+    PRODUCT_COLUMNS,
+    StaleDatasetVersionError,
+    product_repository,
+)
+from app.repositories.query_planner import filter_key
+from app.repositories.sorted_views import SORT_COLUMNS
+from app.services.exporters import EXPORT_SERIALIZERS, arrow_available
+
+CURSOR_PREFIX = "cursor:v1"
+
+# Dates of the dataset (and of date range bounds) are YYYYMMDD strings
+DATE_PATTERN = re.compile(r"[0-9]{8}")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or refers to another dataset version."""
 
 
 class ProductsService:
@@ -13,6 +43,77 @@ class ProductsService:
     def __init__(self):
         """Initialize the products service."""
         self.repository = product_repository
+        self.result_cache = ResultCache(
+            max_entries=settings.RESULT_CACHE_MAX_ENTRIES if settings.RESULT_CACHE_ENABLED else 0,
+            max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+        )
+
+    def warm_up(self) -> DatasetMetadata:
+        """
+        Load the dataset and build its indexes ahead of the first request.
+
+        Returns:
+            Metadata of the loaded dataset
+        """
+        return self.repository.warm_up()
+
+    def reload_dataset(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Reload the dataset from the CSV and swap the new version in.
+
+        Cached results of the previous version are dropped; cursors issued for it are
+        rejected because they carry its version.
+
+        Args:
+            force: Reload even if the CSV did not change
+
+        Returns:
+            Dictionary with whether a new version was loaded, its version and record count
+
+        Raises:
+            IOError: If the new dataset cannot be loaded (the current one is kept)
+        """
+        reloaded = self.repository.reload(force=force)
+        if reloaded:
+            self.result_cache.clear()
+        metadata = self.repository.get_metadata()
+        return {
+            "reloaded": reloaded,
+            "dataset_version": metadata.dataset_version,
+            "total_records": metadata.total_records,
+        }
+
+    def append_dataset(self, delta_path: Path) -> Dict[str, Any]:
+        """
+        Append the rows of a delta CSV to the loaded dataset.
+
+        Args:
+            delta_path: CSV with the same header as the main CSV
+
+        Returns:
+            Dictionary with the number of appended rows, the new version and record count
+
+        Raises:
+            IOError: If the delta cannot be read (the current version is kept)
+        """
+        appended = self.repository.append_delta(delta_path)
+        self.result_cache.clear()
+        metadata = self.repository.get_metadata()
+        return {
+            "appended_rows": appended,
+            "dataset_version": metadata.dataset_version,
+            "total_records": metadata.total_records,
+        }
+
+    def changed_source_fingerprint(self) -> Optional[Dict[str, str]]:
+        """
+        Check whether the CSV changed since the loaded dataset version was read.
+
+        Returns:
+            The new CSV fingerprint if it changed, else None
+        """
+        return self.repository.changed_source_fingerprint()
 
     def get_all_products(self, limit: int = 100, offset: int = 0) -> List[ProductData]:
         """
@@ -37,41 +138,321 @@ class ProductsService:
         Returns:
             List of filtered ProductData objects
         """
-        return self.repository.get_by_filter(filter_params)
+        products = self.result_cache.get_or_compute(
+            self._cache_key("rows", filter_params),
+            lambda: self.repository.get_by_filter(filter_params),
+        )
+        return list(products)
+
+    def search_product_columns(
+        self, filter_params: ProductDataFilter, columns: Optional[List[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Search products with filters, returning the page as column lists.
+
+        Args:
+            filter_params: Filter parameters
+            columns: Columns to return (defaults to every product field)
+
+        Returns:
+            Mapping of column name to the values of the matching rows
+        """
+        data = self.result_cache.get_or_compute(
+            self._cache_key("columns", filter_params, tuple(columns) if columns else None),
+            lambda: self.repository.get_columns_by_filter(filter_params, columns=columns),
+        )
+        return {column: list(values) for column, values in data.items()}
+
+    def aggregate_products(
+        self,
+        filter_params: ProductDataFilter,
+        group_by: Sequence[str],
+        metrics: Sequence[Tuple[str, str]],
+    ) -> List[AggregateGroup]:
+        """
+        Aggregate measures of the products matching a filter, grouped by dimensions.
+
+        Repeated dimensions and metrics are evaluated once, so the group keys and
+        values follow the order of their first occurrence.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            group_by: Dimensions to group by (brand, category, date, client, device_type,
+                source_medium); none aggregates every matching row into one group
+            metrics: (measure column, function) pairs, function being sum, avg, min, max
+                or count
 
-    def get_available_brands(self) -> List[str]:
+        Returns:
+            One group per combination of group-by values, sorted by those values
+
+        Raises:
+            ValueError: If a dimension, column or function is unknown
+        """
+        group_by = tuple(dict.fromkeys(group_by))
+        metrics = tuple(dict.fromkeys(metrics))
+        for dimension in group_by:
+            if dimension not in GROUP_BY_COLUMNS:
+                raise ValueError(f"Unknown group-by dimension: {dimension}")
+        for column, function in metrics:
+            if column not in MEASURE_COLUMNS:
+                raise ValueError(f"Unknown measure column: {column}")
+            if function not in AGGREGATE_FUNCTIONS:
+                raise ValueError(f"Unknown aggregate function: {function}")
+
+        key = (
+            "aggregate",
+            self.repository.dataset_version,
+            filter_key(filter_params),
+            group_by,
+            metrics,
+        )
+        groups = self.result_cache.get_or_compute(
+            key, lambda: self.repository.aggregate(filter_params, group_by, metrics)
+        )
+        return list(groups)
+
+    def get_top_products(
+        self, filter_params: ProductDataFilter, measure_column: str, n: int = 10
+    ) -> List[TopProduct]:
+        """
+        Get the products with the largest total of a measure over the filtered rows.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            measure_column: Measure to rank by (an fc_* column)
+            n: Number of products to return (between 1 and 100)
+
+        Returns:
+            Up to ``n`` products by descending total
+
+        Raises:
+            ValueError: If the measure column is unknown
+        """
+        if measure_column not in MEASURE_COLUMNS:
+            raise ValueError(f"Unknown measure column: {measure_column}")
+        n, _ = self.validate_pagination(n, 0)
+
+        key = (
+            "top",
+            self.repository.dataset_version,
+            filter_key(filter_params),
+            measure_column,
+            n,
+        )
+        products = self.result_cache.get_or_compute(
+            key, lambda: self.repository.top_products(filter_params, measure_column, n)
+        )
+        return list(products)
+
+    def export_products(
+        self,
+        filter_params: ProductDataFilter,
+        export_format: str = "ndjson",
+        columns: Optional[List[str]] = None,
+    ) -> Tuple[str, Iterator[bytes]]:
+        """
+        Stream every product matching a filter in an export format.
+
+        Rows are read and serialised chunk by chunk as the returned iterator is
+        consumed, so memory use does not grow with the number of rows. Exports bypass
+        the result cache and ignore limit/offset.
+
+        Args:
+            filter_params: Filter parameters (as for searches; order_by is honoured)
+            export_format: ndjson, csv or arrow (Arrow IPC stream)
+            columns: Columns to export (defaults to every product field)
+
+        Returns:
+            Tuple of (dataset version, iterator of encoded chunks)
+
+        Raises:
+            ValueError: If the format or a column is unknown, or arrow is requested
+                without pyarrow installed
+        """
+        if export_format not in EXPORT_SERIALIZERS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        if export_format == "arrow" and not arrow_available():
+            raise ValueError("Arrow export requires pyarrow")
+        for column in columns or []:
+            if column not in PRODUCT_COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+
+        version, chunks = self.repository.iter_export_chunks(
+            filter_params, columns=columns, chunk_rows=settings.EXPORT_CHUNK_ROWS
+        )
+        return version, EXPORT_SERIALIZERS[export_format](chunks)
+
+    def _cache_key(self, kind: str, filter_params: ProductDataFilter, *extra: Any) -> Hashable:
+        """
+        Result cache key of a search.
+
+        The key holds the dataset version, so results cached before a reload are never
+        served afterwards, and the normalised predicates, page and order of the filter,
+        so equivalent filters share an entry.
+        """
+        return (
+            kind,
+            self.repository.dataset_version,
+            filter_key(filter_params),
+            filter_params.limit or 100,
+            filter_params.offset or 0,
+            filter_params.order_by,
+            filter_params.descending,
+            *extra,
+        )
+
+    def get_cache_statistics(self) -> Dict[str, int]:
+        """
+        Get the result cache counters.
+
+        Returns:
+            Dictionary with entries, bytes, hits, misses, evictions and expirations
+        """
+        return self.result_cache.stats()
+
+    def search_products_page(
+        self, filter_params: ProductDataFilter, first: int, after: Optional[str] = None
+    ) -> ProductPage:
+        """
+        Search products with cursor (keyset) pagination.
+
+        Args:
+            filter_params: Filter parameters (limit/offset are ignored)
+            first: Requested page size (clamped like ``limit``)
+            after: Opaque cursor of the last row already seen
+
+        Returns:
+            Page of matching products
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or the dataset changed since
+                it was issued
+        """
+        first, _ = self.validate_pagination(first, 0)
+        version, after_position = self.decode_cursor(after) if after else (None, None)
+        try:
+            # The version is checked against the dataset snapshot serving the page
+            return self.repository.get_page_after(
+                filter_params, first=first, after=after_position, after_version=version
+            )
+        except StaleDatasetVersionError as e:
+            raise InvalidCursorError(
+                "Cursor refers to a previous version of the dataset; restart pagination"
+            ) from e
+
+    @staticmethod
+    def encode_cursor(dataset_version: str, position: int) -> str:
+        """
+        Build the opaque cursor of a row.
+
+        Args:
+            dataset_version: Version of the dataset the row was read from
+            position: Dataset row position
+
+        Returns:
+            URL-safe cursor string
+        """
+        raw = f"{CURSOR_PREFIX}:{dataset_version}:{position}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """
+        Decode a cursor built by ``encode_cursor``.
+
+        Args:
+            cursor: Opaque cursor string
+
+        Returns:
+            Tuple of (dataset_version, position)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            prefix, version, position = (
+                base64.urlsafe_b64decode(padded).decode().rsplit(":", 2)
+            )
+            if prefix != CURSOR_PREFIX or int(position) < 0:
+                raise ValueError(cursor)
+            return version, int(position)
+        except (ValueError, binascii.Error, UnicodeDecodeError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
+    def explain_search(self, filter_params: ProductDataFilter) -> List[str]:
+        """
+        Explain the evaluation plan chosen for a search.
+
+        Args:
+            filter_params: Filter parameters
+
+        Returns:
+            Plan steps in evaluation order
+        """
+        return self.repository.explain_filter(filter_params)
+
+    def get_available_brands(self) -> Sequence[str]:
         """
         Get list of all unique brands.
 
         Returns:
-            List of brand names sorted alphabetically
+            Brand names sorted alphabetically (precomputed per dataset version)
         """
         return self.repository.get_brands()
 
-    def get_available_categories(self) -> List[str]:
+    def get_available_categories(self) -> Sequence[str]:
         """
         Get list of all unique categories.
 
         Returns:
-            List of category names sorted alphabetically
+            Category names sorted alphabetically (precomputed per dataset version)
         """
         return self.repository.get_categories()
 
+    def get_dataset_version(self) -> str:
+        """
+        Get the version of the loaded dataset.
+
+        Returns:
+            Dataset version (changes whenever the data changes)
+        """
+        return self.repository.dataset_version
+
+    def get_dimension_values(self, dimension: str) -> Tuple[str, Sequence[str]]:
+        """
+        Get all values of a listed dimension with the dataset version they belong to.
+
+        Args:
+            dimension: ``brands`` or ``categories``
+
+        Returns:
+            Tuple of (dataset version, sorted values)
+
+        Raises:
+            ValueError: If the dimension is unknown
+        """
+        if dimension not in ("brands", "categories"):
+            raise ValueError(f"Unknown dimension: {dimension}")
+        metadata = self.repository.get_metadata()
+        return metadata.dataset_version, getattr(metadata, dimension)
+
     def get_dataset_statistics(self) -> dict:
         """
         Get statistics about the dataset.
 
         Returns:
-            Dictionary with dataset statistics
+            Dictionary with dataset statistics (precomputed per dataset version)
         """
-        total_records = self.repository.count()
-        brands = self.get_available_brands()
-        categories = self.get_available_categories()
+        metadata = self.repository.get_metadata()
 
         return {
-            "total_records": total_records,
-            "brands_count": len(brands),
-            "categories_count": len(categories),
+            "total_records": metadata.total_records,
+            "brands_count": metadata.brands_count,
+            "categories_count": metadata.categories_count,
+            "min_date": metadata.min_date,
+            "max_date": metadata.max_date,
+            "column_totals": metadata.column_totals,
         }
 
     def validate_pagination(self, limit: int, offset: int) -> tuple[int, int]:
@@ -100,6 +481,10 @@ class ProductsService:
         category: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
     ) -> ProductDataFilter:
         """
         Build a ProductDataFilter with validated parameters.
@@ -112,26 +497,45 @@ class ProductsService:
             category: Filter by category
             limit: Maximum records
             offset: Records to skip
+            date_from: First date included
+            date_to: Last date included
+            order_by: Sort field (date, revenue, cart_additions, cart_removals, page_views)
+            descending: Sort from the largest value
 
         Returns:
             ProductDataFilter object
+
+        Raises:
+            ValueError: If the sort field is unknown or a date bound is not YYYYMMDD
         """
         validated_limit, validated_offset = self.validate_pagination(limit, offset)
+        if order_by is not None and order_by not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort field: {order_by}")
 
         # Sanitize string inputs to prevent injection attacks
         sanitized_date = self._sanitize_string_input(date) if date else None
+        sanitized_date_from = self._sanitize_string_input(date_from) if date_from else None
+        sanitized_date_to = self._sanitize_string_input(date_to) if date_to else None
+        # Bounds are compared as strings, so anything but YYYYMMDD would silently misorder
+        for name, value in (("date_from", sanitized_date_from), ("date_to", sanitized_date_to)):
+            if value is not None and not DATE_PATTERN.fullmatch(value):
+                raise ValueError(f"Invalid {name}: expected a YYYYMMDD date")
         sanitized_brand = self._sanitize_string_input(brand) if brand else None
         sanitized_sku = self._sanitize_string_input(sku) if sku else None
         sanitized_category = self._sanitize_string_input(category) if category else None
 
         return ProductDataFilter(
             date=sanitized_date,
+            date_from=sanitized_date_from,
+            date_to=sanitized_date_to,
             client_id=client_id,
             brand=sanitized_brand,
             sku=sanitized_sku,
             category=sanitized_category,
             limit=validated_limit,
             offset=validated_offset,
+            order_by=order_by,
+            descending=descending,
         )
 
 
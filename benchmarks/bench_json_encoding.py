@@ -0,0 +1,92 @@
+"""Benchmark: encoding 100-row searchProducts responses with each JSON encoder.
+
+Executes ``searchProducts`` pages (all 23 fields) through the GraphQL schema once, then
+times encoding the resulting response bodies with every encoder of
+``app.core.json_encoding``, reporting time per page and the size of the body.
+
+Usage:
+    python -m benchmarks.bench_json_encoding [--csv data.csv] [--rows 200000] [--pages 200]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from strawberry.utils.str_converters import to_camel_case
+
+from app.controllers.products.resolvers import COLUMN_FIELD_NAMES
+from app.controllers.products.router import schema
+from app.core.json_encoding import JSON_ENCODERS, orjson_available
+from app.repositories.product_repository import PRODUCT_COLUMNS, ProductRepository
+from app.services.products_service import products_service
+from benchmarks.synthetic import write_csv
+
+FIELDS = " ".join(
+    to_camel_case(COLUMN_FIELD_NAMES.get(column, column)) for column in PRODUCT_COLUMNS
+)
+QUERY = (
+    """
+query Page($offset: Int!) {
+  searchProducts(filters: { limit: 100, offset: $offset }) { %s }
+}
+"""
+    % FIELDS
+)
+
+
+async def execute_pages(pages: int) -> List[Dict[str, Any]]:
+    """Execute the page queries and return their response bodies, as Strawberry builds them."""
+    bodies = []
+    for i in range(pages):
+        result = await schema.execute(
+            QUERY, variable_values={"offset": (i * 100) % 10_000}, context_value={"user": {}}
+        )
+        if result.errors:
+            raise RuntimeError(result.errors[0].message)
+        bodies.append({"data": result.data})
+    return bodies
+
+
+def measure(encode: Callable[[Any], bytes], bodies: List[Dict[str, Any]], rounds: int = 5):
+    """Return (best mean µs per page over the rounds, mean KiB per page)."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for body in bodies:
+            encode(body)
+        best = min(best, time.perf_counter() - start)
+    size = sum(len(encode(body)) for body in bodies)
+    return best / len(bodies) * 1e6, size / len(bodies) / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", type=Path, default=None)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProductRepository()
+        repo.csv_path = args.csv or write_csv(Path(tmp) / "data.csv", args.rows)
+        repo._load_data()
+    products_service.repository = repo
+
+    bodies = asyncio.run(execute_pages(args.pages))
+    encoders = [name for name in JSON_ENCODERS if name != "orjson" or orjson_available()]
+    results = {name: measure(JSON_ENCODERS[name], bodies) for name in encoders}
+
+    print(f"{'encoder':<10} {'µs / page':>10} {'KiB / page':>11}")
+    for name, (us, kib) in results.items():
+        print(f"{name:<10} {us:>10.1f} {kib:>11.1f}")
+
+    if "orjson" in results:
+        print(f"\nspeedup: {results['json'][0] / results['orjson'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: legacy ``dtype=str`` CSV load vs. the typed columnar loader.
+
+Usage:
+    python -m benchmarks.bench_load [--csv data.csv] [--rows 200000] [--repeat 3]
+
+Without ``--csv`` a synthetic dataset with the production column layout is generated.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from app.repositories.product_repository import (
+    FLOAT_COLUMNS,
+    INTEGER_COLUMNS,
+    NA_VALUES,
+    PARSE_DTYPES,
+    apply_column_dtypes,
+)
+from benchmarks.synthetic import write_csv
+
+
+def legacy_load(path: Path) -> pd.DataFrame:
+    """Reproduce the previous loader: read as str, then convert column by column."""
+    df = pd.read_csv(path, na_values=NA_VALUES, keep_default_na=True, dtype=str)
+    for col in INTEGER_COLUMNS + FLOAT_COLUMNS:
+        if col in df.columns:
+            mask = (df[col].notna()) & (df[col] != "nan") & (df[col] != "")
+            if mask.any():
+                df.loc[mask, col] = pd.to_numeric(df.loc[mask, col], errors="coerce")
+                df[col] = df[col].where(pd.notnull(df[col]), None)
+            else:
+                df[col] = None
+    if "id_tie_fecha_valor" in df.columns:
+        df["id_tie_fecha_valor"] = df["id_tie_fecha_valor"].astype(str).replace("nan", None)
+    return df.where(pd.notnull(df), None)
+
+
+def typed_load(path: Path) -> pd.DataFrame:
+    """Current loader: every column parsed straight into its final dtype."""
+    df = pd.read_csv(path, na_values=NA_VALUES, keep_default_na=True, dtype=PARSE_DTYPES)
+    return apply_column_dtypes(df)
+
+
+def measure(loader: Callable[[Path], pd.DataFrame], path: Path, repeat: int) -> tuple:
+    """Return (best load seconds, deep memory bytes) for a loader."""
+    best = float("inf")
+    df = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = loader(path)
+        best = min(best, time.perf_counter() - start)
+    return best, int(df.memory_usage(deep=True).sum())
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", type=Path, default=None)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv or write_csv(Path(tmp) / "data.csv", args.rows)
+        results = {
+            "legacy (dtype=str)": measure(legacy_load, path, args.repeat),
+            "typed columnar": measure(typed_load, path, args.repeat),
+        }
+
+    print(f"{'loader':<20} {'load time (s)':>14} {'memory (MiB)':>14}")
+    for name, (seconds, memory) in results.items():
+        print(f"{name:<20} {seconds:>14.3f} {memory / 2**20:>14.1f}")
+
+    (legacy_s, legacy_mem), (typed_s, typed_mem) = results.values()
+    print(f"\nspeedup: {legacy_s / typed_s:.1f}x, memory: {legacy_mem / typed_mem:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
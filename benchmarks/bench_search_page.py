@@ -0,0 +1,80 @@
+"""Benchmark: building a 100-row searchProducts page with and without Pydantic.
+
+Compares the previous path (``to_dict("records")`` -> ``ProductData`` validation ->
+``product_data_to_graphql``) with the columnar fast path (column lists ->
+``ProductDataType``), reporting time and peak allocated memory per page.
+
+Usage:
+    python -m benchmarks.bench_search_page [--csv data.csv] [--rows 200000] [--pages 200]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+from app.controllers.products.resolvers import columns_to_graphql, product_data_to_graphql
+from app.models.domain.products import ProductDataFilter
+from app.repositories.product_repository import ProductRepository
+from benchmarks.synthetic import write_csv
+
+
+def measure(build_page: Callable[[ProductDataFilter], List], filters: List[ProductDataFilter]):
+    """Return (mean ms per page, mean peak KiB allocated per page) over the given filters."""
+    for filter_params in filters[:5]:
+        build_page(filter_params)  # warm the match-set cache and code paths
+
+    start = time.perf_counter()
+    for filter_params in filters:
+        build_page(filter_params)
+    elapsed = time.perf_counter() - start
+
+    peaks = 0
+    tracemalloc.start()
+    for filter_params in filters:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        page = build_page(filter_params)
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+        del page
+    tracemalloc.stop()
+
+    pages = len(filters)
+    return elapsed / pages * 1000, peaks / pages / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", type=Path, default=None)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProductRepository()
+        repo.csv_path = args.csv or write_csv(Path(tmp) / "data.csv", args.rows)
+        repo._load_data()
+
+    filters = [ProductDataFilter(limit=100, offset=(i * 100) % 10_000) for i in range(args.pages)]
+
+    def legacy(filter_params: ProductDataFilter) -> List:
+        return [product_data_to_graphql(p) for p in repo.get_by_filter(filter_params)]
+
+    def fast(filter_params: ProductDataFilter) -> List:
+        return columns_to_graphql(repo.get_columns_by_filter(filter_params))
+
+    results = {"pydantic records": measure(legacy, filters), "columnar": measure(fast, filters)}
+
+    print(f"{'path':<18} {'ms / page':>10} {'peak KiB / page':>16}")
+    for name, (ms, kib) in results.items():
+        print(f"{name:<18} {ms:>10.2f} {kib:>16.1f}")
+
+    (legacy_ms, _), (fast_ms, _) = results.values()
+    print(f"\nspeedup: {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
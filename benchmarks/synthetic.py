@@ -0,0 +1,92 @@
+"""Synthetic product analytics CSV generator for benchmarks."""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BRANDS = ["STANLEY", "DEWALT", "CASABLANCA", "BOSCH", "BLACK+DECKER", "No Aplica", "TRAMONTINA"]
+CATEGORIES = ["CAMPING", "PINTURAS", "HERRAMIENTAS", "JARDIN", "BAÑO", "COCINA", "ILUMINACION"]
+
+
+def generate_frame(rows: int, days: int = 30, skus: int = 2000, seed: int = 7) -> pd.DataFrame:
+    """
+    Build a DataFrame with the same columns and value shapes as ``data.csv``.
+
+    Args:
+        rows: Number of rows to generate
+        days: Number of distinct ``id_tie_fecha_valor`` values (rows are date ordered)
+        skus: Number of distinct products
+        seed: Random seed
+
+    Returns:
+        Synthetic DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=days).strftime("%Y%m%d").to_numpy()
+    product = rng.integers(0, skus, rows)
+    brand = np.array(BRANDS, dtype=object)[product % len(BRANDS)]
+    category = np.array(CATEGORIES, dtype=object)[product % len(CATEGORIES)]
+    sku = np.char.add("SKU", product.astype(str)).astype(object)
+    name = np.char.add("PRODUCTO ", product.astype(str)).astype(object)
+
+    def sparse_counts(high: int) -> np.ndarray:
+        values = rng.integers(0, high, rows).astype(float)
+        values[rng.random(rows) < 0.3] = np.nan
+        return values
+
+    revenue = np.round(rng.random(rows) * 50000, 2)
+    revenue[rng.random(rows) < 0.6] = np.nan
+
+    return pd.DataFrame(
+        {
+            "id_tie_fecha_valor": np.sort(rng.choice(dates, rows)),
+            "id_cli_cliente": rng.choice([8, 10, 12], rows),
+            "id_ga_vista": rng.integers(1, 5, rows),
+            "id_ga_tipo_dispositivo": rng.integers(1, 4, rows),
+            "id_ga_fuente_medio": rng.integers(1, 200, rows),
+            "desc_ga_sku_producto": sku,
+            "desc_ga_categoria_producto": category,
+            "fc_agregado_carrito_cant": sparse_counts(5),
+            "fc_ingreso_producto_monto": revenue,
+            "fc_retirado_carrito_cant": sparse_counts(3),
+            "fc_detalle_producto_cant": sparse_counts(20),
+            "fc_producto_cant": sparse_counts(4),
+            "desc_ga_nombre_producto": name,
+            "fc_visualizaciones_pag_cant": sparse_counts(50),
+            "flag_pipol": rng.integers(0, 2, rows),
+            "SASASA": np.where(rng.random(rows) < 0.5, "A", None),
+            "id_ga_producto": product,
+            "desc_ga_nombre_producto_1": name,
+            "desc_ga_sku_producto_1": sku,
+            "desc_ga_marca_producto": brand,
+            "desc_ga_cod_producto": np.char.add("COD", product.astype(str)).astype(object),
+            "desc_categoria_producto": category,
+            "desc_categoria_prod_principal": category,
+        }
+    )
+
+
+def write_csv(path: Path, rows: int, **kwargs) -> Path:
+    """
+    Write a synthetic dataset to ``path``.
+
+    Args:
+        path: Destination CSV path
+        rows: Number of rows to generate
+        **kwargs: Extra arguments for ``generate_frame``
+
+    Returns:
+        The written path
+    """
+    generate_frame(rows, **kwargs).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    write_csv(args.path, args.rows)
@@ -0,0 +1,125 @@
+"""Unit tests for group-by aggregation."""
+
+import numpy as np
+import pandas as pd
+
+from app.repositories.aggregation import aggregate_rows, top_products
+
+
+def make_frame():
+    """Build a small typed frame."""
+    return pd.DataFrame(
+        {
+            "desc_ga_marca_producto": pd.Series(
+                ["STANLEY", "DEWALT", None, "STANLEY"], dtype="category"
+            ),
+            "id_cli_cliente": pd.Series([8, 8, 10, 8], dtype="Int64"),
+            "fc_agregado_carrito_cant": pd.Series([1, 2, None, 4], dtype="Int64"),
+            "fc_ingreso_producto_monto": pd.Series([1.5, None, 2.0, 3.0], dtype="Float64"),
+        }
+    )
+
+
+class TestAggregateRows:
+    """Test cases for aggregate_rows."""
+
+    def test_group_by_dimensions(self):
+        """Test groups are sorted by their keys with missing keys last."""
+        groups = aggregate_rows(
+            make_frame(),
+            None,
+            ["brand", "client"],
+            [("fc_agregado_carrito_cant", "sum"), ("fc_ingreso_producto_monto", "avg")],
+        )
+
+        assert [(group.keys, group.values, group.count) for group in groups] == [
+            (["DEWALT", "8"], [2.0, None], 1),
+            (["STANLEY", "8"], [5.0, 2.25], 2),
+            ([None, "10"], [0.0, 2.0], 1),
+        ]
+
+    def test_count_min_max_on_positions(self):
+        """Test only the given rows are aggregated and count skips missing values."""
+        groups = aggregate_rows(
+            make_frame(),
+            np.array([1, 2, 3]),
+            ["client"],
+            [
+                ("fc_agregado_carrito_cant", "count"),
+                ("fc_agregado_carrito_cant", "min"),
+                ("fc_agregado_carrito_cant", "max"),
+            ],
+        )
+
+        assert [(group.keys, group.values, group.count) for group in groups] == [
+            (["8"], [2.0, 2.0, 4.0], 2),
+            (["10"], [0.0, None, None], 1),
+        ]
+
+    def test_without_group_by(self):
+        """Test all rows form a single group, even when nothing matches."""
+        metrics = [("fc_ingreso_producto_monto", "sum")]
+
+        (group,) = aggregate_rows(make_frame(), None, [], metrics)
+        (empty,) = aggregate_rows(make_frame(), np.array([], dtype=np.int64), [], metrics)
+
+        assert (group.keys, group.values, group.count) == ([], [6.5], 4)
+        assert empty.count == 0
+
+    def test_no_matching_rows(self):
+        """Test grouping an empty match set returns no groups."""
+        groups = aggregate_rows(make_frame(), np.array([], dtype=np.int64), ["brand"], [])
+
+        assert groups == []
+
+
+class TestTopProducts:
+    """Test cases for top_products."""
+
+    def setup_method(self):
+        """Build a small typed frame with several rows per SKU."""
+        self.df = pd.DataFrame(
+            {
+                "desc_ga_sku_producto": pd.Series(
+                    ["A", "B", "A", "C", None, "D", "B"], dtype="category"
+                ),
+                "desc_ga_nombre_producto_1": pd.Series(
+                    ["TERMO", "TALADRO", "TERMO", "SIERRA", "X", "MECHA", "TALADRO"],
+                    dtype="category",
+                ),
+                "desc_ga_marca_producto": pd.Series(
+                    ["STANLEY", "DEWALT", "STANLEY", "BOSCH", None, "BOSCH", "DEWALT"],
+                    dtype="category",
+                ),
+                "fc_ingreso_producto_monto": pd.Series(
+                    [10.0, 4.0, 5.0, 9.0, 100.0, None, 5.0], dtype="Float64"
+                ),
+            }
+        )
+
+    def test_ranks_skus_by_total(self):
+        """Test SKUs are ranked by their total, ties in order of first appearance."""
+        products = top_products(self.df, None, "fc_ingreso_producto_monto", 3)
+
+        assert [(p.sku, p.value, p.rows) for p in products] == [
+            ("A", 15.0, 2),
+            ("B", 9.0, 2),
+            ("C", 9.0, 1),
+        ]
+        assert (products[0].name, products[0].brand) == ("TERMO", "STANLEY")
+
+    def test_ranks_only_given_positions(self):
+        """Test only the matching rows are ranked and n may exceed the SKUs."""
+        products = top_products(self.df, np.array([1, 3, 5]), "fc_ingreso_producto_monto", 10)
+
+        assert [(p.sku, p.value, p.name) for p in products] == [
+            ("C", 9.0, "SIERRA"),
+            ("B", 4.0, "TALADRO"),
+            ("D", 0.0, "MECHA"),
+        ]
+
+    def test_no_matching_rows(self):
+        """Test an empty row set ranks nothing."""
+        positions = np.array([], dtype=np.int64)
+
+        assert top_products(self.df, positions, "fc_ingreso_producto_monto", 5) == []
@@ -1,7 +1,15 @@
 """Integration tests for API endpoints."""
 
+import hashlib
+import json
+from unittest.mock import Mock, patch
+
 from fastapi import status
 
+from app.controllers.products.persisted_queries import persisted_query_store
+from app.core.executor import ExecutorBusyError
+from app.models.domain.products import AggregateGroup, TopProduct
+
 
 class TestHealthEndpoint:
     """Test cases for health check endpoint."""
@@ -15,6 +23,29 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert "services" in data
 
+    def test_ready_reports_warmup_state(self, client):
+        """Test readiness endpoint is 503 until the dataset warm-up finishes."""
+        with patch("app.main.dataset_warmup.status") as mock_status:
+            mock_status.return_value = {"ready": False, "state": "warming"}
+            response = client.get("/ready")
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.json()["state"] == "warming"
+
+            mock_status.return_value = {"ready": True, "state": "ready"}
+            response = client.get("/ready")
+            assert response.status_code == status.HTTP_200_OK
+
+
+class TestDocsEndpoint:
+    """Test cases for the documentation endpoints."""
+
+    def test_openapi_precompressed(self, client):
+        """Test the OpenAPI document is served precompressed."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "/export/products" in response.json()["paths"]
+
 
 class TestAuthEndpoint:
     """Test cases for authentication endpoint."""
@@ -291,3 +322,401 @@ class TestGraphQLEndpoint:
         data = response.json()
         assert "data" in data
         assert "searchProducts" in data["data"]
+
+    def test_graphql_search_products_projection(self, client, auth_headers):
+        """Test that only the selected fields are requested from the service."""
+        with patch(
+            "app.controllers.products.resolvers.products_service.search_product_columns",
+            return_value={"desc_ga_marca_producto": ["STANLEY"], "SASASA": ["A"]},
+        ) as mock_search:
+            response = client.post(
+                "/graphql",
+                headers=auth_headers,
+                json={
+                    "query": """
+                        fragment Names on ProductDataType { sasasa }
+                        query {
+                            searchProducts(filters: { limit: 1 }) {
+                                brand: descGaMarcaProducto
+                                ...Names
+                                __typename
+                            }
+                        }
+                    """
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_search.call_args.kwargs["columns"] == ["SASASA", "desc_ga_marca_producto"]
+        assert response.json()["data"]["searchProducts"] == [
+            {"brand": "STANLEY", "sasasa": "A", "__typename": "ProductDataType"}
+        ]
+
+    def test_graphql_search_products_order_by(self, client, auth_headers):
+        """Test orderBy is passed to the search as sort field and direction."""
+        with patch(
+            "app.controllers.products.resolvers.products_service.search_product_columns",
+            return_value={"fc_ingreso_producto_monto": [9.5, 3.0]},
+        ) as mock_search:
+            response = client.post(
+                "/graphql",
+                headers=auth_headers,
+                json={
+                    "query": """
+                        query {
+                            searchProducts(
+                                filters: { limit: 2 }
+                                orderBy: { field: REVENUE, direction: DESC }
+                            ) {
+                                fcIngresoProductoMonto
+                            }
+                        }
+                    """
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        model_filter = mock_search.call_args.args[0]
+        assert (model_filter.order_by, model_filter.descending) == ("revenue", True)
+        assert response.json()["data"]["searchProducts"] == [
+            {"fcIngresoProductoMonto": 9.5},
+            {"fcIngresoProductoMonto": 3.0},
+        ]
+
+    def test_graphql_aggregate_query(self, client, auth_headers):
+        """Test the aggregate query maps enums to dataset names and labels the groups."""
+        with patch(
+            "app.controllers.products.resolvers.products_service.aggregate_products",
+            return_value=[AggregateGroup(keys=["STANLEY"], values=[12.0], count=3)],
+        ) as mock_aggregate:
+            response = client.post(
+                "/graphql",
+                headers=auth_headers,
+                json={
+                    "query": """
+                        query {
+                            aggregate(
+                                filters: { dateFrom: "20240101" }
+                                groupBy: [BRAND]
+                                metrics: [{ column: FC_AGREGADO_CARRITO_CANT, function: SUM }]
+                            ) {
+                                keys { dimension value }
+                                metrics { function value }
+                                count
+                            }
+                        }
+                    """
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_aggregate.call_args.kwargs == {
+            "group_by": ["brand"],
+            "metrics": [("fc_agregado_carrito_cant", "sum")],
+        }
+        assert response.json()["data"]["aggregate"] == [
+            {
+                "keys": [{"dimension": "BRAND", "value": "STANLEY"}],
+                "metrics": [{"function": "SUM", "value": 12.0}],
+                "count": 3,
+            }
+        ]
+
+    def test_graphql_top_products_query(self, client, auth_headers):
+        """Test the topProducts query passes the metric and size to the service."""
+        with patch(
+            "app.controllers.products.resolvers.products_service.get_top_products",
+            return_value=[TopProduct(sku="A", name="TERMO", value=15.0, rows=2)],
+        ) as mock_top:
+            response = client.post(
+                "/graphql",
+                headers=auth_headers,
+                json={
+                    "query": """
+                        query {
+                            topProducts(
+                                filters: { brand: "STANLEY" }
+                                metric: FC_AGREGADO_CARRITO_CANT
+                                n: 20
+                            ) {
+                                sku
+                                name
+                                value
+                            }
+                        }
+                    """
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_top.call_args.args[1:] == ("fc_agregado_carrito_cant", 20)
+        assert response.json()["data"]["topProducts"] == [
+            {"sku": "A", "name": "TERMO", "value": 15.0}
+        ]
+
+    def test_graphql_get_conditional(self, client, auth_headers):
+        """Test GET queries carry an ETag and a current one skips the resolvers."""
+        with (
+            patch(
+                "app.controllers.products.router.products_service.get_dataset_version",
+                return_value="v1",
+            ),
+            patch(
+                "app.controllers.products.resolvers.products_service.get_available_brands",
+                return_value=("BOSCH", "STANLEY"),
+            ) as mock_brands,
+        ):
+            first = client.get("/graphql", params={"query": "{ brands }"}, headers=auth_headers)
+            etag = first.headers["etag"]
+            second = client.get(
+                "/graphql",
+                params={"query": "query {\n  brands\n}"},
+                headers={**auth_headers, "If-None-Match": etag},
+            )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json() == {"data": {"brands": ["BOSCH", "STANLEY"]}}
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second.headers["etag"] == etag
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert second.headers["cache-control"] == "private, no-cache"
+        mock_brands.assert_called_once_with()
+
+    def test_graphql_get_etag_follows_dataset_version(self, client, auth_headers):
+        """Test the ETag changes with the dataset version and the variables."""
+        query = "query($n: Int!) { topProducts(n: $n) { sku } }"
+
+        def etag(version, variables):
+            with (
+                patch(
+                    "app.controllers.products.router.products_service.get_dataset_version",
+                    return_value=version,
+                ),
+                patch(
+                    "app.controllers.products.resolvers.products_service.get_top_products",
+                    return_value=[],
+                ),
+            ):
+                response = client.get(
+                    "/graphql",
+                    params={"query": query, "variables": variables},
+                    headers=auth_headers,
+                )
+            return response.headers["etag"]
+
+        assert etag("v1", '{"n": 5}') == etag("v1", '{ "n":5 }')
+        assert etag("v1", '{"n": 5}') != etag("v2", '{"n": 5}')
+        assert etag("v1", '{"n": 5}') != etag("v1", '{"n": 6}')
+
+    def test_graphql_untagged_responses(self, client, auth_headers):
+        """Test POSTs, errors and non-dataset fields get no ETag."""
+        with patch(
+            "app.controllers.products.router.products_service.get_dataset_version",
+            return_value="v1",
+        ):
+            post = client.post(
+                "/graphql", json={"query": "{ cacheStats { hits } }"}, headers=auth_headers
+            )
+            cache_stats = client.get(
+                "/graphql", params={"query": "{ cacheStats { hits } }"}, headers=auth_headers
+            )
+            invalid = client.get("/graphql", params={"query": "{ nope }"}, headers=auth_headers)
+
+        assert "etag" not in post.headers
+        assert "etag" not in cache_stats.headers
+        assert "etag" not in invalid.headers
+
+    def test_graphql_persisted_query(self, client, auth_headers):
+        """Test automatic persisted queries are registered by POST and run by hash via GET."""
+        query = "{ brands }"
+        sha256_hash = hashlib.sha256(query.encode()).hexdigest()
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": sha256_hash}}
+        with (
+            patch(
+                "app.controllers.products.router.products_service.get_dataset_version",
+                return_value="v1",
+            ),
+            patch(
+                "app.controllers.products.resolvers.products_service.get_available_brands",
+                return_value=("BOSCH",),
+            ),
+        ):
+            missing = client.post("/graphql", json={"extensions": extensions}, headers=auth_headers)
+            registered = client.post(
+                "/graphql", json={"query": query, "extensions": extensions}, headers=auth_headers
+            )
+            by_hash = client.get(
+                "/graphql",
+                params={"extensions": json.dumps(extensions)},
+                headers={**auth_headers, "Accept": "*/*"},
+            )
+            not_modified = client.get(
+                "/graphql",
+                params={"extensions": json.dumps(extensions)},
+                headers={**auth_headers, "If-None-Match": by_hash.headers["etag"]},
+            )
+        persisted_query_store.clear()
+
+        assert missing.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+        assert registered.json() == {"data": {"brands": ["BOSCH"]}}
+        assert by_hash.json() == {"data": {"brands": ["BOSCH"]}}
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        for response in (by_hash, not_modified):
+            assert response.headers["cache-control"] == "public, max-age=0, must-revalidate"
+            assert response.headers["vary"] == "Authorization"
+
+
+class TestAdminEndpoint:
+    """Test cases for the administration endpoints."""
+
+    def test_reload_requires_authentication(self, client):
+        """Test reloading the dataset requires a token."""
+        response = client.post("/admin/reload")
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+    def test_reload(self, client, auth_headers):
+        """Test reloading the dataset reports the active version."""
+        result = {"reloaded": True, "dataset_version": "abc", "total_records": 3}
+        with patch(
+            "app.core.reloader.dataset_reloader._reload", return_value=result
+        ) as mock_reload:
+            response = client.post("/admin/reload?force=true", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["dataset_version"] == "abc"
+        mock_reload.assert_called_once_with(True)
+
+    def test_reload_failure(self, client, auth_headers):
+        """Test a failed reload is reported as a server error."""
+        with patch(
+            "app.core.reloader.dataset_reloader._reload",
+            side_effect=IOError("Error loading CSV file"),
+        ):
+            response = client.post("/admin/reload", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    def test_append_rejects_paths_outside_delta_dir(self, client, auth_headers):
+        """Test delta files are only read from the delta directory."""
+        response = client.post("/admin/append?file=../data.csv", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_append(self, client, auth_headers, tmp_path):
+        """Test appending a delta CSV from the delta directory."""
+        (tmp_path / "day.csv").write_text("id_cli_cliente\n8\n")
+        result = {"appended_rows": 1, "dataset_version": "abc", "total_records": 4}
+        with patch("app.controllers.admin.router.settings.DATASET_DELTA_DIR", str(tmp_path)):
+            with patch(
+                "app.controllers.admin.router.products_service.append_dataset",
+                return_value=result,
+            ) as mock_append:
+                response = client.post("/admin/append?file=day.csv", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["appended_rows"] == 1
+        mock_append.assert_called_once_with((tmp_path / "day.csv").resolve())
+
+
+class TestExportEndpoint:
+    """Test cases for the export endpoint."""
+
+    def test_export_requires_authentication(self, client):
+        """Test exporting requires a token."""
+        response = client.get("/export/products")
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+    def test_export_unknown_format(self, client, auth_headers):
+        """Test an unknown format is rejected before streaming."""
+        response = client.get("/export/products?format=xml", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["error"] == "invalid_request"
+
+    def test_export_invalid_date_range(self, client, auth_headers):
+        """Test a date bound that is not YYYYMMDD is rejected before streaming."""
+        response = client.get("/export/products?date_from=2024-01-01", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["error"] == "invalid_request"
+
+    def test_export_brands_precompressed(self, client, auth_headers):
+        """Test the brand list is compressed once per dataset version."""
+        brands = tuple(f"BRAND {i}" for i in range(200))
+        with patch(
+            "app.controllers.export.router.products_service.get_dimension_values",
+            return_value=("abc", brands),
+        ):
+            first = client.get("/export/brands", headers={**auth_headers, "Accept-Encoding": "br"})
+            second = client.get("/export/brands", headers=auth_headers)
+
+        assert first.headers["content-encoding"] == "br"
+        assert first.headers["x-dataset-version"] == "abc"
+        assert first.json() == list(brands)
+        assert second.json() == list(brands)
+
+    def test_export_brands_not_modified(self, client, auth_headers):
+        """Test a current If-None-Match is answered with an empty 304."""
+        with patch(
+            "app.controllers.export.router.products_service.get_dimension_values",
+            return_value=("abc", ("BOSCH",)),
+        ):
+            etag = client.get("/export/brands", headers=auth_headers).headers["etag"]
+            response = client.get("/export/brands", headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_export_streams_chunks(self, client, auth_headers):
+        """Test the export streams the serialised chunks with the dataset version."""
+        with patch(
+            "app.controllers.export.router.products_service.export_products",
+            return_value=("abc", iter([b"sku\n", b"A\n"])),
+        ) as mock_export:
+            response = client.get(
+                "/export/products?format=csv&brand=stanley&columns=sku,%20brand",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"sku\nA\n"
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["x-dataset-version"] == "abc"
+        assert "products.csv" in response.headers["content-disposition"]
+        filter_params, export_format, columns = mock_export.call_args.args
+        assert filter_params.brand == "stanley"
+        assert export_format == "csv"
+        assert columns == ["sku", "brand"]
+
+    def test_export_holds_executor_slot(self, client, auth_headers):
+        """Test a streamed export takes a worker pool slot and is rejected when full."""
+        with (
+            patch(
+                "app.controllers.export.router.products_service.export_products",
+                return_value=("abc", iter([b"sku\n"])),
+            ),
+            patch(
+                "app.controllers.export.router.dataset_executor.iterate",
+                side_effect=ExecutorBusyError("Server is busy, retry the request later"),
+            ),
+        ):
+            response = client.get("/export/products?format=csv", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["detail"]["error"] == "busy"
+
+    def test_export_not_modified(self, client, auth_headers):
+        """Test a current If-None-Match skips streaming the export."""
+        url = "/export/products?format=csv&brand=stanley"
+        chunks = Mock(side_effect=AssertionError("export streamed"))
+        with patch(
+            "app.controllers.export.router.products_service.export_products",
+            side_effect=[("abc", iter([b"sku\n"])), ("abc", chunks)],
+        ):
+            etag = client.get(url, headers=auth_headers).headers["etag"]
+            response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
@@ -0,0 +1,155 @@
+"""Unit tests for response compression."""
+
+from unittest.mock import Mock
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    CompressionMiddleware,
+    PrecompressedPayloads,
+    compress,
+    negotiate_encoding,
+)
+
+BODY = b"STANLEY,CAMPING,K1010148001\n" * 200
+
+
+def make_client(minimum_size=1024):
+    """Build a client of an app with full, small and streamed responses."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/full")
+    async def full():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(b"ok")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([BODY[:1000], BODY[1000:]]), media_type="text/csv")
+
+    @app.get("/encoded")
+    async def encoded():
+        return PlainTextResponse(compress(BODY, "gzip", 9), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "br"),
+            ("gzip, br, zstd", "zstd"),
+            ("gzip;q=1.0, br;q=0.5", "gzip"),
+            ("br;q=0, *", "zstd"),
+            ("*;q=0.1, gzip;q=0", "zstd"),
+            ("GZIP;q=bad, gzip", "gzip"),
+        ],
+    )
+    def test_negotiate(self, accept_encoding, expected):
+        """Test the highest quality wins and ties go to the server preference."""
+        assert negotiate_encoding(accept_encoding) == expected
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware."""
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    def test_compresses_full_body(self, encoding):
+        """Test complete bodies are compressed with the negotiated encoding."""
+        response = make_client().get("/full", headers={"Accept-Encoding": encoding})
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(BODY) / 10
+        if encoding == "zstd":
+            # httpx decodes gzip and br, but not zstd
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            assert decompressor.decompress(response.content) == BODY
+        else:
+            assert response.content == BODY
+
+    def test_small_body_uncompressed(self):
+        """Test bodies below the minimum size are sent as is."""
+        response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == b"ok"
+
+    def test_not_accepted(self):
+        """Test responses are not compressed for clients not accepting an encoding."""
+        response = make_client().get("/full", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == BODY
+
+    def test_streamed_body(self):
+        """Test streamed bodies are compressed chunk by chunk."""
+        response = make_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.content == BODY
+
+    def test_already_encoded(self):
+        """Test responses that already carry a Content-Encoding are left untouched."""
+        response = make_client().get("/encoded", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == BODY
+
+
+class TestPrecompressedPayloads:
+    """Test cases for PrecompressedPayloads."""
+
+    def test_build_and_compress_once(self):
+        """Test payloads are built once per key and compressed once per encoding."""
+        payloads = PrecompressedPayloads()
+        build = Mock(return_value=BODY)
+
+        first, encoding = payloads.get("brands", "gzip, br", build)
+        second, _ = payloads.get("brands", "br", build)
+        plain, identity = payloads.get("brands", "", build)
+
+        assert encoding == "br"
+        assert first is second
+        assert brotli.decompress(first) == BODY
+        assert (plain, identity) == (BODY, "identity")
+        build.assert_called_once_with()
+
+    def test_minimum_size(self):
+        """Test payloads below the minimum size are not compressed."""
+        payloads = PrecompressedPayloads()
+
+        assert payloads.get("small", "gzip", lambda: b"[]", minimum_size=10) == (
+            b"[]",
+            "identity",
+        )
+
+    def test_evicts_least_recently_used(self):
+        """Test keys beyond the capacity evict the least recently used one."""
+        payloads = PrecompressedPayloads(max_entries=2)
+        payloads.get("v1", "", lambda: b"1")
+        payloads.get("v2", "", lambda: b"2")
+        payloads.get("v1", "", lambda: b"1")
+        payloads.get("v3", "", lambda: b"3")
+        build = Mock(return_value=b"2")
+
+        payloads.get("v1", "", Mock(side_effect=AssertionError("v1 was evicted")))
+        payloads.get("v2", "", build)
+
+        build.assert_called_once_with()
@@ -0,0 +1,73 @@
+"""Unit tests for ETags and GraphQL request normalisation."""
+
+import pytest
+
+from app.controllers.products.router import normalize_request
+from app.core.etag import etag_headers, etag_matches, make_etag
+
+
+class TestEtag:
+    """Test cases for the ETag helpers."""
+
+    def test_make_etag(self):
+        """Test ETags are weak and change with the version and the request."""
+        etag = make_etag("v1", "/export/brands")
+
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert etag == make_etag("v1", "/export/brands")
+        assert etag != make_etag("v2", "/export/brands")
+        assert etag != make_etag("v1", "/export/categories")
+
+    @pytest.mark.parametrize(
+        "if_none_match, expected",
+        [
+            (None, False),
+            ("", False),
+            ('W/"abc"', True),
+            ('"abc"', True),
+            ('"other", W/"abc"', True),
+            ('"other"', False),
+            ("*", True),
+        ],
+    )
+    def test_etag_matches(self, if_none_match, expected):
+        """Test If-None-Match uses weak comparison and accepts lists and *."""
+        assert etag_matches(if_none_match, 'W/"abc"') is expected
+
+    def test_etag_headers(self):
+        """Test only shared responses are public, and they vary on the token."""
+        private = etag_headers('W/"abc"')
+        shared = etag_headers('W/"abc"', shared=True)
+
+        assert private == {"ETag": 'W/"abc"', "Cache-Control": "private, no-cache"}
+        assert shared["ETag"] == 'W/"abc"'
+        assert shared["Cache-Control"] == "public, max-age=0, must-revalidate"
+        assert shared["Vary"] == "Authorization"
+
+
+class TestNormalizeRequest:
+    """Test cases for GraphQL request normalisation."""
+
+    def test_formatting_and_variable_order_ignored(self):
+        """Test equivalent requests share a key."""
+        assert normalize_request("{ brands }") == normalize_request("query {\n  brands # all\n}")
+        assert normalize_request("{ brands }", '{"a": 1, "b": 2}') == normalize_request(
+            "{ brands }", '{"b": 2, "a": 1}'
+        )
+        assert normalize_request("{ brands }") != normalize_request("{ categories }")
+        assert normalize_request("{ brands }", operation_name="A") != normalize_request(
+            "{ brands }"
+        )
+
+    @pytest.mark.parametrize(
+        "query, variables",
+        [
+            ("{ brands", None),
+            ("{ brands }", "{not json"),
+            ("{ brands cacheStats { hits } }", None),
+            ("{ ...F } fragment F on Query { cacheStats { hits } }", None),
+        ],
+    )
+    def test_untagged_requests(self, query, variables):
+        """Test invalid requests and non-dataset fields get no key."""
+        assert normalize_request(query, variables) is None
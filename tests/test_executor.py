@@ -0,0 +1,119 @@
+"""Unit tests for the blocking dataset executor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import BlockingExecutor, ExecutorBusyError
+
+
+class TestBlockingExecutor:
+    """Test cases for BlockingExecutor."""
+
+    def setup_method(self):
+        """Set up a small executor."""
+        self.executor = BlockingExecutor(max_workers=1, max_queue=1)
+
+    def teardown_method(self):
+        """Stop the executor threads."""
+        self.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_off_the_event_loop(self):
+        """Test callables run on a pool thread and return their result."""
+        loop_thread = threading.get_ident()
+
+        thread, value = await self.executor.run(
+            lambda x, y=0: (threading.get_ident(), x + y), 1, y=2
+        )
+
+        assert value == 3
+        assert thread != loop_thread
+        assert self.executor.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        """Test calls beyond workers + queue are rejected without waiting."""
+        release = threading.Event()
+        running = [asyncio.ensure_future(self.executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorBusyError):
+            await self.executor.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*running)
+        stats = self.executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_release_slot(self):
+        """Test exceptions reach the caller and free the admission slot."""
+
+        def fail():
+            raise IOError("Error loading CSV file")
+
+        with pytest.raises(IOError):
+            await self.executor.run(fail)
+
+        assert self.executor.stats()["in_flight"] == 0
+        assert await self.executor.run(lambda: 1) == 1
+
+    @pytest.mark.asyncio
+    async def test_restarts_after_shutdown(self):
+        """Test the pool is recreated on use after a shutdown."""
+        await self.executor.run(lambda: None)
+        self.executor.shutdown()
+
+        assert await self.executor.run(lambda: 2) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_holds_slot_until_it_ends(self):
+        """Test a cancelled awaiter does not free the slot of a call still running."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def work():
+            started.set()
+            release.wait()
+
+        task = asyncio.ensure_future(self.executor.run(work))
+        try:
+            await asyncio.to_thread(started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert self.executor.stats()["in_flight"] == 1
+        finally:
+            release.set()
+        await asyncio.to_thread(self.executor.shutdown)
+        assert self.executor.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_iterate_holds_one_slot_until_exhausted(self):
+        """Test a blocking iterator is consumed on the pool within one slot."""
+        loop_thread = threading.get_ident()
+        stream = self.executor.iterate(threading.get_ident() for _ in range(3))
+        assert self.executor.stats()["in_flight"] == 1
+
+        threads = [thread async for thread in stream]
+
+        assert len(threads) == 3
+        assert loop_thread not in threads
+        assert self.executor.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_iterate_rejected_when_full(self):
+        """Test admission of an iterator is decided when it is created."""
+        streams = [self.executor.iterate(iter([1])) for _ in range(2)]
+
+        with pytest.raises(ExecutorBusyError):
+            self.executor.iterate(iter([1]))
+
+        for stream in streams:
+            await stream.aclose()
+        assert self.executor.stats()["in_flight"] == 0
@@ -0,0 +1,84 @@
+"""Unit tests for the streaming export serialisers."""
+
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+
+from app.services.exporters import arrow_chunks, csv_chunks, ndjson_chunks
+
+
+def make_chunks():
+    """Build two typed chunks of an export."""
+    first = pd.DataFrame(
+        {
+            "desc_ga_sku_producto": pd.Series(["A", None], dtype="category"),
+            "fc_agregado_carrito_cant": pd.Series([1, None], dtype="Int64"),
+            "fc_ingreso_producto_monto": pd.Series([0.1, 2.5], dtype="Float64"),
+        }
+    )
+    second = pd.DataFrame(
+        {
+            "desc_ga_sku_producto": pd.Series(["ÑANDÚ"], dtype="category"),
+            "fc_agregado_carrito_cant": pd.Series([3], dtype="Int64"),
+            "fc_ingreso_producto_monto": pd.Series([None], dtype="Float64"),
+        }
+    )
+    return [first, second]
+
+
+class TestExporters:
+    """Test cases for the export serialisers."""
+
+    def test_ndjson(self):
+        """Test one JSON object per row with native values and nulls."""
+        chunks = list(ndjson_chunks(make_chunks()))
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+
+        assert len(chunks) == 2
+        assert rows == [
+            {
+                "desc_ga_sku_producto": "A",
+                "fc_agregado_carrito_cant": 1,
+                "fc_ingreso_producto_monto": 0.1,
+            },
+            {
+                "desc_ga_sku_producto": None,
+                "fc_agregado_carrito_cant": None,
+                "fc_ingreso_producto_monto": 2.5,
+            },
+            {
+                "desc_ga_sku_producto": "ÑANDÚ",
+                "fc_agregado_carrito_cant": 3,
+                "fc_ingreso_producto_monto": None,
+            },
+        ]
+
+    def test_ndjson_empty(self):
+        """Test an empty export produces no bytes."""
+        assert b"".join(ndjson_chunks([make_chunks()[0].iloc[:0]])) == b""
+
+    def test_csv_single_header(self):
+        """Test the header is written once, before the first chunk."""
+        text = b"".join(csv_chunks(make_chunks())).decode()
+
+        assert text.splitlines() == [
+            "desc_ga_sku_producto,fc_agregado_carrito_cant,fc_ingreso_producto_monto",
+            "A,1,0.1",
+            ",,2.5",
+            "ÑANDÚ,3,",
+        ]
+
+    def test_arrow_round_trip(self):
+        """Test the Arrow IPC stream holds one record batch per chunk."""
+        data = b"".join(arrow_chunks(make_chunks()))
+
+        reader = pa.ipc.open_stream(io.BytesIO(data))
+        batches = list(reader)
+        rows = [row for batch in batches for row in batch.to_pylist()]
+
+        assert len(batches) == 2
+        assert [row["desc_ga_sku_producto"] for row in rows] == ["A", None, "ÑANDÚ"]
+        assert [row["fc_agregado_carrito_cant"] for row in rows] == [1, None, 3]
+        assert [row["fc_ingreso_producto_monto"] for row in rows] == [0.1, 2.5, None]
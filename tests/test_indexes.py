@@ -0,0 +1,170 @@
+"""Unit tests for repository secondary indexes."""
+
+import numpy as np
+import pandas as pd
+
+from app.repositories.indexes import (
+    ColumnIndex,
+    DatePartitions,
+    SubstringIndex,
+    intersect_positions,
+)
+
+
+class TestColumnIndex:
+    """Test cases for ColumnIndex."""
+
+    def test_lookup_categorical(self):
+        """Test lookups on a categorical column return ascending positions."""
+        index = ColumnIndex(pd.Series(["b", "a", "b", None, "b"], dtype="category"))
+
+        assert index.lookup("b").tolist() == [0, 2, 4]
+        assert index.lookup("a").tolist() == [1]
+        assert index.count("b") == 3
+        assert len(index) == 2
+
+    def test_lookup_nullable_integer(self):
+        """Test lookups on a nullable integer column."""
+        index = ColumnIndex(pd.Series([8, None, 10, 8], dtype="Int64"))
+
+        assert index.lookup(8).tolist() == [0, 3]
+        assert index.lookup(10).tolist() == [2]
+
+    def test_lookup_missing_value(self):
+        """Test looking up a value that does not occur."""
+        index = ColumnIndex(pd.Series(["a", "b"], dtype="category"))
+
+        assert len(index.lookup("zzz")) == 0
+        assert index.count("zzz") == 0
+
+    def test_unused_categories_not_indexed(self):
+        """Test that categories without rows are not reported as distinct values."""
+        series = pd.Series(pd.Categorical(["a"], categories=["a", "b"]))
+
+        assert len(ColumnIndex(series)) == 1
+
+    def test_extend_matches_full_build(self):
+        """Test extending with appended rows equals indexing all rows at once."""
+        values = ["b", "a", None, "b", "c", "a", None, "d", "b"]
+        full = ColumnIndex(pd.Series(values, dtype="category"))
+
+        extended = ColumnIndex(pd.Series(values[:5], dtype="category")).extend(
+            pd.Series(values[5:], dtype="category"), offset=5
+        )
+
+        for value in ["a", "b", "c", "d", "zzz"]:
+            assert extended.lookup(value).tolist() == full.lookup(value).tolist()
+        assert sorted(extended.values()) == ["a", "b", "c", "d"]
+        assert not extended.lookup("b").flags.writeable
+
+    def test_extend_leaves_original_unchanged(self):
+        """Test extending returns a new index."""
+        index = ColumnIndex(pd.Series([8, 10], dtype="Int64"))
+
+        extended = index.extend(pd.Series([8], dtype="Int64"), offset=2)
+
+        assert index.lookup(8).tolist() == [0]
+        assert extended.lookup(8).tolist() == [0, 2]
+
+    def test_lookup_is_read_only(self):
+        """Test that returned positions cannot corrupt the index."""
+        index = ColumnIndex(pd.Series(["a", "b", "a"], dtype="category"))
+
+        assert not index.lookup("a").flags.writeable
+
+    def test_intersect_positions(self):
+        """Test intersecting row-position arrays."""
+        right = np.array([1, 3, 5])
+
+        assert intersect_positions(None, right) is right
+        assert intersect_positions(np.array([0, 3, 5, 7]), right).tolist() == [3, 5]
+
+
+class TestDatePartitions:
+    """Test cases for DatePartitions."""
+
+    def test_partitions_in_date_order(self):
+        """Test partitions are kept in date order whatever the category order."""
+        series = pd.Series(["20240130", "20240129", None, "20240131", "20240129"])
+        series = series.astype(pd.CategoricalDtype(["20240131", "20240130", "20240129"]))
+
+        partitions = DatePartitions(series)
+
+        assert partitions.partitions() == [("20240129", 2), ("20240130", 1), ("20240131", 1)]
+        assert partitions.lookup("20240129").tolist() == [1, 4]
+        assert not partitions.ordered
+
+    def test_match_range(self):
+        """Test date ranges return ascending positions without scanning rows."""
+        series = pd.Series(["20240130", "20240129", "20240131", "20240129"], dtype="category")
+        partitions = DatePartitions(series)
+
+        assert partitions.match_range("20240129", "20240130").tolist() == [0, 1, 3]
+        assert partitions.match_range("20240130", None).tolist() == [0, 2]
+        assert partitions.match_range(None, "20240100").tolist() == []
+        assert partitions.count_range("20240129", "20240129") == 2
+
+    def test_ordered_rows(self):
+        """Test date-ordered rows make every partition a contiguous row range."""
+        partitions = DatePartitions(pd.Series(["a", "a", "b", "c"], dtype="category"))
+
+        assert partitions.ordered
+        assert partitions.match_range("b", None).tolist() == [2, 3]
+
+    def test_missing_dates_are_not_a_row_range(self):
+        """Test rows with a missing date break the contiguous row ranges."""
+        partitions = DatePartitions(pd.Series(["a", None, "a", "b"], dtype="category"))
+
+        assert not partitions.ordered
+        assert partitions.match_range("a", "a").tolist() == [0, 2]
+
+    def test_extend(self):
+        """Test appended rows extend the partitions in date order."""
+        partitions = DatePartitions(pd.Series(["20240129", "20240130"], dtype="category"))
+
+        extended = partitions.extend(pd.Series(["20240131", "20240128"], dtype="category"), 2)
+
+        assert isinstance(extended, DatePartitions)
+        assert [date for date, _ in extended.partitions()][0] == "20240128"
+        assert extended.match_range("20240128", "20240129").tolist() == [0, 3]
+
+
+class TestSubstringIndex:
+    """Test cases for SubstringIndex."""
+
+    def setup_method(self):
+        """Set up an index over a brand-like column."""
+        self.index = SubstringIndex(
+            pd.Series(["STANLEY", "DEWALT", "Stanley Black", None, "STANLEY"], dtype="category")
+        )
+
+    def test_match_case_insensitive(self):
+        """Test that matching ignores case and merges every matching value."""
+        assert self.index.match("stan").tolist() == [0, 2, 4]
+        assert self.index.match("WALT").tolist() == [1]
+
+    def test_match_no_result(self):
+        """Test a needle that matches no value."""
+        assert len(self.index.match("bosch")) == 0
+
+    def test_matching_values_and_count(self):
+        """Test resolving a needle against the distinct values."""
+        assert sorted(self.index.matching_values("stan")) == ["STANLEY", "Stanley Black"]
+        assert self.index.count("stan") == 3
+
+    def test_extend(self):
+        """Test extending a substring index with appended rows."""
+        index = SubstringIndex(pd.Series(["STANLEY", "DEWALT"], dtype="category"))
+
+        extended = index.extend(pd.Series(["Stanley Tools", "BOSCH"], dtype="category"), 2)
+
+        assert extended.match("stanley").tolist() == [0, 2]
+        assert extended.match("bosch").tolist() == [3]
+        assert index.match("stanley").tolist() == [0]
+
+    def test_match_is_cached_per_needle(self):
+        """Test that equivalent needles share one cached result."""
+        first = self.index.match("Stan")
+
+        assert self.index.match("STAN") is first
+        assert not first.flags.writeable
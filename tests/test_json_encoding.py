@@ -0,0 +1,66 @@
+"""Unit tests for the response JSON encoders."""
+
+import json
+
+import pytest
+
+from app.core.json_encoding import (
+    JSON_ENCODERS,
+    FastJSONResponse,
+    get_json_encoder,
+    orjson_dumps,
+    stdlib_dumps,
+)
+
+PAYLOAD = {
+    "data": {
+        "searchProducts": [
+            {
+                "desc_ga_sku_producto": "K1010148001",
+                "desc_ga_marca_producto": "BAÑO",
+                "fc_agregado_carrito_cant": 1,
+                "fc_ingreso_producto_monto": 0.1,
+                "id_cli_cliente": None,
+            }
+        ]
+    }
+}
+
+
+class TestJsonEncoding:
+    """Test cases for the JSON encoders."""
+
+    @pytest.mark.parametrize("name", sorted(JSON_ENCODERS))
+    def test_encoders_round_trip(self, name):
+        """Test every encoder produces compact UTF-8 JSON of the same value."""
+        encoded = JSON_ENCODERS[name](PAYLOAD)
+
+        assert json.loads(encoded) == PAYLOAD
+        assert "BAÑO".encode() in encoded
+        assert b", " not in encoded
+
+    def test_encoders_agree(self):
+        """Test orjson and the standard library produce the same bytes."""
+        assert orjson_dumps(PAYLOAD) == stdlib_dumps(PAYLOAD)
+
+    def test_get_json_encoder(self):
+        """Test encoders are selected by name and unknown names are rejected."""
+        assert get_json_encoder("json") is stdlib_dumps
+        assert get_json_encoder("orjson") is orjson_dumps
+        with pytest.raises(ValueError, match="msgpack"):
+            get_json_encoder("msgpack")
+
+    def test_get_json_encoder_without_orjson(self, monkeypatch):
+        """Test selecting orjson without it installed falls back to the standard library."""
+        monkeypatch.setattr("app.core.json_encoding.orjson", None)
+
+        assert get_json_encoder("orjson") is stdlib_dumps
+
+    def test_response_uses_configured_encoder(self, monkeypatch):
+        """Test the default response class renders with the configured encoder."""
+        monkeypatch.setattr("app.core.json_encoding.encode_json", lambda content: b"[1]")
+
+        response = FastJSONResponse({"ignored": True})
+
+        assert response.body == b"[1]"
+        assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,44 @@
+"""Unit tests for dataset metadata."""
+
+import pandas as pd
+
+from app.repositories.metadata import build_metadata, extend_metadata
+
+
+def make_frame(dates, brands, amounts):
+    """Build a small typed frame."""
+    return pd.DataFrame(
+        {
+            "id_tie_fecha_valor": pd.Series(dates, dtype="category"),
+            "desc_ga_marca_producto": pd.Series(brands, dtype="category"),
+            "desc_categoria_prod_principal": pd.Series(["CAMPING"] * len(dates), dtype="category"),
+            "fc_agregado_carrito_cant": pd.Series(amounts, dtype="Int64"),
+        }
+    )
+
+
+class TestMetadata:
+    """Test cases for dataset metadata."""
+
+    def test_build_metadata(self):
+        """Test the summary of a dataset."""
+        df = make_frame(["20240130", "20240129"], ["STANLEY", "No Aplica"], [1, None])
+
+        metadata = build_metadata(df, "v1", ["fc_agregado_carrito_cant", "fc_missing"])
+
+        assert metadata.total_records == 2
+        assert metadata.brands == ("STANLEY",)
+        assert metadata.categories_count == 1
+        assert (metadata.min_date, metadata.max_date) == ("20240129", "20240130")
+        assert metadata.column_totals == {"fc_agregado_carrito_cant": 1.0}
+
+    def test_extend_metadata_matches_full_build(self):
+        """Test extending with appended rows equals summarising all rows."""
+        first = make_frame(["20240129"], ["STANLEY"], [1])
+        delta = make_frame(["20240131", "20240128"], ["DEWALT", "STANLEY"], [2, 3])
+        columns = ["fc_agregado_carrito_cant"]
+
+        extended = extend_metadata(build_metadata(first, "v1", columns), delta, "v2", columns)
+        full = build_metadata(pd.concat([first, delta], ignore_index=True), "v2", columns)
+
+        assert extended == full
@@ -0,0 +1,121 @@
+"""Unit tests for automatic persisted queries."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.controllers.products.persisted_queries import (
+    PersistedQueryError,
+    PersistedQueryStore,
+    query_hash,
+)
+from app.controllers.products.router import schema
+
+QUERY = "{ brands categories }"
+
+
+def persisted(query=QUERY, version=1):
+    """Request extensions referring to a query by hash."""
+    return {"persistedQuery": {"version": version, "sha256Hash": query_hash(query)}}
+
+
+class TestPersistedQueryStore:
+    """Test cases for PersistedQueryStore."""
+
+    def setup_method(self):
+        """Create an empty store validating against the application schema."""
+        self.store = PersistedQueryStore(schema=schema._schema, max_entries=2)
+
+    def test_plain_requests_pass_through(self):
+        """Test requests without a persisted query extension are left as they are."""
+        assert self.store.resolve(QUERY, None) == QUERY
+        assert self.store.resolve(QUERY, {"tracing": True}) == QUERY
+        assert len(self.store) == 0
+
+    def test_register_then_resolve_by_hash(self):
+        """Test a query sent with its hash is stored and later resolved from the hash."""
+        with pytest.raises(PersistedQueryError) as error:
+            self.store.resolve(None, persisted())
+        assert error.value.code == "PERSISTED_QUERY_NOT_FOUND"
+
+        assert self.store.resolve(QUERY, persisted()) == QUERY
+        assert self.store.resolve(None, persisted()) == QUERY
+        # GET requests send the extensions as JSON text
+        assert self.store.resolve(None, json.dumps(persisted())) == QUERY
+
+        entry = self.store.get_by_query(QUERY)
+        assert entry.sha256_hash == query_hash(QUERY)
+        assert entry.printed == "{\n  brands\n  categories\n}"
+
+    @pytest.mark.parametrize(
+        "query, extensions, code",
+        [
+            (QUERY + " ", persisted(), "BAD_REQUEST"),
+            (QUERY, persisted(version=2), "PERSISTED_QUERY_NOT_SUPPORTED"),
+            (QUERY, {"persistedQuery": {"version": 1}}, "BAD_REQUEST"),
+        ],
+    )
+    def test_invalid_requests(self, query, extensions, code):
+        """Test mismatched hashes and unsupported versions are rejected."""
+        with pytest.raises(PersistedQueryError) as error:
+            self.store.resolve(query, extensions)
+
+        assert error.value.code == code
+        assert len(self.store) == 0
+
+    @pytest.mark.parametrize("query", ["{ brands", "{ nope }"])
+    def test_invalid_documents_not_stored(self, query):
+        """Test documents that do not parse or validate are executed but not stored."""
+        assert self.store.resolve(query, persisted(query)) == query
+        assert len(self.store) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test queries beyond the capacity evict the least recently used one."""
+        queries = ["{ brands }", "{ categories }", "{ stats { totalRecords } }"]
+        self.store.register(query_hash(queries[0]), queries[0])
+        self.store.register(query_hash(queries[1]), queries[1])
+        self.store.get(query_hash(queries[0]))
+        self.store.register(query_hash(queries[2]), queries[2])
+
+        assert self.store.get(query_hash(queries[1])) is None
+        assert self.store.get_by_query(queries[1]) is None
+        assert self.store.get_by_query(queries[0]) is not None
+
+    def test_disabled(self):
+        """Test persisted queries are refused when the store has no capacity."""
+        store = PersistedQueryStore(schema=schema._schema, max_entries=0)
+
+        with pytest.raises(PersistedQueryError) as error:
+            store.resolve(QUERY, persisted())
+        assert error.value.code == "PERSISTED_QUERY_NOT_SUPPORTED"
+
+
+class TestPersistedQueryExtension:
+    """Test cases for executing stored documents."""
+
+    @pytest.mark.asyncio
+    async def test_stored_queries_skip_parse_and_validation(self):
+        """Test a stored query executes without parsing or validating it again."""
+        store = PersistedQueryStore(schema=schema._schema)
+        store.register(query_hash(QUERY), QUERY)
+
+        with (
+            patch("app.controllers.products.persisted_queries.persisted_query_store", store),
+            patch(
+                "app.controllers.products.resolvers.products_service.get_available_brands",
+                return_value=("BOSCH",),
+            ),
+            patch(
+                "app.controllers.products.resolvers.products_service.get_available_categories",
+                return_value=("CAMPING",),
+            ),
+            patch("strawberry.schema.execute.parse_document") as mock_parse,
+            patch("strawberry.schema.execute.validate_document") as mock_validate,
+        ):
+            result = await schema.execute(QUERY, context_value={"user": {}})
+
+        assert result.errors is None
+        assert result.data == {"brands": ["BOSCH"], "categories": ["CAMPING"]}
+        mock_parse.assert_not_called()
+        mock_validate.assert_not_called()
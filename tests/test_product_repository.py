@@ -1,12 +1,19 @@
 """Unit tests for product repository."""
 
+import threading
 from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
-from app.models.domain.products import ProductDataFilter
-from app.repositories.product_repository import ProductRepository
+from app.core.config import settings
+from app.models.domain.products import ProductData, ProductDataFilter
+from app.repositories.aggregation import aggregate_rows
+from app.repositories.product_repository import (
+    ProductRepository,
+    StaleDatasetVersionError,
+    to_columns,
+)
 
 
 class TestProductRepository:
@@ -84,6 +91,72 @@ class TestProductRepository:
 
         assert len(products) == 2
 
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_by_filter_date_range(self, mock_read_csv, mock_csv_data):
+        """Test filtering by a date range."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        products = repo.get_by_filter(ProductDataFilter(date_from="20240130"))
+        assert [p.desc_ga_marca_producto for p in products] == ["DEWALT"]
+
+        products = repo.get_by_filter(
+            ProductDataFilter(date_from="20240101", date_to="20240129")
+        )
+        assert len(products) == 2
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_by_filter_order_by(self, mock_read_csv, mock_csv_data):
+        """Test filtered pages can be sorted by a measure."""
+        mock_read_csv.return_value = mock_csv_data
+        repo = ProductRepository()
+
+        descending = repo.get_by_filter(
+            ProductDataFilter(order_by="cart_additions", descending=True, limit=2)
+        )
+        filtered = repo.get_by_filter(
+            ProductDataFilter(date="20240129", order_by="cart_additions", offset=1)
+        )
+
+        assert [p.fc_agregado_carrito_cant for p in descending] == [2, 1]
+        assert [p.desc_ga_sku_producto for p in filtered] == ["SUCEI01"]
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_iter_export_chunks(self, mock_read_csv, mock_csv_data):
+        """Test exports stream every match in bounded, ordered chunks."""
+        mock_read_csv.return_value = mock_csv_data
+        repo = ProductRepository()
+
+        version, chunks = repo.iter_export_chunks(
+            ProductDataFilter(order_by="cart_additions", descending=True, limit=1),
+            columns=["desc_ga_sku_producto", "fc_producto_cant"],
+            chunk_rows=2,
+        )
+        chunks = list(chunks)
+
+        assert version == repo.dataset_version
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        combined = pd.concat(chunks, ignore_index=True)
+        assert list(combined.columns) == ["desc_ga_sku_producto", "fc_producto_cant"]
+        assert combined["desc_ga_sku_producto"].tolist() == [
+            "SUCEI01",
+            "K1010148001",
+            "DWA2NGFT40IR",
+        ]
+        assert combined["fc_producto_cant"].isna().all()
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_iter_export_chunks_no_matches(self, mock_read_csv, mock_csv_data):
+        """Test an export without matches yields a single empty chunk."""
+        mock_read_csv.return_value = mock_csv_data
+        repo = ProductRepository()
+
+        _, chunks = repo.iter_export_chunks(ProductDataFilter(brand="nope"))
+        chunks = list(chunks)
+
+        assert len(chunks) == 1
+        assert chunks[0].empty
+
     @patch("app.repositories.product_repository.pd.read_csv")
     def test_count(self, mock_read_csv, mock_csv_data):
         """Test counting total records."""
@@ -117,6 +190,59 @@ class TestProductRepository:
         assert len(categories) == 3
         assert "CAMPING" in categories
 
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_metadata(self, mock_read_csv, mock_csv_data):
+        """Test metadata is computed once at load time."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        metadata = repo.get_metadata()
+
+        assert metadata.total_records == 3
+        assert metadata.dataset_version == repo.dataset_version
+        assert metadata.brands == ("CASABLANCA", "DEWALT", "STANLEY")
+        assert metadata.min_date == "20240129"
+        assert metadata.max_date == "20240130"
+        assert metadata.column_totals == {"fc_agregado_carrito_cant": 3.0}
+        assert repo.get_metadata() is metadata
+        mock_read_csv.assert_called_once()
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_concurrent_first_loads_parse_once(self, mock_read_csv, mock_csv_data):
+        """Test concurrent first calls share a single load."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_read(*args, **kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return mock_csv_data.copy()
+
+        mock_read_csv.side_effect = slow_read
+        repo = ProductRepository()
+        threads = [threading.Thread(target=repo.count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        started.wait(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        mock_read_csv.assert_called_once()
+        assert repo.is_loaded
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_warm_up(self, mock_read_csv, mock_csv_data):
+        """Test warm-up loads the dataset ahead of the first query."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        assert not repo.is_loaded
+        metadata = repo.warm_up()
+
+        assert repo.is_loaded
+        assert metadata.total_records == 3
+
     @patch("app.repositories.product_repository.pd.read_csv")
     def test_load_data_file_not_found(self, mock_read_csv):
         """Test CSV loading when file doesn't exist."""
@@ -183,3 +309,408 @@ class TestProductRepository:
 
         with pytest.raises(IOError, match="Error loading CSV file"):
             repo.get_by_filter(filter_params)
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_load_data_applies_typed_columns(self, mock_read_csv, mock_csv_data):
+        """Test that columns are stored with their final nullable/category dtypes."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        df = repo._load_data()
+
+        assert str(df["id_cli_cliente"].dtype) == "Int64"
+        assert str(df["fc_agregado_carrito_cant"].dtype) == "Int64"
+        assert str(df["desc_ga_marca_producto"].dtype) == "category"
+        assert str(df["id_tie_fecha_valor"].dtype) == "category"
+
+    def test_load_data_reads_csv_typed(self, tmp_path):
+        """Test loading a real CSV file with missing values into typed columns."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id_tie_fecha_valor,id_cli_cliente,fc_ingreso_producto_monto,desc_ga_marca_producto\n"
+            "20240129,8,10.5,STANLEY\n"
+            "20240130,,nan,null\n"
+        )
+
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        df = repo._load_data()
+
+        assert str(df["fc_ingreso_producto_monto"].dtype) == "Float64"
+        assert df["id_cli_cliente"].isna().tolist() == [False, True]
+
+        products = repo.get_all(limit=10)
+        assert products[0].id_cli_cliente == 8
+        assert products[1].id_cli_cliente is None
+        assert products[1].fc_ingreso_producto_monto is None
+        assert products[1].desc_ga_marca_producto is None
+
+    def test_malformed_numeric_cells_read_as_missing(self, tmp_path):
+        """Test a dirty numeric cell is coerced instead of failing the whole load."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id_cli_cliente,fc_producto_cant,fc_ingreso_producto_monto,desc_ga_marca_producto\n"
+            "8,abc,10.5,STANLEY\n1.5,2,x,DEWALT\n10,3,7,BOSCH\n"
+        )
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        df = repo._load_data()
+
+        assert str(df["id_cli_cliente"].dtype) == "Int64"
+        assert str(df["fc_producto_cant"].dtype) == "Int64"
+        assert df["id_cli_cliente"].tolist() == [8, pd.NA, 10]
+        assert df["fc_producto_cant"].tolist() == [pd.NA, 2, 3]
+        assert df["fc_ingreso_producto_monto"].tolist() == [10.5, pd.NA, 7.0]
+        assert repo.count() == 3
+
+    def test_reload_swaps_new_version(self, tmp_path):
+        """Test reloading a changed CSV swaps in a new version atomically."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+
+        old_version = repo.dataset_version
+        old_df = repo._load_data()
+        assert repo.reload() is False
+        assert repo.changed_source_fingerprint() is None
+
+        csv_file.write_text(
+            "id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n10,DEWALT\n"
+        )
+        assert repo.changed_source_fingerprint() is not None
+        assert repo.reload() is True
+
+        assert repo.dataset_version != old_version
+        assert repo.count() == 2
+        assert repo.get_brands() == ("DEWALT", "STANLEY")
+        assert len(repo.get_by_filter(ProductDataFilter(brand="DEWALT"))) == 1
+        # Requests holding the previous version keep a consistent frame
+        assert len(old_df) == 1
+
+    def test_reload_appended_rows_parses_only_delta(self, tmp_path):
+        """Test rows appended to the CSV are ingested without reparsing the file."""
+        header = "id_tie_fecha_valor,id_cli_cliente,desc_ga_marca_producto\n"
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(header + "20240129,8,STANLEY\n20240129,9,DEWALT\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        repo.count()
+
+        with open(csv_file, "a") as f:
+            f.write("20240130,8,BOSCH\n20240130,10,STAN")
+        with patch.object(repo, "_parse_csv", wraps=repo._parse_csv) as parse:
+            assert repo.reload() is True
+
+        # Only the complete appended line was parsed
+        parsed = parse.call_args[0][0].getvalue().decode()
+        assert parsed == header + "20240130,8,BOSCH\n"
+        assert repo.count() == 3
+        assert repo.get_brands() == ("BOSCH", "DEWALT", "STANLEY")
+        assert len(repo.get_by_filter(ProductDataFilter(client_id=8))) == 2
+        assert repo.get_metadata().max_date == "20240130"
+
+        # The partial line is ingested once it is complete
+        with open(csv_file, "a") as f:
+            f.write("LEY\n")
+        assert repo.reload() is True
+        products = repo.get_by_filter(ProductDataFilter(brand="stanley"))
+        assert [p.id_cli_cliente for p in products] == [8, 10]
+
+        full = ProductRepository()
+        full.csv_path = csv_file
+        assert full.dataset_version == repo.dataset_version
+
+    def test_aggregate_from_rollups(self, tmp_path):
+        """Test covered aggregates are read from the rollups, kept current on append."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id_tie_fecha_valor,desc_ga_marca_producto,desc_ga_sku_producto,fc_producto_cant\n"
+            "20240129,STANLEY,A,1\n20240129,DEWALT,B,2\n20240130,STANLEY,A,3\n"
+        )
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        repo.rollup_dimensions = [("brand", "date")]
+        metrics = [("fc_producto_cant", "sum")]
+
+        with patch(
+            "app.repositories.product_repository.aggregate_rows", wraps=aggregate_rows
+        ) as raw:
+            groups = repo.aggregate(ProductDataFilter(brand="stanley"), ["date"], metrics)
+            assert [(g.keys, g.values, g.count) for g in groups] == [
+                (["20240129"], [1.0], 1),
+                (["20240130"], [3.0], 1),
+            ]
+            raw.assert_not_called()
+
+            (group,) = repo.aggregate(ProductDataFilter(sku="A"), [], metrics)
+            assert (group.values, group.count) == ([4.0], 2)
+            raw.assert_called_once()
+
+        with open(csv_file, "a") as f:
+            f.write("20240130,STANLEY,C,5\n")
+        assert repo.reload() is True
+        groups = repo.aggregate(ProductDataFilter(date="20240130"), ["brand"], metrics)
+        assert [(g.keys, g.values, g.count) for g in groups] == [(["STANLEY"], [8.0], 2)]
+
+    def test_aggregate_groups_sorted_after_append(self, tmp_path):
+        """Test appended categories keep aggregate groups sorted as on a full load."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id_tie_fecha_valor,desc_ga_marca_producto,fc_producto_cant\n"
+            "20240101,STANLEY,1\n20240102,DEWALT,2\n"
+        )
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        repo.rollup_dimensions = [("date",)]
+        metrics = [("fc_producto_cant", "sum")]
+        repo.count()
+
+        with open(csv_file, "a") as f:
+            f.write("20231201,BOSCH,3\n")
+        assert repo.reload() is True
+        full = ProductRepository()
+        full.csv_path = csv_file
+
+        for group_by in (["date"], ["brand"]):
+            groups = repo.aggregate(ProductDataFilter(), group_by, metrics)
+            expected = full.aggregate(ProductDataFilter(), group_by, metrics)
+            assert [g.keys for g in groups] == [g.keys for g in expected]
+        assert [g.keys for g in groups] == [["BOSCH"], ["DEWALT"], ["STANLEY"]]
+
+    def test_reload_rewritten_csv_is_fully_reloaded(self, tmp_path):
+        """Test a CSV whose loaded rows changed is parsed again from scratch."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        repo.count()
+
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n9,DEWALT\n10,BOSCH\n")
+        assert repo.reload() is True
+
+        assert repo.get_brands() == ("BOSCH", "DEWALT")
+
+    def test_reload_edited_prefix_with_verified_hash(self, tmp_path):
+        """Test an edit beyond the compared tail is caught when the CSV is hashed."""
+        header = "id_cli_cliente,desc_ga_marca_producto\n"
+        rows = ["10,STANLEY\n"] + ["9,DEWALT\n"] * 1000
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(header + "".join(rows))
+        with patch.object(settings, "DATASET_SNAPSHOT_VERIFY_HASH", True):
+            repo = ProductRepository()
+            repo.csv_path = csv_file
+            repo.count()
+
+            # Same byte length, far before the end of the loaded bytes
+            rows[0] = "12,STANLEY\n"
+            csv_file.write_text(header + "".join(rows) + "8,BOSCH\n")
+            assert repo.reload() is True
+
+        assert repo.count() == 1002
+        assert repo.get_by_filter(ProductDataFilter(brand="STANLEY"))[0].id_cli_cliente == 12
+
+    def test_append_delta(self, tmp_path):
+        """Test appending a separate delta CSV."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n")
+        delta_file = tmp_path / "delta.csv"
+        delta_file.write_text("id_cli_cliente,desc_ga_marca_producto\n9,DEWALT\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        version = repo.dataset_version
+
+        assert repo.append_delta(delta_file) == 1
+
+        assert repo.dataset_version != version
+        assert repo.count() == 2
+        assert repo.get_by_filter(ProductDataFilter(brand="DEWALT"))[0].id_cli_cliente == 9
+        # The main CSV did not change
+        assert repo.changed_source_fingerprint() is None
+
+    def test_append_delta_then_csv_is_not_duplicated(self, tmp_path):
+        """Test delta rows later appended to the CSV are loaded only once."""
+        header = "id_cli_cliente,desc_ga_marca_producto\n"
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(header + "8,STANLEY\n")
+        delta_file = tmp_path / "delta.csv"
+        delta_file.write_text(header + "9,DEWALT\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        repo.append_delta(delta_file)
+
+        with open(csv_file, "a") as f:
+            f.write("9,DEWALT\n")
+        assert repo.reload() is True
+
+        assert repo.count() == 2
+        assert len(repo.get_by_filter(ProductDataFilter(brand="DEWALT"))) == 1
+
+    def test_reload_failure_keeps_current_version(self, tmp_path):
+        """Test a failed reload leaves the loaded dataset in place."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        version = repo.dataset_version
+
+        with patch(
+            "app.repositories.product_repository.pd.read_csv",
+            side_effect=ValueError("bad CSV"),
+        ):
+            with pytest.raises(IOError):
+                repo.reload(force=True)
+
+        assert repo.dataset_version == version
+        assert repo.count() == 1
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_by_filter_client_id_with_missing_values(self, mock_read_csv):
+        """Test filtering by client ID when the column contains missing values."""
+        import numpy as np
+
+        mock_read_csv.return_value = pd.DataFrame(
+            {
+                "id_tie_fecha_valor": ["20240129", "20240130"],
+                "id_cli_cliente": [8, np.nan],
+                "desc_ga_marca_producto": ["STANLEY", "DEWALT"],
+            }
+        )
+
+        repo = ProductRepository()
+        products = repo.get_by_filter(ProductDataFilter(client_id=8))
+
+        assert len(products) == 1
+        assert products[0].id_cli_cliente == 8
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_by_filter_combined_indexed_filters(self, mock_read_csv, mock_csv_data):
+        """Test combining indexed exact-match filters with a substring filter."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+
+        products = repo.get_by_filter(ProductDataFilter(date="20240129", client_id=8))
+        assert [p.desc_ga_sku_producto for p in products] == ["K1010148001", "SUCEI01"]
+
+        products = repo.get_by_filter(ProductDataFilter(date="20240129", sku="SUCEI01"))
+        assert [p.desc_ga_marca_producto for p in products] == ["CASABLANCA"]
+
+        products = repo.get_by_filter(ProductDataFilter(client_id=8, brand="stan"))
+        assert [p.desc_ga_marca_producto for p in products] == ["STANLEY"]
+
+        assert repo.get_by_filter(ProductDataFilter(date="20240130", client_id=8)) == []
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_page_after(self, mock_read_csv, mock_csv_data):
+        """Test keyset pagination over the rows matching a filter."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        first_page = repo.get_page_after(ProductDataFilter(client_id=8), first=1)
+
+        assert first_page.positions == [0]
+        assert first_page.total_count == 2
+        assert first_page.has_next_page
+        assert not first_page.has_previous_page
+        assert first_page.dataset_version == repo.dataset_version
+
+        next_page = repo.get_page_after(ProductDataFilter(client_id=8), first=1, after=0)
+
+        assert next_page.positions == [1]
+        assert next_page.items[0].desc_ga_sku_producto == "SUCEI01"
+        assert not next_page.has_next_page
+        assert next_page.has_previous_page
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_page_after_without_filters(self, mock_read_csv, mock_csv_data):
+        """Test keyset pagination over the whole dataset."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        page = repo.get_page_after(ProductDataFilter(), first=5, after=1)
+
+        assert page.positions == [2]
+        assert page.total_count == 3
+        assert not page.has_next_page
+
+    def test_get_page_after_checks_version_of_serving_dataset(self, tmp_path):
+        """Test a continuation is rejected when another version serves the page."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n8,STANLEY\n9,DEWALT\n")
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        version = repo.dataset_version
+        page = repo.get_page_after(ProductDataFilter(), first=1, after=0, after_version=version)
+        assert page.positions == [1]
+
+        csv_file.write_text("id_cli_cliente,desc_ga_marca_producto\n10,BOSCH\n")
+        assert repo.reload() is True
+        with pytest.raises(StaleDatasetVersionError):
+            repo.get_page_after(ProductDataFilter(), first=1, after=0, after_version=version)
+
+    def test_dataset_version_follows_csv(self, tmp_path):
+        """Test that the dataset version changes with the CSV contents."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("id_cli_cliente\n8\n")
+
+        repo = ProductRepository()
+        repo.csv_path = csv_file
+        same = ProductRepository()
+        same.csv_path = csv_file
+        assert repo.dataset_version == same.dataset_version
+
+        csv_file.write_text("id_cli_cliente\n8\n9\n")
+        changed = ProductRepository()
+        changed.csv_path = csv_file
+        assert changed.dataset_version != repo.dataset_version
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_columns_by_filter(self, mock_read_csv, mock_csv_data):
+        """Test the columnar fast path returns native values for every field."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        columns = repo.get_columns_by_filter(ProductDataFilter(client_id=8, limit=10))
+
+        assert columns["desc_ga_sku_producto"] == ["K1010148001", "SUCEI01"]
+        assert columns["id_cli_cliente"] == [8, 8]
+        assert columns["SASASA"] == [None, None]  # Column absent from the CSV
+        assert set(columns) == set(ProductData.model_fields)
+
+    def test_to_columns_missing_values(self):
+        """Test that missing values of every dtype become None."""
+        import numpy as np
+
+        from app.repositories.product_repository import apply_column_dtypes
+
+        df = apply_column_dtypes(
+            pd.DataFrame(
+                {
+                    "id_cli_cliente": [8, None],
+                    "fc_ingreso_producto_monto": [None, 1.5],
+                    "desc_ga_marca_producto": [None, "STANLEY"],
+                }
+            )
+        )
+
+        columns = to_columns(df, np.array([1, 0]), list(df.columns))
+
+        assert columns == {
+            "id_cli_cliente": [None, 8],
+            "fc_ingreso_producto_monto": [1.5, None],
+            "desc_ga_marca_producto": ["STANLEY", None],
+        }
+        assert type(columns["id_cli_cliente"][1]) is int
+
+    @patch("app.repositories.product_repository.pd.read_csv")
+    def test_get_columns_by_filter_projection(self, mock_read_csv, mock_csv_data):
+        """Test that only the projected columns are returned."""
+        mock_read_csv.return_value = mock_csv_data
+
+        repo = ProductRepository()
+        columns = repo.get_columns_by_filter(
+            ProductDataFilter(limit=2), columns=["desc_ga_marca_producto"]
+        )
+
+        assert columns == {"desc_ga_marca_producto": ["STANLEY", "CASABLANCA"]}
@@ -2,10 +2,20 @@
 
 from unittest.mock import Mock
 
+import pandas as pd
 import pytest
 
-from app.models.domain.products import ProductData, ProductDataFilter
-from app.services.products_service import ProductsService
+from app.core.config import settings
+from app.models.domain.products import (
+    AggregateGroup,
+    DatasetMetadata,
+    ProductData,
+    ProductDataFilter,
+    ProductPage,
+    TopProduct,
+)
+from app.repositories.product_repository import StaleDatasetVersionError
+from app.services.products_service import InvalidCursorError, ProductsService
 
 
 class TestProductsService:
@@ -56,6 +66,84 @@ class TestProductsService:
         # Verify result
         assert result == mock_products
 
+    def test_search_products_cached(self):
+        """Test equivalent searches are answered from the result cache."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.get_by_filter.return_value = [ProductData(desc_ga_marca_producto="STANLEY")]
+        self.service.repository = mock_repo
+
+        first = self.service.search_products(ProductDataFilter(brand="STANLEY", limit=5))
+        second = self.service.search_products(ProductDataFilter(brand="stanley", limit=5))
+
+        mock_repo.get_by_filter.assert_called_once()
+        assert second == first
+        assert second is not first
+        stats = self.service.get_cache_statistics()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_search_products_cache_keyed_by_page_and_version(self):
+        """Test other pages and a reloaded dataset miss the result cache."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.get_by_filter.return_value = []
+        self.service.repository = mock_repo
+
+        self.service.search_products(ProductDataFilter(brand="STANLEY", limit=5))
+        self.service.search_products(ProductDataFilter(brand="STANLEY", limit=5, offset=5))
+        mock_repo.dataset_version = "v2"
+        self.service.search_products(ProductDataFilter(brand="STANLEY", limit=5))
+
+        assert mock_repo.get_by_filter.call_count == 3
+
+    def test_search_product_columns_cached(self):
+        """Test column searches are cached per projection."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.get_columns_by_filter.return_value = {"id_cli_cliente": [8]}
+        self.service.repository = mock_repo
+        filter_params = ProductDataFilter(client_id=8)
+
+        self.service.search_product_columns(filter_params, columns=["id_cli_cliente"])
+        result = self.service.search_product_columns(filter_params, columns=["id_cli_cliente"])
+        self.service.search_product_columns(filter_params)
+
+        assert result == {"id_cli_cliente": [8]}
+        assert mock_repo.get_columns_by_filter.call_count == 2
+
+    def test_reload_dataset_clears_result_cache(self):
+        """Test a reload drops the cached results of the previous version."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.get_by_filter.return_value = []
+        mock_repo.reload.return_value = True
+        mock_repo.get_metadata.return_value = DatasetMetadata(
+            dataset_version="v2", total_records=5, brands=(), categories=()
+        )
+        self.service.repository = mock_repo
+        self.service.search_products(ProductDataFilter(brand="STANLEY"))
+
+        result = self.service.reload_dataset(force=True)
+
+        mock_repo.reload.assert_called_once_with(force=True)
+        assert result == {"reloaded": True, "dataset_version": "v2", "total_records": 5}
+        assert len(self.service.result_cache) == 0
+
+    def test_append_dataset(self):
+        """Test appending a delta CSV reports the new version."""
+        mock_repo = Mock()
+        mock_repo.append_delta.return_value = 2
+        mock_repo.get_metadata.return_value = DatasetMetadata(
+            dataset_version="v2", total_records=7, brands=(), categories=()
+        )
+        self.service.repository = mock_repo
+
+        result = self.service.append_dataset("delta.csv")
+
+        mock_repo.append_delta.assert_called_once_with("delta.csv")
+        assert result == {"appended_rows": 2, "dataset_version": "v2", "total_records": 7}
+
     def test_get_available_brands(self):
         """Test getting available brands."""
         # Mock the repository attribute
@@ -94,21 +182,33 @@ class TestProductsService:
         """Test getting dataset statistics."""
         # Mock the repository attribute
         mock_repo = Mock()
-        mock_repo.count.return_value = 25864
-        mock_repo.get_brands.return_value = ["Brand1", "Brand2", "Brand3"]
-        mock_repo.get_categories.return_value = ["Cat1", "Cat2"]
+        mock_repo.get_metadata.return_value = DatasetMetadata(
+            dataset_version="v1",
+            total_records=25864,
+            brands=("Brand1", "Brand2", "Brand3"),
+            categories=("Cat1", "Cat2"),
+            min_date="20240101",
+            max_date="20240131",
+            column_totals={"fc_cantidad": 12.0},
+        )
         self.service.repository = mock_repo
 
         # Call service method
         result = self.service.get_dataset_statistics()
 
-        # Verify repository calls
-        mock_repo.count.assert_called_once()
-        mock_repo.get_brands.assert_called_once()
-        mock_repo.get_categories.assert_called_once()
+        # Statistics come from the precomputed metadata only
+        mock_repo.get_metadata.assert_called_once()
+        mock_repo.count.assert_not_called()
 
         # Verify result
-        expected = {"total_records": 25864, "brands_count": 3, "categories_count": 2}
+        expected = {
+            "total_records": 25864,
+            "brands_count": 3,
+            "categories_count": 2,
+            "min_date": "20240101",
+            "max_date": "20240131",
+            "column_totals": {"fc_cantidad": 12.0},
+        }
         assert result == expected
 
     def test_validate_pagination_normal(self):
@@ -149,6 +249,26 @@ class TestProductsService:
         assert filter_obj.limit == 50
         assert filter_obj.offset == 10
 
+    def test_build_filter_date_range(self):
+        """Test building a filter with a sanitized date range."""
+        filter_obj = self.service.build_filter(date_from=" 20240101 ", date_to="20240131;")
+
+        assert filter_obj.date_from == "20240101"
+        assert filter_obj.date_to == "20240131"
+
+    @pytest.mark.parametrize(
+        "bounds",
+        [
+            {"date_from": "2024-01-01"},
+            {"date_to": "202401"},
+            {"date_from": "20240101", "date_to": "january"},
+        ],
+    )
+    def test_build_filter_rejects_invalid_date_range(self, bounds):
+        """Test date range bounds must be YYYYMMDD, like the dataset dates."""
+        with pytest.raises(ValueError, match="YYYYMMDD"):
+            self.service.build_filter(**bounds)
+
     def test_build_filter_minimal_params(self):
         """Test building filter with minimal parameters."""
         filter_obj = self.service.build_filter()
@@ -215,9 +335,9 @@ class TestProductsService:
 
     def test_get_dataset_statistics_with_repository_error(self):
         """Test error handling when repository raises IOError getting statistics."""
-        # Mock the repository to raise IOError on count
+        # Mock the repository to raise IOError loading the metadata
         mock_repo = Mock()
-        mock_repo.count.side_effect = IOError("Error loading CSV file")
+        mock_repo.get_metadata.side_effect = IOError("Error loading CSV file")
         self.service.repository = mock_repo
 
         # Service should propagate the error
@@ -265,3 +385,164 @@ class TestProductsService:
         for input_limit, expected_limit in test_cases:
             validated_limit, _ = self.service.validate_pagination(input_limit, 0)
             assert validated_limit == expected_limit, f"Input {input_limit} should become {expected_limit}, got {validated_limit}"
+
+    def test_explain_search(self):
+        """Test explaining a search delegates to the repository."""
+        mock_repo = Mock()
+        mock_repo.explain_filter.return_value = ["1. brand contains 'STANLEY'"]
+        self.service.repository = mock_repo
+
+        filter_params = ProductDataFilter(brand="STANLEY")
+        result = self.service.explain_search(filter_params)
+
+        mock_repo.explain_filter.assert_called_once_with(filter_params)
+        assert result == ["1. brand contains 'STANLEY'"]
+
+    def test_cursor_round_trip(self):
+        """Test that cursors encode the dataset version and row position."""
+        cursor = self.service.encode_cursor("abc123", 42)
+
+        assert self.service.decode_cursor(cursor) == ("abc123", 42)
+
+    def test_decode_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        for cursor in ["garbage", "", self.service.encode_cursor("abc", 1)[:-3]]:
+            with pytest.raises(InvalidCursorError):
+                self.service.decode_cursor(cursor)
+
+    def test_search_products_page(self):
+        """Test that a continuation passes the decoded row position to the repository."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.get_page_after.return_value = ProductPage(
+            items=[],
+            positions=[],
+            total_count=0,
+            has_next_page=False,
+            has_previous_page=True,
+            dataset_version="v1",
+        )
+        self.service.repository = mock_repo
+
+        filter_params = ProductDataFilter(brand="STANLEY")
+        cursor = self.service.encode_cursor("v1", 7)
+        self.service.search_products_page(filter_params, first=500, after=cursor)
+
+        mock_repo.get_page_after.assert_called_once_with(
+            filter_params, first=100, after=7, after_version="v1"
+        )
+
+    def test_search_products_page_stale_cursor(self):
+        """Test that cursors from a previous dataset version are rejected."""
+        mock_repo = Mock()
+        mock_repo.get_page_after.side_effect = StaleDatasetVersionError("v1 is no longer loaded")
+        self.service.repository = mock_repo
+
+        cursor = self.service.encode_cursor("v1", 7)
+
+        with pytest.raises(InvalidCursorError, match="previous version"):
+            self.service.search_products_page(ProductDataFilter(), first=10, after=cursor)
+
+    def test_search_product_columns(self):
+        """Test the columnar search delegates to the repository."""
+        mock_repo = Mock()
+        mock_repo.get_columns_by_filter.return_value = {"desc_ga_marca_producto": ["STANLEY"]}
+        self.service.repository = mock_repo
+
+        filter_params = ProductDataFilter(brand="STANLEY")
+        result = self.service.search_product_columns(filter_params)
+
+        mock_repo.get_columns_by_filter.assert_called_once_with(filter_params, columns=None)
+        assert result == {"desc_ga_marca_producto": ["STANLEY"]}
+
+    def test_aggregate_products(self):
+        """Test aggregation deduplicates its inputs and caches the groups."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.aggregate.return_value = [AggregateGroup(keys=["STANLEY"], values=[3.0], count=2)]
+        self.service.repository = mock_repo
+
+        filter_params = ProductDataFilter(date="20240129")
+        metrics = [("fc_agregado_carrito_cant", "sum")]
+        for _ in range(2):
+            result = self.service.aggregate_products(filter_params, ["brand", "brand"], metrics * 2)
+
+        mock_repo.aggregate.assert_called_once_with(filter_params, ("brand",), tuple(metrics))
+        assert result == mock_repo.aggregate.return_value
+
+    def test_aggregate_products_rejects_unknown_names(self):
+        """Test unknown dimensions, measures and functions are rejected."""
+        self.service.repository = Mock()
+
+        with pytest.raises(ValueError, match="dimension"):
+            self.service.aggregate_products(ProductDataFilter(), ["sku"], [])
+        with pytest.raises(ValueError, match="measure"):
+            self.service.aggregate_products(ProductDataFilter(), [], [("flag_pipol", "sum")])
+        with pytest.raises(ValueError, match="function"):
+            self.service.aggregate_products(
+                ProductDataFilter(), [], [("fc_producto_cant", "median")]
+            )
+        self.service.repository.aggregate.assert_not_called()
+
+    def test_get_top_products(self):
+        """Test the top-N request is clamped and delegated to the repository."""
+        mock_repo = Mock()
+        mock_repo.dataset_version = "v1"
+        mock_repo.top_products.return_value = [TopProduct(sku="A", value=15.0, rows=2)]
+        self.service.repository = mock_repo
+
+        filter_params = ProductDataFilter(brand="STANLEY")
+        result = self.service.get_top_products(filter_params, "fc_ingreso_producto_monto", n=500)
+
+        mock_repo.top_products.assert_called_once_with(
+            filter_params, "fc_ingreso_producto_monto", 100
+        )
+        assert result == mock_repo.top_products.return_value
+        with pytest.raises(ValueError, match="measure"):
+            self.service.get_top_products(filter_params, "desc_ga_sku_producto")
+
+    def test_build_filter_order_by(self):
+        """Test the sort field is validated and part of the result cache key."""
+        self.service.repository = Mock(dataset_version="v1")
+        ascending = self.service.build_filter(order_by="revenue")
+        descending = self.service.build_filter(order_by="revenue", descending=True)
+
+        assert (descending.order_by, descending.descending) == ("revenue", True)
+        assert self.service._cache_key("rows", ascending) != self.service._cache_key(
+            "rows", descending
+        )
+        with pytest.raises(ValueError, match="sort field"):
+            self.service.build_filter(order_by="sku")
+
+    def test_export_products(self):
+        """Test exports validate the request and serialise the repository chunks."""
+        frame = pd.DataFrame({"desc_ga_sku_producto": ["A", "B"]})
+        self.service.repository = Mock()
+        self.service.repository.iter_export_chunks.return_value = ("v1", iter([frame]))
+        filter_params = ProductDataFilter(brand="stanley")
+
+        version, chunks = self.service.export_products(
+            filter_params, "csv", ["desc_ga_sku_producto"]
+        )
+
+        assert version == "v1"
+        assert b"".join(chunks) == b"desc_ga_sku_producto\nA\nB\n"
+        self.service.repository.iter_export_chunks.assert_called_once_with(
+            filter_params, columns=["desc_ga_sku_producto"], chunk_rows=settings.EXPORT_CHUNK_ROWS
+        )
+        with pytest.raises(ValueError, match="format"):
+            self.service.export_products(filter_params, "xml")
+        with pytest.raises(ValueError, match="column"):
+            self.service.export_products(filter_params, "csv", ["password"])
+
+    def test_get_dimension_values(self):
+        """Test listed dimensions are returned with their dataset version."""
+        self.service.repository = Mock()
+        self.service.repository.get_metadata.return_value = DatasetMetadata(
+            dataset_version="v1", total_records=2, brands=("BOSCH",), categories=("CAMPING",)
+        )
+
+        assert self.service.get_dimension_values("brands") == ("v1", ("BOSCH",))
+        assert self.service.get_dimension_values("categories") == ("v1", ("CAMPING",))
+        with pytest.raises(ValueError, match="dimension"):
+            self.service.get_dimension_values("skus")
@@ -0,0 +1,144 @@
+"""Unit tests for the repository query planner."""
+
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.core.config import settings
+from app.models.domain.products import ProductDataFilter
+from app.repositories.indexes import ColumnIndex, DatePartitions, SubstringIndex
+from app.repositories.query_planner import QueryPlanner
+
+
+class TestQueryPlanner:
+    """Test cases for QueryPlanner."""
+
+    def setup_method(self):
+        """Set up a planner over a small dataset."""
+        dates = ["20240129"] * 6 + ["20240130"] * 2
+        clients = [8, 8, 8, 8, 10, 10, 8, 10]
+        brands = ["STANLEY", "DEWALT", "STANLEY", "STANLEY", "BOSCH", "STANLEY", "DEWALT", "BOSCH"]
+        partitions = DatePartitions(pd.Series(dates, dtype="category"))
+        self.planner = QueryPlanner(
+            total_rows=len(dates),
+            exact_indexes={
+                "date": partitions,
+                "client_id": ColumnIndex(pd.Series(clients, dtype="Int64")),
+                "sku": None,
+            },
+            substring_indexes={
+                "brand": SubstringIndex(pd.Series(brands, dtype="category")),
+                "category": None,
+            },
+            range_indexes={"date": partitions},
+        )
+
+    def test_plan_orders_by_selectivity(self):
+        """Test that the most selective predicate is evaluated first."""
+        plan = self.planner.plan(ProductDataFilter(date="20240129", client_id=10, brand="stan"))
+
+        assert [p.field for p in plan.predicates] == ["client_id", "brand", "date"]
+        assert plan.estimated_rows == 3
+
+    def test_execute(self):
+        """Test that executing a plan intersects every predicate."""
+        plan = self.planner.plan(ProductDataFilter(date="20240129", client_id=8, brand="stan"))
+
+        assert self.planner.execute(plan).tolist() == [0, 2, 3]
+
+    def test_execute_without_predicates(self):
+        """Test that a filter without predicates matches every row."""
+        plan = self.planner.plan(ProductDataFilter())
+
+        assert self.planner.execute(plan) is None
+        assert plan.explain() == ["full range: 8 rows, no predicates"]
+
+    def test_strategies_agree(self):
+        """Test that every combination strategy yields the same intersection."""
+        plan = self.planner.plan(ProductDataFilter(client_id=8, brand="stan"))
+        expected = self.planner.execute(plan).tolist()
+
+        for strategy in ("bitmap", "probe", "merge"):
+            plan.predicates[1].strategy = strategy
+            assert self.planner.execute(plan).tolist() == expected
+
+    def test_date_range(self):
+        """Test date ranges are resolved from the partitions."""
+        plan = self.planner.plan(ProductDataFilter(date_from="20240130", brand="stan"))
+
+        assert plan.predicates[0].describe() == "date between ('20240130', None)"
+        assert plan.predicates[0].estimate == 2
+        assert self.planner.execute(plan).tolist() == []
+        matches = self.planner.match(ProductDataFilter(date_from="20240130", brand="bosch"))
+        assert matches.tolist() == [7]
+        assert self.planner.match(ProductDataFilter(date_to="20240129")).tolist() == list(range(6))
+
+    def test_date_range_on_ordered_rows_clips_positions(self):
+        """Test date ranges over date-ordered rows are applied as a row range."""
+        plan = self.planner.plan(ProductDataFilter(client_id=10, date_to="20240129"))
+
+        assert plan.predicates[1].strategy == "row-range"
+        assert self.planner.execute(plan).tolist() == [4, 5]
+
+    def test_date_range_skips_rows_with_missing_dates(self):
+        """Test rows without a date inside a date-ordered range are not matched."""
+        dates = ["20240129", None, "20240129", "20240129"]
+        partitions = DatePartitions(pd.Series(dates, dtype="category"))
+        planner = QueryPlanner(
+            total_rows=len(dates),
+            exact_indexes={"client_id": ColumnIndex(pd.Series([8, 8, 10, 10], dtype="Int64"))},
+            substring_indexes={},
+            range_indexes={"date": partitions},
+        )
+
+        plan = planner.plan(ProductDataFilter(client_id=8, date_to="20240129"))
+
+        assert plan.predicates[1].strategy != "row-range"
+        assert planner.execute(plan).tolist() == [0]
+
+    def test_empty_date_range(self):
+        """Test an inverted date range matches nothing."""
+        matches = self.planner.match(ProductDataFilter(date_from="20240130", date_to="20240129"))
+
+        assert len(matches) == 0
+
+    def test_match_cache_respects_byte_budget(self):
+        """Test cached match sets stay within MATCH_CACHE_MAX_BYTES."""
+        with patch.object(settings, "MATCH_CACHE_MAX_BYTES", 40):
+            planner = QueryPlanner(
+                total_rows=self.planner.total_rows,
+                exact_indexes=self.planner.exact_indexes,
+                substring_indexes=self.planner.substring_indexes,
+            )
+
+        first = planner.match(ProductDataFilter(client_id=8, brand="stan"))
+        assert planner.match(ProductDataFilter(client_id=8, brand="STAN")) is first
+        # 5 positions (40 bytes) fill the budget and evict the first match set
+        planner.match(ProductDataFilter(client_id=8))
+        assert planner.match(ProductDataFilter(client_id=8, brand="stan")) is not first
+        assert planner._match_cache.stats()["bytes"] <= 40
+
+    def test_match_cache_keeps_unfiltered_match(self):
+        """Test an "every row" match (None) is served from the cache."""
+        with patch.object(
+            self.planner, "_match_uncached", wraps=self.planner._match_uncached
+        ) as mock_match:
+            assert self.planner.match(ProductDataFilter()) is None
+            assert self.planner.match(ProductDataFilter()) is None
+
+        mock_match.assert_called_once()
+
+    def test_missing_column_matches_nothing(self):
+        """Test that a predicate on an absent column yields no rows."""
+        plan = self.planner.plan(ProductDataFilter(brand="stan", sku="K1010148001"))
+
+        assert plan.predicates[0].field == "sku"
+        assert len(self.planner.execute(plan)) == 0
+
+    def test_explain(self):
+        """Test the plan explanation."""
+        lines = self.planner.plan(ProductDataFilter(date="20240130", brand="stan")).explain()
+
+        assert lines[0] == "rows: 8, estimated matches <= 2"
+        assert lines[1].startswith("1. date == '20240130' [seed")
+        assert lines[2].startswith("2. brand contains 'stan'")
@@ -0,0 +1,94 @@
+"""Unit tests for the dataset reloader."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.reloader import DatasetReloader
+
+
+class TestDatasetReloader:
+    """Test cases for DatasetReloader."""
+
+    def setup_method(self):
+        """Set up a reloader over fake callables."""
+        self.calls = []
+        self.changed = None
+        self.reloader = DatasetReloader(
+            reload=self._reload, changed_fingerprint=lambda: self.changed
+        )
+
+    def _reload(self, force):
+        """Fake reload recording its calls."""
+        self.calls.append(force)
+        return {"reloaded": True, "dataset_version": f"v{len(self.calls)}", "total_records": 1}
+
+    @pytest.mark.asyncio
+    async def test_reload(self):
+        """Test a reload records its result."""
+        result = await self.reloader.reload(force=True)
+
+        assert result["dataset_version"] == "v1"
+        assert self.calls == [True]
+        assert self.reloader.status()["reload_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reloads_are_joined(self):
+        """Test triggers arriving during a reload share it."""
+        release = threading.Event()
+
+        def slow_reload(force):
+            release.wait(timeout=5)
+            return self._reload(force)
+
+        self.reloader._reload = slow_reload
+        first = asyncio.ensure_future(self.reloader.reload())
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(self.reloader.reload())
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == await second
+        assert len(self.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_is_recorded(self):
+        """Test failures propagate and are reported in the status."""
+
+        def fail(force):
+            raise IOError("Error loading CSV file")
+
+        self.reloader._reload = fail
+        with pytest.raises(IOError):
+            await self.reloader.reload()
+
+        assert self.reloader.status()["last_error"] == "Error loading CSV file"
+        assert self.reloader.reload_count == 0
+
+    @pytest.mark.asyncio
+    async def test_check_source_waits_for_stable_file(self):
+        """Test a change is reloaded once it is observed twice unchanged."""
+        assert await self.reloader.check_source() is False
+
+        self.changed = {"size": "10", "mtime_ns": "1"}
+        assert await self.reloader.check_source() is False
+        self.changed = {"size": "20", "mtime_ns": "2"}
+        assert await self.reloader.check_source() is False
+        assert self.calls == []
+
+        assert await self.reloader.check_source() is True
+        assert self.calls == [False]
+
+    @pytest.mark.asyncio
+    async def test_watch_polls_and_stops(self):
+        """Test the watcher reloads in the background and stops cleanly."""
+        self.changed = {"size": "10", "mtime_ns": "1"}
+        self.reloader.start_watching(0.01)
+        for _ in range(100):
+            if self.calls:
+                break
+            await asyncio.sleep(0.01)
+        await self.reloader.stop()
+
+        assert self.calls
@@ -0,0 +1,126 @@
+"""Unit tests for the search result cache."""
+
+from app.core.result_cache import ResultCache, estimate_size
+from app.models.domain.products import ProductData
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def test_hit_and_miss(self):
+        """Test counters on a miss followed by a hit."""
+        cache = ResultCache()
+
+        assert cache.get("a") is None
+        cache.put("a", [1], 10)
+
+        assert cache.get("a") == [1]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 10
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test the entry budget evicts the least recently used entry."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 1, 1)
+        cache.put("b", 2, 1)
+        cache.get("a")
+        cache.put("c", 3, 1)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_byte_budget(self):
+        """Test the byte budget evicts entries and rejects oversized values."""
+        cache = ResultCache(max_bytes=100)
+        cache.put("a", 1, 60)
+        cache.put("b", 2, 60)
+
+        assert len(cache) == 1
+        assert cache.get("b") == 2
+        assert cache.put("c", 3, 101) is False
+        assert cache.stats()["bytes"] == 60
+
+    def test_replacing_entry_updates_bytes(self):
+        """Test putting an existing key replaces its size."""
+        cache = ResultCache()
+        cache.put("a", 1, 60)
+        cache.put("a", 2, 10)
+
+        assert cache.get("a") == 2
+        assert cache.stats()["bytes"] == 10
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their time-to-live."""
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=30, clock=clock)
+        cache.put("a", 1, 1)
+
+        clock.now = 29
+        assert cache.get("a") == 1
+        clock.now = 30
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_disabled_cache(self):
+        """Test a cache without entry budget never stores values."""
+        cache = ResultCache(max_entries=0)
+
+        assert cache.put("a", 1, 1) is False
+        assert cache.get_or_compute("a", lambda: 2) == 2
+        assert len(cache) == 0
+
+    def test_get_or_compute(self):
+        """Test values are computed once."""
+        cache = ResultCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [ProductData(desc_ga_marca_producto="STANLEY")]
+
+        cache.get_or_compute("a", compute)
+        cache.get_or_compute("a", compute)
+
+        assert len(calls) == 1
+
+    def test_get_or_compute_caches_none(self):
+        """Test a computed None is a cached value, not a miss."""
+        cache = ResultCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        assert cache.get_or_compute("a", compute, sizeof=lambda value: 0) is None
+        assert cache.get_or_compute("a", compute, sizeof=lambda value: 0) is None
+
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.get("b", "missing") == "missing"
+
+    def test_estimate_size(self):
+        """Test size estimates grow with the result."""
+        rows = [ProductData(desc_ga_marca_producto="STANLEY")]
+        columns = {"desc_ga_marca_producto": ["STANLEY", "DEWALT"]}
+
+        assert estimate_size(rows * 2) > estimate_size(rows) > 0
+        assert estimate_size(columns) > estimate_size({}) > 0
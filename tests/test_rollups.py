@@ -0,0 +1,126 @@
+"""Unit tests for the aggregate rollups."""
+
+import pandas as pd
+import pytest
+
+from app.models.domain.products import ProductDataFilter
+from app.repositories.aggregation import aggregate_rows
+from app.repositories.indexes import ColumnIndex, DatePartitions, SubstringIndex
+from app.repositories.query_planner import QueryPlanner
+from app.repositories.rollups import Rollup, find_rollup, parse_rollup_dimensions
+
+MEASURES = ["fc_agregado_carrito_cant", "fc_ingreso_producto_monto"]
+METRICS = [
+    (column, function) for column in MEASURES for function in ("sum", "avg", "min", "max", "count")
+]
+
+
+def make_frame():
+    """Build a small typed frame."""
+    return pd.DataFrame(
+        {
+            "id_tie_fecha_valor": pd.Series(
+                ["20240129", "20240129", "20240130", "20240131", "20240131", None],
+                dtype="category",
+            ),
+            "desc_ga_marca_producto": pd.Series(
+                ["STANLEY", "DEWALT", "STANLEY", None, "STANLEY", "BOSCH"], dtype="category"
+            ),
+            "desc_ga_sku_producto": pd.Series(["A", "B", "A", "C", "A", "D"], dtype="category"),
+            "fc_agregado_carrito_cant": pd.Series([1, 2, None, 4, 5, 6], dtype="Int64"),
+            "fc_ingreso_producto_monto": pd.Series(
+                [1.5, None, 2.0, 3.0, None, 1.0], dtype="Float64"
+            ),
+        }
+    )
+
+
+def raw_aggregate(df, filter_params, group_by, metrics):
+    """Aggregate the rows matching a filter without rollups."""
+    planner = QueryPlanner(
+        total_rows=len(df),
+        exact_indexes={
+            "date": DatePartitions(df["id_tie_fecha_valor"]),
+            "sku": ColumnIndex(df["desc_ga_sku_producto"]),
+        },
+        substring_indexes={"brand": SubstringIndex(df["desc_ga_marca_producto"])},
+        range_indexes={"date": DatePartitions(df["id_tie_fecha_valor"])},
+    )
+    return aggregate_rows(df, planner.match(filter_params), group_by, metrics)
+
+
+class TestRollups:
+    """Test cases for Rollup."""
+
+    def setup_method(self):
+        """Build a brand x date rollup of the test frame."""
+        self.df = make_frame()
+        self.rollup = Rollup.build(self.df, ("brand", "date"), MEASURES)
+
+    def test_parse_rollup_dimensions(self):
+        """Test the rollup configuration is parsed and validated."""
+        assert parse_rollup_dimensions("brand+date, category + date,,") == [
+            ("brand", "date"),
+            ("category", "date"),
+        ]
+        assert parse_rollup_dimensions("") == []
+        with pytest.raises(ValueError, match="sku"):
+            parse_rollup_dimensions("brand+sku")
+
+    def test_missing_dimension_column(self):
+        """Test no rollup is built when a dimension column is absent."""
+        assert Rollup.build(self.df, ("client",), MEASURES) is None
+
+    @pytest.mark.parametrize(
+        "filter_params, group_by",
+        [
+            (ProductDataFilter(), ("brand", "date")),
+            (ProductDataFilter(), ("brand",)),
+            (ProductDataFilter(), ()),
+            (ProductDataFilter(brand="stan"), ("date",)),
+            (ProductDataFilter(date_from="20240130"), ("brand",)),
+            (ProductDataFilter(date="20240129", date_to="20240130"), ()),
+            (ProductDataFilter(brand="nope"), ("brand",)),
+            (ProductDataFilter(brand="nope"), ()),
+        ],
+    )
+    def test_matches_raw_aggregation(self, filter_params, group_by):
+        """Test covered queries return the groups of the row aggregation."""
+        assert self.rollup.covers(filter_params, group_by, METRICS)
+
+        expected = raw_aggregate(self.df, filter_params, group_by, METRICS)
+        assert self.rollup.aggregate(filter_params, group_by, METRICS) == expected
+
+    def test_covers(self):
+        """Test queries on other dimensions or filters fall back to the rows."""
+        metrics = [("fc_agregado_carrito_cant", "sum")]
+
+        assert not self.rollup.covers(ProductDataFilter(), ("category",), metrics)
+        assert not self.rollup.covers(ProductDataFilter(sku="A"), ("brand",), metrics)
+        assert not self.rollup.covers(
+            ProductDataFilter(), ("brand",), [("fc_producto_cant", "sum")]
+        )
+
+    def test_find_rollup_picks_smallest(self):
+        """Test the covering rollup with the fewest rows is used."""
+        brands = Rollup.build(self.df, ("brand",), MEASURES)
+        rollups = [self.rollup, brands]
+
+        assert find_rollup(rollups, ProductDataFilter(), ("brand",), []) is brands
+        assert find_rollup(rollups, ProductDataFilter(), ("date",), []) is self.rollup
+        assert find_rollup(rollups, ProductDataFilter(sku="A"), (), []) is None
+
+    def test_extend_matches_full_build(self):
+        """Test extending with appended rows equals rolling up all rows."""
+        first = self.df.iloc[:4].reset_index(drop=True)
+        delta = self.df.iloc[1:].reset_index(drop=True)
+        combined = pd.concat([first, delta], ignore_index=True)
+        full = Rollup.build(combined, ("brand", "date"), MEASURES)
+
+        extended = Rollup.build(first, ("brand", "date"), MEASURES).extend(delta)
+
+        assert len(extended.frame) == len(full.frame)
+        for group_by in [("brand", "date"), ("date",), ()]:
+            assert extended.aggregate(ProductDataFilter(), group_by, METRICS) == (
+                full.aggregate(ProductDataFilter(), group_by, METRICS)
+            )
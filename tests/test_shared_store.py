@@ -0,0 +1,105 @@
+"""Unit tests for the memory-mapped shared dataset store."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings, settings
+from app.repositories.product_repository import ProductRepository, apply_column_dtypes
+from app.repositories.shared_store import map_store, write_store
+
+
+def is_memory_mapped(array: np.ndarray) -> bool:
+    """Return True if the array is a view over a memory-mapped file."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array, np.ndarray) else None
+    return False
+
+
+class TestSharedStore:
+    """Test cases for the shared columnar store."""
+
+    @pytest.fixture
+    def typed_df(self):
+        """Create a typed DataFrame covering every column kind."""
+        return apply_column_dtypes(
+            pd.DataFrame(
+                {
+                    "id_tie_fecha_valor": ["20240129", "20240130", None],
+                    "id_cli_cliente": [8, None, 10],
+                    "fc_ingreso_producto_monto": [10.5, None, 2.0],
+                    "desc_ga_marca_producto": ["STANLEY", None, "DEWALT"],
+                    "SASASA": ["A", None, "B"],
+                }
+            )
+        )
+
+    def test_write_and_map_store(self, tmp_path, typed_df):
+        """Test that a mapped store equals the original frame."""
+        fingerprint = {"size": "1", "mtime_ns": "2"}
+        write_store(typed_df, tmp_path, fingerprint)
+
+        mapped = map_store(tmp_path, fingerprint)
+
+        pd.testing.assert_frame_equal(mapped, typed_df)
+
+    def test_mapped_columns_are_not_copied(self, tmp_path, typed_df):
+        """Test that numeric and categorical columns are backed by memory maps."""
+        fingerprint = {"size": "1", "mtime_ns": "2"}
+        write_store(typed_df, tmp_path, fingerprint)
+
+        mapped = map_store(tmp_path, fingerprint)
+
+        assert is_memory_mapped(mapped["id_cli_cliente"].array._data)
+        assert is_memory_mapped(mapped["desc_ga_marca_producto"].array.codes)
+
+    def test_map_store_other_fingerprint(self, tmp_path, typed_df):
+        """Test that a store built from another CSV version is not mapped."""
+        write_store(typed_df, tmp_path, {"size": "1", "mtime_ns": "2"})
+
+        assert map_store(tmp_path, {"size": "1", "mtime_ns": "3"}) is None
+
+    def test_write_store_removes_stale_versions(self, tmp_path, typed_df):
+        """Test that rewriting the store drops buffers of older CSV versions."""
+        write_store(typed_df, tmp_path, {"size": "1", "mtime_ns": "2"})
+        write_store(typed_df, tmp_path, {"size": "1", "mtime_ns": "3"})
+
+        assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 1
+
+    def test_repository_mmap_mode(self, tmp_path):
+        """Test that workers in mmap mode share one materialised store."""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id_tie_fecha_valor,id_cli_cliente,desc_ga_marca_producto\n"
+            "20240129,8,STANLEY\n"
+            "20240130,,DEWALT\n"
+        )
+
+        with (
+            patch.object(settings, "CSV_FILE_PATH", str(csv_file)),
+            patch.object(settings, "DATASET_STORAGE_MODE", "mmap"),
+        ):
+            first = ProductRepository()
+            df = first._load_data()
+
+            second = ProductRepository()
+            with patch("app.repositories.product_repository.pd.read_csv") as mock_read_csv:
+                mapped = second._load_data()
+                mock_read_csv.assert_not_called()
+
+            products = second.get_all(limit=10)
+
+        pd.testing.assert_frame_equal(mapped, df)
+        assert is_memory_mapped(mapped["id_cli_cliente"].array._data)
+        assert products[1].id_cli_cliente is None
+
+    def test_storage_mode_is_validated(self):
+        """Test an unknown storage mode is rejected when the settings load."""
+        assert Settings(DATASET_STORAGE_MODE="mmap").DATASET_STORAGE_MODE == "mmap"
+        with pytest.raises(ValidationError):
+            Settings(DATASET_STORAGE_MODE="mmapped")
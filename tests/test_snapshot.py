@@ -0,0 +1,103 @@
+"""Unit tests for the dataset snapshot cache."""
+
+import os
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.repositories.product_repository import ProductRepository, apply_column_dtypes
+from app.repositories.snapshot import read_snapshot, source_fingerprint, write_snapshot
+
+CSV_CONTENT = (
+    "id_tie_fecha_valor,id_cli_cliente,fc_ingreso_producto_monto,desc_ga_marca_producto\n"
+    "20240129,8,10.5,STANLEY\n"
+    "20240130,,,DEWALT\n"
+)
+
+
+class TestSnapshot:
+    """Test cases for Parquet snapshot helpers."""
+
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        """Write a small CSV file."""
+        path = tmp_path / "data.csv"
+        path.write_text(CSV_CONTENT)
+        return path
+
+    @pytest.fixture
+    def typed_df(self):
+        """Create a typed DataFrame."""
+        return apply_column_dtypes(
+            pd.DataFrame(
+                {
+                    "id_tie_fecha_valor": ["20240129", "20240130"],
+                    "id_cli_cliente": [8, None],
+                    "desc_ga_marca_producto": ["STANLEY", "DEWALT"],
+                }
+            )
+        )
+
+    def test_source_fingerprint(self, csv_file):
+        """Test fingerprint contents with and without hashing."""
+        fingerprint = source_fingerprint(csv_file)
+        assert fingerprint["size"] == str(len(CSV_CONTENT))
+        assert "sha256" not in fingerprint
+
+        assert len(source_fingerprint(csv_file, with_hash=True)["sha256"]) == 64
+
+    def test_source_fingerprint_missing_file(self, tmp_path):
+        """Test fingerprint of a missing file."""
+        assert source_fingerprint(tmp_path / "missing.csv") is None
+
+    def test_write_and_read_snapshot(self, tmp_path, typed_df):
+        """Test that a snapshot round-trips with its dtypes."""
+        path = tmp_path / "data.parquet"
+        fingerprint = {"size": "1", "mtime_ns": "2"}
+
+        assert write_snapshot(typed_df, path, fingerprint)
+        loaded = read_snapshot(path, fingerprint)
+
+        pd.testing.assert_frame_equal(loaded, typed_df)
+
+    def test_read_stale_snapshot(self, tmp_path, typed_df):
+        """Test that a snapshot built from another CSV version is ignored."""
+        path = tmp_path / "data.parquet"
+        write_snapshot(typed_df, path, {"size": "1", "mtime_ns": "2"})
+
+        assert read_snapshot(path, {"size": "1", "mtime_ns": "3"}) is None
+
+    def test_repository_uses_snapshot(self, csv_file):
+        """Test that the repository writes a snapshot and reuses it on the next load."""
+        with (
+            patch.object(settings, "CSV_FILE_PATH", str(csv_file)),
+            patch.object(settings, "DATASET_SNAPSHOT_ENABLED", True),
+        ):
+            first = ProductRepository()
+            df = first._load_data()
+            assert first.snapshot_path.exists()
+
+            second = ProductRepository()
+            with patch("app.repositories.product_repository.pd.read_csv") as mock_read_csv:
+                cached = second._load_data()
+                mock_read_csv.assert_not_called()
+
+        pd.testing.assert_frame_equal(cached, df)
+
+    def test_repository_invalidates_snapshot(self, csv_file):
+        """Test that changing the CSV invalidates the snapshot."""
+        with (
+            patch.object(settings, "CSV_FILE_PATH", str(csv_file)),
+            patch.object(settings, "DATASET_SNAPSHOT_ENABLED", True),
+        ):
+            ProductRepository()._load_data()
+
+            csv_file.write_text(CSV_CONTENT + "20240131,9,1.0,BOSCH\n")
+            stat = csv_file.stat()
+            os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+            df = ProductRepository()._load_data()
+
+        assert len(df) == 3
@@ -0,0 +1,55 @@
+"""Unit tests for the sorted views."""
+
+import numpy as np
+import pandas as pd
+
+from app.repositories.sorted_views import SortedView, SortedViews, sort_key
+
+
+class TestSortedView:
+    """Test cases for SortedView."""
+
+    def setup_method(self):
+        """Build a revenue column with ties and missing values."""
+        self.revenue = pd.Series([3.0, None, 1.0, 3.0, 2.0, None, 5.0], dtype="Float64")
+
+    def test_order_ascending_and_descending(self):
+        """Test ties keep dataset order and missing values sort last in both directions."""
+        assert SortedView(self.revenue).order.tolist() == [2, 4, 0, 3, 6, 1, 5]
+        assert SortedView(self.revenue, descending=True).order.tolist() == [6, 0, 3, 4, 2, 1, 5]
+
+    def test_page_of_all_rows(self):
+        """Test a page without filter is a slice of the permutation."""
+        view = SortedView(self.revenue, descending=True)
+
+        assert view.page(None, 1, 3).tolist() == [0, 3, 4]
+
+    def test_page_of_matches(self):
+        """Test a page of a match set follows the sort order of the matches."""
+        view = SortedView(self.revenue)
+        matches = np.array([0, 1, 3, 4, 6])
+
+        assert view.page(matches, 0, 2).tolist() == [4, 0]
+        assert view.page(matches, 2, 10).tolist() == [3, 6, 1]
+        assert view.page(matches, 5, 10).tolist() == []
+
+    def test_categorical_sort_key_is_lexical(self):
+        """Test categories are ordered by value, not by category code."""
+        dates = pd.Series(
+            pd.Categorical(["20240131", None, "20240129"], categories=["20240131", "20240129"])
+        )
+
+        key = sort_key(dates)
+
+        assert key[2] < key[0]
+        assert np.isnan(key[1])
+
+    def test_views_are_memoised(self):
+        """Test each column and direction is sorted once, and unknown columns have no view."""
+        views = SortedViews(pd.DataFrame({"fc_ingreso_producto_monto": self.revenue}))
+
+        view = views.get("fc_ingreso_producto_monto", descending=True)
+
+        assert views.get("fc_ingreso_producto_monto", descending=True) is view
+        assert views.get("fc_ingreso_producto_monto") is not view
+        assert views.get("fc_producto_cant") is None
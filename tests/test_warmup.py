@@ -0,0 +1,89 @@
+"""Unit tests for the dataset warm-up."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.warmup import FAILED, PENDING, READY, WARMING, DatasetWarmup
+
+
+class TestDatasetWarmup:
+    """Test cases for DatasetWarmup."""
+
+    def test_initial_state(self):
+        """Test the warm-up is not ready before it runs."""
+        warmup = DatasetWarmup()
+
+        assert warmup.state == PENDING
+        assert warmup.status()["ready"] is False
+
+    @pytest.mark.asyncio
+    async def test_ready_after_load(self):
+        """Test the state moves from warming to ready once the load finishes."""
+        release = threading.Event()
+        warmup = DatasetWarmup()
+
+        task = warmup.start(release.wait)
+        assert warmup.state == WARMING
+        assert warmup.start(release.wait) is task
+
+        release.set()
+        await task
+        assert warmup.state == READY
+        assert warmup.status()["duration_seconds"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_load_can_be_retried(self):
+        """Test a failed load is reported and a new start retries it."""
+
+        def fail():
+            raise IOError("Error loading CSV file")
+
+        warmup = DatasetWarmup(retry_seconds=0)
+        await warmup.start(fail)
+
+        assert warmup.state == FAILED
+        assert warmup.status()["error"] == "Error loading CSV file"
+
+        await warmup.start(lambda: None)
+        assert warmup.ready
+        assert warmup.error is None
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_retried_with_backoff(self):
+        """Test a failed load is retried until it succeeds."""
+        outcomes = [IOError("first"), IOError("second"), None]
+
+        def load():
+            outcome = outcomes.pop(0)
+            if outcome is not None:
+                raise outcome
+
+        warmup = DatasetWarmup(retry_seconds=0.01, max_retry_seconds=0.02)
+        await warmup.start(load)
+
+        assert warmup.ready
+        assert warmup.attempts == 3
+        assert warmup.error is None
+
+    @pytest.mark.asyncio
+    async def test_ready_once_loaded_elsewhere(self):
+        """Test readiness follows a load done outside the warm-up (e.g. a reload)."""
+        loaded = False
+
+        def fail():
+            raise IOError("Error loading CSV file")
+
+        warmup = DatasetWarmup(retry_seconds=60)
+        task = warmup.start(fail, is_loaded=lambda: loaded)
+        await asyncio.sleep(0.05)
+        assert warmup.state == FAILED
+        assert not warmup.ready
+
+        loaded = True
+        assert warmup.status()["ready"] is True
+        assert warmup.state == READY
+
+        await warmup.stop()
+        assert task.done()